@@ -1,8 +1,16 @@
 from .exceptions import FirmwareVersionError, SpiConnectionError
-from .decorators import requires_firmware
-from .lookup_table import OPC_LOOKUP
+from .decorators import requires_firmware, transaction
+from .lookup_table import OPC_LOOKUP, adc_value, adc_values
+from .timing import accepts_delay, monotonic, select_profile
+from .decoders import BIN_KEYS, histogram_layout, N1 as N1_LAYOUT
+from .cache import device_key
+from .bus import bus_key, bus_lock
+from .records import ConfigVariables
+from .acquisition import Stream, Prefetcher
+from .metrics import Metrics, register
 
 from time import sleep
+import threading
 import struct
 import warnings
 import re
@@ -27,6 +35,14 @@ class _OPC(object):
     :param firmware: You can manually set the firmware version as a tuple. Ex. (18,2)
     :param max_cnxn_retries: Maximum number of times a connection will try to be made.
     :param retry_interval_ms: The sleep interval for the device between retrying to connect to the OPC. Units are in ms.
+    :param frame_reads: Read each response in a single transfer rather than one transfer per byte. The bytes of a frame are then sent back-to-back, without the byte delay of the timing profile between them, so only enable this if the OPC tolerates it.
+    :param timing: Timing profile to use. By default, a profile is selected based on the transport and firmware version.
+    :param cache: Cache of device information. If given, the cached firmware version is validated with a single command instead of probing the device.
+    :param device_id: Identity of the device in the cache, e.g. 'spi:0.0'. Required for spidev connections, which do not expose the bus and chip select; otherwise it is taken from the connection if possible (see opc.cache.device_key).
+    :param bus: Key of the bus the OPC is connected on, e.g. 'spi:0'. spidev connections do not expose their bus, so give the same key to OPC's that share an SPI bus. By default, it is taken from the connection if possible (see opc.bus.bus_key).
+    :param bus_lock: Lock held for each command sequence. By default, the lock shared by all OPC's on the same bus is used (see opc.bus.bus_lock).
+    :param metrics: Set true to record the latency, bytes transferred and errors of every command (see opc.metrics.Metrics).
+    :param trace: Trace to record every byte sent and received in (see opc.trace.TraceRing).
 
     :raises: opc.exceptions.SpiConnectionError
 
@@ -35,6 +51,14 @@ class _OPC(object):
     :type model: string
     :type max_cnxn_retries: int
     :type retry_interval_ms: int
+    :type frame_reads: boolean
+    :type timing: opc.timing.TimingProfile
+    :type cache: opc.cache.DeviceCache
+    :type device_id: string
+    :type bus: string
+    :type bus_lock: opc.bus.BusLock
+    :type metrics: boolean
+    :type trace: opc.trace.TraceRing
 
     :rtype: opc._OPC
 
@@ -44,6 +68,29 @@ class _OPC(object):
         self.debug      = kwargs.get('debug', False)
         self.model      = kwargs.get('model', 'N2')
 
+        self.frame_reads    = kwargs.get('frame_reads', False)
+
+        # Select a timing profile for the transport unless one was given; it is
+        # re-selected below once the firmware version is known
+        self._auto_timing   = kwargs.get('timing') is None
+        self.timing         = kwargs.get('timing') or select_profile(spi_connection, firmware[0] if firmware else None)
+
+        # The earliest time at which the next command may be sent
+        self._next_command  = monotonic()
+
+        # Held for each command sequence, so sequences on the same bus do not interleave
+        self.bus            = kwargs.get('bus') or bus_key(spi_connection)
+        self.bus_lock       = kwargs.get('bus_lock') or bus_lock(self.bus)
+
+        # Per-command metrics, or None if they are not being recorded
+        self._metrics       = Metrics() if kwargs.get('metrics', False) else None
+
+        # Records every byte sent and received, or None
+        self.trace          = kwargs.get('trace')
+
+        # Whether or not the transport accepts a per-byte delay
+        self._xfer_delay_supported = accepts_delay(spi_connection)
+
         if firmware is not None:
             major, minor = firmware[0], firmware[1]
             version = float("{}.{}".format(major, minor))
@@ -58,6 +105,16 @@ class _OPC(object):
         assert hasattr(spi_connection, 'xfer'), msg
         assert self.cnxn.mode == 1, "SPI mode must be 1"
 
+        self.cache          = kwargs.get('cache')
+        self.device_id      = kwargs.get('device_id') or device_key(spi_connection)
+        self.serial_number  = None
+
+        # The decoded configuration variables, read on first use (see OPCN2.config)
+        self._config        = None
+
+        # Use the cached firmware version if it is still valid
+        cached = self._load_cache() if firmware is None else None
+
         # Set the firmware version upon initialization IFF it hasn't been set manually
         i = 0
         if self.firmware['version'] is None:
@@ -74,10 +131,13 @@ class _OPC(object):
                 infostring = self.read_info_string()
 
                 try:
-                    self.firmware['version'] = int(re.findall("\d{3}", infostring)[-1])
+                    self.firmware['version'] = self._parse_version(infostring)
                 except Exception as e:
                     logger.error("Could not parse the fimrware version from {}".format(infostring), exc_info=True)
 
+                    if self._metrics is not None:
+                        self._metrics.firmware_retry()
+
                     # sleep for a period of time
                     sleep(retry_interval_ms / 1000)
 
@@ -86,20 +146,225 @@ class _OPC(object):
         # At this point, we have a firmware version
 
         # If firmware version is >= 18, set the major and minor versions..
-        try:
-            if self.firmware['version'] >= 18.:
-                self.read_firmware()
-            else:
-                self.firmware['major'] = self.firmware['version']
-        except:
-            logger.info("No firmware version could be read.")
+        if cached is None:
+            try:
+                if self.firmware['version'] >= 18.:
+                    self.read_firmware()
+                else:
+                    self.firmware['major'] = self.firmware['version']
+            except:
+                logger.info("No firmware version could be read.")
+
+            self._update_cache(firmware=self.firmware)
+
+        if self._auto_timing:
+            self.timing = select_profile(self.cnxn, self.firmware['major'])
+
+        # Hold off the next command for a bit to alleviate issues, unless we have
+        # just validated the cache, which tells us the device is already up
+        if cached is None:
+            self._next_command = monotonic() + self.timing.startup
+
+        register(self)
 
         # We requested to wait until the device is connected
         if kwargs.get('wait', False) is not False:
             self.wait(**kwargs)
 
-        else: # Sleep for a bit to alleviate issues
-            sleep(1)
+    def _load_cache(self):
+        """Load the firmware version from the device cache, and validate it with a single
+        command that reports the version of the device (read_firmware on v18+,
+        read_info_string otherwise). Returns the cache entry if it is valid, otherwise None.
+
+        :rtype: dictionary
+        """
+        if self.cache is None:
+            return None
+
+        if self.device_id is None:
+            logger.warning("The device cache requires a device_id (e.g. 'spi:0.0') for this connection and will not be used.")
+            return None
+
+        entry = self.cache.get(self.device_id)
+        if not entry or 'firmware' not in entry:
+            return None
+
+        self.firmware = dict(entry['firmware'])
+
+        try:
+            if self.firmware['version'] >= 18.:
+                valid = self.read_firmware() == entry['firmware']
+            else:
+                valid = self._parse_version(self.read_info_string()) == int(self.firmware['version'])
+        except Exception:
+            valid = False
+
+        if not valid:
+            logger.info("The cached information for {} is out of date.".format(self.device_id))
+
+            self.firmware = {'major': None, 'minor': None, 'version': None}
+            self.cache.remove(self.device_id)
+
+            return None
+
+        self.serial_number = entry.get('sn')
+
+        if entry.get('config'):
+            try:
+                self._config = ConfigVariables.from_dict(entry['config'])
+            except (KeyError, TypeError, ValueError):
+                logger.info("Ignoring the cached configuration variables for {}.".format(self.device_id))
+
+        return entry
+
+    def _parse_version(self, infostring):
+        """Returns the firmware version in an info string as an integer
+
+        :param infostring: The info string (see read_info_string)
+
+        :type infostring: string
+
+        :rtype: int
+
+        :Example:
+
+        >>> alpha._parse_version('OPC-N2 FirmwareVer=OPC-018.2....................BD')
+        18
+        """
+        return int(re.findall(r"\d{3}", infostring)[-1])
+
+    def _update_cache(self, **values):
+        """Store values in the device cache, if there is one."""
+        if self.cache is None or self.device_id is None:
+            return
+
+        try:
+            self.cache.update(self.device_id, **values)
+        except (IOError, OSError):
+            logger.warning("Could not update the device cache.", exc_info=True)
+
+    def _begin_transaction(self, owner=None, name=None):
+        """Wait until the guard time since the previous command has elapsed, and acquire
+        the bus lock. This is called at the start of every command sequence (see
+        opc.decorators.transaction).
+
+        :param owner: Owner of the bus lock. Defaults to the current thread.
+        :param name: Name of the command in the metrics
+        """
+        start = monotonic() if self._metrics is not None else None
+
+        while True:
+            delay = self._next_command - monotonic()
+
+            if delay > 0:
+                sleep(delay)
+
+            self.bus_lock.acquire(owner)
+
+            # Another thread may have used this OPC while we waited for the bus
+            if self._next_command <= monotonic():
+                break
+
+            self.bus_lock.release(owner)
+
+        if self._metrics is not None or self.trace is not None:
+            self._begin_command(name, start)
+
+    def _end_transaction(self, owner=None, error=False):
+        """Mark the end of a command sequence, arm the guard time before the next one and
+        release the bus lock.
+
+        :param owner: Owner of the bus lock. Defaults to the current thread.
+        :param error: True if the command sequence raised an exception
+        """
+        if self._metrics is not None or self.trace is not None:
+            self._end_command(error)
+
+        self._next_command = monotonic() + self.timing.guard
+
+        self.bus_lock.release(owner)
+
+    def _begin_command(self, name, start=None):
+        """Record the start of a command in the metrics and trace, once the bus lock is held.
+
+        :param name: Name of the command
+        :param start: Time at which the command started waiting for the bus (opc.timing.monotonic)
+        """
+        if self._metrics is not None:
+            self._metrics.begin(name, monotonic() - start if start is not None else 0.)
+
+        if self.trace is not None:
+            self.trace.begin(self, name)
+
+    def _end_command(self, error=False):
+        """Record the end of a command in the metrics and trace.
+
+        :param error: True if the command raised an exception
+        """
+        if self._metrics is not None:
+            self._metrics.end(error)
+
+        if self.trace is not None:
+            self.trace.end(self)
+
+    def _xfer(self, values, *args):
+        """Send a list of bytes to the OPC with the connection's xfer and return the
+        response, recording the transfer in the metrics and trace if they are enabled.
+
+        :param values: list of bytes to send
+        :param args: Passed on to the connection (speed_hz, delay_usecs)
+
+        :type values: list
+
+        :rtype: list
+        """
+        if self._metrics is None and self.trace is None:
+            return self.cnxn.xfer(values, *args)
+
+        start = monotonic()
+        resp = self.cnxn.xfer(values, *args)
+
+        if self._metrics is not None:
+            self._metrics.transfer(len(values), monotonic() - start)
+
+        if self.trace is not None:
+            self.trace.record(self, values, resp, start)
+
+        return resp
+
+    def _xfer_frame(self, values):
+        """Send a list of bytes to the OPC in a single transfer and return the response. The
+        byte delay of the timing profile is passed to transports that accept it (spidev, as
+        delay_usecs), which wait that long after the last byte of the transfer; the bytes
+        within a transfer are sent back-to-back. Transports that do not accept a delay
+        (usbiss) are detected from their xfer (see opc.timing.accepts_delay).
+
+        :param values: list of bytes to send
+
+        :type values: list
+
+        :rtype: list
+        """
+        if self._xfer_delay_supported:
+            return self._xfer(values, 0, self.timing.byte_delay_us)
+
+        return self._xfer(values)
+
+    def _read_bytes(self, nbytes):
+        """Read a response from the OPC by sending empty bytes. By default, one byte is read
+        per transfer, and each is followed by the byte delay. If frame reads are enabled, the
+        whole response is read in one transfer, with no delay between its bytes.
+
+        :param nbytes: number of bytes to read
+
+        :type nbytes: int
+
+        :rtype: bytearray
+        """
+        if self.frame_reads:
+            return bytearray(self._xfer_frame([0x00] * nbytes))
+
+        return bytearray(self._xfer_frame([0x00])[0] for i in range(nbytes))
 
     def _16bit_unsigned(self, LSB, MSB):
         """Returns the combined LSB and MSB
@@ -230,8 +495,20 @@ class _OPC(object):
             :rtype: int
         """
 
-        return min(enumerate(OPC_LOOKUP), key = lambda x: abs(x[1] - bb))[0]
+        return adc_value(bb)
+
+    def calculate_bin_boundaries(self, bbs):
+        """Calculate the adc values that correspond to an array of bin boundary diameters in microns.
+
+            :param bbs: Bin Boundaries in microns
 
+            :type bbs: array-like
+
+            :rtype: numpy.ndarray (or a list if numpy is not installed)
+        """
+        return adc_values(bbs)
+
+    @transaction
     def read_info_string(self):
         """Reads the information string for the OPC
 
@@ -242,32 +519,59 @@ class _OPC(object):
         >>> alpha.read_info_string()
         'OPC-N2 FirmwareVer=OPC-018.2....................BD'
         """
-        infostring = []
-
-        # Send the command byte and sleep for 9 ms
-        self.cnxn.xfer([0x3F])
-        sleep(9e-3)
+        # Send the command byte and wait for the command delay
+        self._xfer([0x3F])
+        sleep(self.timing.command_delay)
 
         # Read the info string by sending 60 empty bytes
-        for i in range(60):
-            resp = self.cnxn.xfer([0x00])[0]
-            infostring.append(chr(resp))
-
-        sleep(0.1)
+        infostring = [chr(b) for b in self._read_bytes(60)]
 
         return ''.join(infostring)
 
+    @transaction
     def ping(self):
         """Checks the connection between the Raspberry Pi and the OPC
 
         :rtype: Boolean
         """
-        b = self.cnxn.xfer([0xCF])[0]           # send the command byte
-
-        sleep(0.1)
+        b = self._xfer([0xCF])[0]           # send the command byte
 
         return True if b == 0xF3 else False
 
+    def enable_metrics(self):
+        """Start recording the latency, bytes transferred and errors of every command,
+        discarding any metrics recorded so far (see opc.metrics.Metrics).
+
+        :rtype: opc.metrics.Metrics
+        """
+        self._metrics = Metrics()
+
+        return self._metrics
+
+    def disable_metrics(self):
+        """Stop recording metrics."""
+        self._metrics = None
+
+    def metrics(self):
+        """Return a snapshot of the metrics recorded since they were enabled, or None if
+        they are not being recorded. Commands are named after the methods that send them
+        (e.g. 'raw_histogram' for histogram), and each has a count, the number of errors,
+        the bytes transferred, the time spent waiting for the guard time and bus lock
+        ('wait'), in xfer ('transfer') and in between ('delay'), and a histogram of the
+        latency as a list of (upper bound in seconds, count).
+
+        :rtype: dictionary
+
+        :Example:
+
+        >>> alpha = opc.OPCN2(spi, metrics=True)
+        >>> alpha.histogram()
+        >>> stats = alpha.metrics()
+        >>> stats['checksum_failures'], stats['commands']['raw_histogram']['count']
+        (0, 1)
+        """
+        return self._metrics.snapshot() if self._metrics is not None else None
+
     def __repr__(self):
         return "Alphasense OPC-{}v{}".format(self.model, self.firmware['version'])
 
@@ -276,8 +580,10 @@ class OPCN2(_OPC):
     versions 14-18. opc.OPCN2 inherits from the opc.OPC parent class.
 
     :param spi_connection: The spidev instance for the SPI connection.
+    :param retry: Policy for reading a histogram again when it fails the checksum. By default, histogram returns None instead.
 
     :type spi_connection: spidev.SpiDev
+    :type retry: opc.retry.RetryPolicy
 
     :rtype: opc.OPCN2
 
@@ -289,7 +595,16 @@ class OPCN2(_OPC):
     >>> alpha
     Alphasense OPC-N2v18.2
     """
-    def __init__(self, spi_connection, **kwargs):
+    def __init__(self, spi_connection, retry=None, **kwargs):
+        # Histograms lost because they failed the checksum, and the sampling time they covered
+        self.retry              = retry
+        self.lost_frames        = 0
+        self.lost_sampling_time = 0.
+
+        # When the histogram was last read (and reset), and the lock that guards it and the lost frame counters
+        self._histogram_read    = None
+        self._histogram_lock    = threading.Lock()
+
         super(OPCN2, self).__init__(spi_connection, model='N2', **kwargs)
 
         firmware_min = 14.   # Minimum firmware version supported
@@ -300,6 +615,7 @@ class OPCN2(_OPC):
 
             raise FirmwareVersionError("Your firmware is not yet supported. Only versions 14-18 are currently supported.")
 
+    @transaction
     def on(self):
         """Turn ON the OPC (fan and laser)
 
@@ -310,13 +626,13 @@ class OPCN2(_OPC):
         >>> alpha.on()
         True
         """
-        b1 = self.cnxn.xfer([0x03])[0]          # send the command byte
-        sleep(9e-3)                             # sleep for 9 ms
-        b2, b3 = self.cnxn.xfer([0x00, 0x01])   # send the following byte
-        sleep(0.1)
+        b1 = self._xfer([0x03])[0]          # send the command byte
+        sleep(self.timing.command_delay)        # wait for the command delay
+        b2, b3 = self._xfer([0x00, 0x01])   # send the following byte
 
         return True if b1 == 0xF3 and b2 == 0x03 else False
 
+    @transaction
     def off(self):
         """Turn OFF the OPC (fan and laser)
 
@@ -327,15 +643,27 @@ class OPCN2(_OPC):
         >>> alpha.off()
         True
         """
-        b1 = self.cnxn.xfer([0x03])[0]          # send the command byte
-        sleep(9e-3)                             # sleep for 9 ms
-        b2 = self.cnxn.xfer([0x01])[0]          # send the following two bytes
-        sleep(0.1)
+        b1 = self._xfer([0x03])[0]          # send the command byte
+        sleep(self.timing.command_delay)        # wait for the command delay
+        b2 = self._xfer([0x01])[0]          # send the following two bytes
 
         return True if b1 == 0xF3 and b2 == 0x03 else False
 
-    def config(self):
-        """Read the configuration variables and returns them as a dictionary
+    def config(self, refresh=False):
+        """Return the configuration variables as a dictionary. They are read from the OPC
+        the first time and cached on the instance (and in the device cache, if there is one)
+        until they are changed by write_config_variables, save_config_variables,
+        set_fan_power or set_laser_power, or until refresh is True.
+
+        Each call returns a new dictionary, so changing it does not change the cached copy.
+        See config_record for the same values with the per-bin values in arrays.
+
+        As of v1.6.0, all 16 bin boundaries are included ('Bin Boundary 0' to 'Bin Boundary 15'),
+        as each is the lower boundary of a bin. Earlier versions left out 'Bin Boundary 15'.
+
+        :param refresh: If True, read the configuration variables from the OPC again
+
+        :type refresh: boolean
 
         :rtype: dictionary
 
@@ -353,51 +681,58 @@ class OPCN2(_OPC):
             ...
         }
         """
-        config  = []
-        data    = {}
+        return dict(self.config_record(refresh))
 
-        # Send the command byte and sleep for 10 ms
-        self.cnxn.xfer([0x3C])
-        sleep(10e-3)
+    def config_record(self, refresh=False):
+        """Return the configuration variables as an opc.records.ConfigVariables, which holds
+        the per-bin values in arrays (bin_boundaries, bpv, bpd and bsvw) and can also be used
+        as a read-only dictionary. They are cached as described in config, and each call
+        returns a copy with its own arrays.
 
-        # Read the config variables by sending 256 empty bytes
-        for i in range(256):
-            resp = self.cnxn.xfer([0x00])[0]
-            config.append(resp)
+        :param refresh: If True, read the configuration variables from the OPC again
 
-        # Add the bin bounds to the dictionary of data [bytes 0-29]
-        for i in range(0, 15):
-            data["Bin Boundary {0}".format(i)] = self._16bit_unsigned(config[2*i], config[2*i + 1])
+        :type refresh: boolean
 
-        # Add the Bin Particle Volumes (BPV) [bytes 32-95]
-        for i in range(0, 16):
-            data["BPV {0}".format(i)] = self._calculate_float(config[4*i + 32:4*i + 36])
+        :rtype: opc.records.ConfigVariables
 
-        # Add the Bin Particle Densities (BPD) [bytes 96-159]
-        for i in range(0, 16):
-            data["BPD {0}".format(i)] = self._calculate_float(config[4*i + 96:4*i + 100])
+        :Example:
 
-        # Add the Bin Sample Volume Weight (BSVW) [bytes 160-223]
-        for i in range(0, 16):
-            data["BSVW {0}".format(i)] = self._calculate_float(config[4*i + 160: 4*i + 164])
+        >>> alpha.config_record().bin_diameters[:3]
+        [0.38, 0.54, 0.78]
+        """
+        if self._config is None or refresh:
+            self._config = self._read_config()
 
-        # Add the Gain Scaling Coefficient (GSC) and sample flow rate (SFR)
-        data["GSC"] = self._calculate_float(config[224:228])
-        data["SFR"] = self._calculate_float(config[228:232])
+            self._update_cache(config=dict(self._config))
 
-        # Add laser dac (LDAC) and Fan dac (FanDAC)
-        data["LaserDAC"]    = config[232]
-        data["FanDAC"]      = config[233]
+        return self._config.copy()
 
-        # If past firmware 15, add other things
-        if self.firmware['major'] > 15.:
-            data['TOF_SFR'] = config[234]
+    def invalidate_config(self):
+        """Discard the cached configuration variables, so that they are read from the
+        OPC the next time config() is called.
+        """
+        self._config = None
 
-        sleep(0.1)
+        self._update_cache(config=None)
 
-        return data
+    @transaction
+    def _read_config(self):
+        """Read and decode the configuration variables from the OPC.
+
+        :rtype: opc.records.ConfigVariables
+        """
+        # Send the command byte and wait for the command delay
+        self._xfer([0x3C])
+        sleep(self.timing.command_delay)
+
+        # Read the config variables by sending 256 empty bytes
+        config = self._read_bytes(256)
+
+        # TOF_SFR is only sent by firmware 16+
+        return ConfigVariables.from_bytes(config, tof_sfr=self.firmware['major'] > 15.)
 
     @requires_firmware(18.)
+    @transaction
     def config2(self):
         """Read the second set of configuration variables and return as a dictionary.
 
@@ -417,17 +752,14 @@ class OPCN2(_OPC):
             'AMLaserOnIdle': 0
         }
         """
-        config  = []
         data    = {}
 
-        # Send the command byte and sleep for 10 ms
-        self.cnxn.xfer([0x3D])
-        sleep(10e-3)
+        # Send the command byte and wait for the command delay
+        self._xfer([0x3D])
+        sleep(self.timing.command_delay)
 
-        # Read the config variables by sending 256 empty bytes
-        for i in range(9):
-            resp = self.cnxn.xfer([0x00])[0]
-            config.append(resp)
+        # Read the config variables by sending 9 empty bytes
+        config = self._read_bytes(9)
 
         data["AMSamplingInterval"]      = self._16bit_unsigned(config[0], config[1])
         data["AMIdleIntervalCount"]     = self._16bit_unsigned(config[2], config[3])
@@ -436,8 +768,6 @@ class OPCN2(_OPC):
         data['AMMaxDataArraysInFile']   = self._16bit_unsigned(config[6], config[7])
         data['AMOnlySavePMData']        = config[8]
 
-        sleep(0.1)
-
         return data
 
     def write_config_variables(self, config_vars):
@@ -451,6 +781,8 @@ class OPCN2(_OPC):
         """
         logger.warning("This method has not yet been implemented yet.")
 
+        self.invalidate_config()
+
         return
 
     @requires_firmware(18.)
@@ -469,15 +801,81 @@ class OPCN2(_OPC):
 
         return
 
-    def histogram(self, number_concentration=True):
+    def raw_histogram(self):
+        """Read and reset the histogram, returning the raw 62 byte frame without
+        decoding it. The frame can be decoded later with opc.decoders, which is useful
+        for archiving.
+
+        :rtype: bytearray
+
+        :Example:
+
+        >>> frame = alpha.raw_histogram()
+        >>> opc.decoders.histogram_layout('N2', alpha.firmware['version']).decode(frame)
+        """
+        return self._raw_histogram()[0]
+
+    @transaction
+    def _raw_histogram(self):
+        """Read and reset the histogram. Returns the raw frame and the time since the
+        previous read (see _mark_histogram_read)."""
+        # Send the command byte
+        self._xfer([0x30])
+
+        # Wait for the command delay
+        sleep(self.timing.command_delay)
+
+        # read the histogram
+        resp = self._read_bytes(62)
+
+        return resp, self._mark_histogram_read()
+
+    def _mark_histogram_read(self):
+        """Note the time at which the histogram was read (and reset), so the sampling time
+        lost with a frame that fails the checksum can be accounted for. Returns the time
+        since the previous read, or None if this is the first."""
+        now = monotonic()
+
+        with self._histogram_lock:
+            interval = now - self._histogram_read if self._histogram_read is not None else None
+            self._histogram_read = now
+
+        return interval
+
+    def _lose_frame(self, data, interval=None):
+        """Account for a histogram that failed the checksum. The sampling time it covered is
+        taken as the time since the previous read, as the sampling period in the frame may
+        itself be corrupt."""
+        lost = interval
+
+        if lost is None:
+            period = data['Sampling Period']
+            lost = period if period == period and 0 <= period < 3600 else 0.
+
+        with self._histogram_lock:
+            self.lost_frames += 1
+            self.lost_sampling_time += lost
+
+    def histogram(self, number_concentration=True, compact=False, sfr=None):
         """Read and reset the histogram. As of v1.3.0, histogram
         values are reported in particle number concentration (#/cc) by default.
 
+        If the checksum does not match, the frame is counted in lost_frames and
+        lost_sampling_time, and the histogram is read again according to the retry
+        policy of the OPC (see opc.retry.RetryPolicy). None is returned if every
+        attempt fails.
+
         :param number_concentration: If true, histogram bins are reported in number concentration vs. raw values.
+        :param compact: If true, return a compact opc.records.Histogram, which can be used like the dictionary.
+        :param sfr: Sample flow rate in ml/s to use for firmware that does not send it (< 16), e.g. config()['SFR']. Required for number concentrations on that firmware.
 
         :type number_concentration: boolean
+        :type compact: boolean
+        :type sfr: float
 
-        :rtype: dictionary
+        :raises: ValueError if number_concentration is True, and the firmware does not send the SFR and none is given
+
+        :rtype: dictionary or opc.records.Histogram
 
         :Example:
 
@@ -502,110 +900,74 @@ class OPCN2(_OPC):
             'Checksum': 0
         }
         """
-        resp = []
-        data = {}
+        resp, interval = self._raw_histogram()
+        data = self._decode_histogram(resp, number_concentration, compact, interval, sfr)
 
-        # Send the command byte
-        self.cnxn.xfer([0x30])
+        if data is None and self.retry is not None:
+            for delay in self.retry.delays():
+                sleep(delay)
 
-        # Wait 10 ms
-        sleep(10e-3)
+                resp, interval = self._raw_histogram()
+                data = self._decode_histogram(resp, number_concentration, compact, interval, sfr)
+                if data is not None:
+                    break
 
-        # read the histogram
-        for i in range(62):
-            r = self.cnxn.xfer([0x00])[0]
-            resp.append(r)
+        return data
 
-        # convert to real things and store in dictionary!
-        data['Bin 0']           = self._16bit_unsigned(resp[0], resp[1])
-        data['Bin 1']           = self._16bit_unsigned(resp[2], resp[3])
-        data['Bin 2']           = self._16bit_unsigned(resp[4], resp[5])
-        data['Bin 3']           = self._16bit_unsigned(resp[6], resp[7])
-        data['Bin 4']           = self._16bit_unsigned(resp[8], resp[9])
-        data['Bin 5']           = self._16bit_unsigned(resp[10], resp[11])
-        data['Bin 6']           = self._16bit_unsigned(resp[12], resp[13])
-        data['Bin 7']           = self._16bit_unsigned(resp[14], resp[15])
-        data['Bin 8']           = self._16bit_unsigned(resp[16], resp[17])
-        data['Bin 9']           = self._16bit_unsigned(resp[18], resp[19])
-        data['Bin 10']          = self._16bit_unsigned(resp[20], resp[21])
-        data['Bin 11']          = self._16bit_unsigned(resp[22], resp[23])
-        data['Bin 12']          = self._16bit_unsigned(resp[24], resp[25])
-        data['Bin 13']          = self._16bit_unsigned(resp[26], resp[27])
-        data['Bin 14']          = self._16bit_unsigned(resp[28], resp[29])
-        data['Bin 15']          = self._16bit_unsigned(resp[30], resp[31])
-        data['Bin1 MToF']       = self._calculate_mtof(resp[32])
-        data['Bin3 MToF']       = self._calculate_mtof(resp[33])
-        data['Bin5 MToF']       = self._calculate_mtof(resp[34])
-        data['Bin7 MToF']       = self._calculate_mtof(resp[35])
-
-        # Bins associated with firmware versions 14 and 15(?)
-        if self.firmware['version'] < 16.:
-            data['Temperature']     = self._calculate_temp(resp[36:40])
-            data['Pressure']        = self._calculate_pressure(resp[40:44])
-            data['Sampling Period'] = self._calculate_period(resp[44:48])
-            data['Checksum']        = self._16bit_unsigned(resp[48], resp[49])
-            data['PM1']             = self._calculate_float(resp[50:54])
-            data['PM2.5']           = self._calculate_float(resp[54:58])
-            data['PM10']            = self._calculate_float(resp[58:])
+    def _decode_histogram(self, resp, number_concentration=True, compact=False, interval=None, sfr=None):
+        """Decode a raw histogram frame (see histogram). Returns None if the checksum does
+        not match.
 
-        else:
-            data['SFR']             = self._calculate_float(resp[36:40])
+        :param resp: The raw 62 byte frame
+        :param number_concentration: If true, histogram bins are reported in number concentration vs. raw values.
+        :param compact: If true, return a compact opc.records.Histogram
+        :param interval: Time since the previous histogram read, charged to lost_sampling_time if the checksum does not match
+        :param sfr: Sample flow rate in ml/s to use for firmware that does not send it (< 16)
 
-            # Alright, we don't know whether it is temp or pressure since it switches..
-            tmp = self._calculate_pressure(resp[40:44])
-            if tmp > 98000:
-                data['Temperature'] = None
-                data['Pressure']    = tmp
-            else:
-                tmp = self._calculate_temp(resp[40:44])
-                if tmp < 500:
-                    data['Temperature'] = tmp
-                    data['Pressure']    = None
-                else:
-                    data['Temperature'] = None
-                    data['Pressure']    = None
-
-            data['Sampling Period'] = self._calculate_float(resp[44:48])
-            data['Checksum']        = self._16bit_unsigned(resp[48], resp[49])
-            data['PM1']             = self._calculate_float(resp[50:54])
-            data['PM2.5']           = self._calculate_float(resp[54:58])
-            data['PM10']            = self._calculate_float(resp[58:])
-
-        # Calculate the sum of the histogram bins
-        histogram_sum = data['Bin 0'] + data['Bin 1'] + data['Bin 2']   + \
-                data['Bin 3'] + data['Bin 4'] + data['Bin 5'] + data['Bin 6']   + \
-                data['Bin 7'] + data['Bin 8'] + data['Bin 9'] + data['Bin 10']  + \
-                data['Bin 11'] + data['Bin 12'] + data['Bin 13'] + data['Bin 14'] + \
-                data['Bin 15']
+        :rtype: dictionary or opc.records.Histogram
+        """
+        # convert to real things using the frame layout of this firmware version
+        layout = histogram_layout(self.model, self.firmware['version'])
+
+        if compact:
+            data = layout.decode_compact(resp)
+            histogram_sum = sum(data.bins)
+        else:
+            data = layout.decode(resp)
+            histogram_sum = sum(data[key] for key in BIN_KEYS)
 
         # Check that checksum and the least significant bits of the sum of histogram bins
         # are equivilant
         if (histogram_sum & 0x0000FFFF) != data['Checksum']:
             logger.warning("Data transfer was incomplete")
+
+            if self._metrics is not None:
+                self._metrics.checksum_failure()
+
+            self._lose_frame(data, interval)
+
             return None
 
-        # If histogram is true, convert histogram values to number concentration
+        if self._metrics is not None:
+            self._metrics.sample(data['Sampling Period'])
+
+        # Firmware < 16 does not send the SFR
         if number_concentration is True:
-            _conv_ = data['SFR'] * data['Sampling Period'] # Divider in units of ml (cc)
-
-            data['Bin 0']   = data['Bin 0'] / _conv_
-            data['Bin 1']   = data['Bin 1'] / _conv_
-            data['Bin 2']   = data['Bin 2'] / _conv_
-            data['Bin 3']   = data['Bin 3'] / _conv_
-            data['Bin 4']   = data['Bin 4'] / _conv_
-            data['Bin 5']   = data['Bin 5'] / _conv_
-            data['Bin 6']   = data['Bin 6'] / _conv_
-            data['Bin 7']   = data['Bin 7'] / _conv_
-            data['Bin 8']   = data['Bin 8'] / _conv_
-            data['Bin 9']   = data['Bin 9'] / _conv_
-            data['Bin 10']  = data['Bin 10'] / _conv_
-            data['Bin 11']  = data['Bin 11'] / _conv_
-            data['Bin 12']  = data['Bin 12'] / _conv_
-            data['Bin 13']  = data['Bin 13'] / _conv_
-            data['Bin 14']  = data['Bin 14'] / _conv_
-            data['Bin 15']  = data['Bin 15'] / _conv_
-
-        sleep(0.1)
+            sfr = data.get('SFR', sfr)
+
+            if sfr is None:
+                raise ValueError("Firmware {} does not send the SFR, so it must be given to calculate number "
+                                 "concentrations (e.g. sfr=alpha.config()['SFR']).".format(self.firmware['version']))
+
+        # If histogram is true, convert histogram values to number concentration
+        if number_concentration is True and compact:
+            data.to_number_concentration(sfr)
+
+        elif number_concentration is True:
+            _conv_ = sfr * data['Sampling Period'] # Divider in units of ml (cc)
+
+            for key in BIN_KEYS:
+                data[key] = data[key] / _conv_
 
         return data
 
@@ -620,27 +982,38 @@ class OPCN2(_OPC):
         >>> alpha.save_config_variables()
         True
         """
+        try:
+            return self._save_config_variables()
+        finally:
+            # Invalidated once the bus is released, as the device cache is written to disk
+            self.invalidate_config()
+
+    @transaction
+    def _save_config_variables(self):
+        """Send the save configuration variables command sequence (see save_config_variables).
+
+        :rtype: boolean
+        """
         command = 0x43
         byte_list = [0x3F, 0x3C, 0x3F, 0x3C, 0x43]
         success = [0xF3, 0x43, 0x3F, 0x3C, 0x3F, 0x3C]
         resp = []
 
-        # Send the command byte and then wait for 10 ms
-        r = self.cnxn.xfer([command])[0]
-        sleep(10e-3)
+        # Send the command byte and then wait for the command delay
+        r = self._xfer([command])[0]
+        sleep(self.timing.command_delay)
 
         # append the response of the command byte to the List
         resp.append(r)
 
         # Send the rest of the config bytes
         for each in byte_list:
-            r = self.cnxn.xfer([each])[0]
+            r = self._xfer([each])[0]
             resp.append(r)
 
-        sleep(0.1)
-
         return True if resp == success else False
 
+    @transaction
     def _enter_bootloader_mode(self):
         """Enter bootloader mode. Must be issued prior to writing
         configuration variables to non-volatile memory.
@@ -653,7 +1026,7 @@ class OPCN2(_OPC):
         True
         """
 
-        return True if self.cnxn.xfer(0x41)[0] == 0xF3 else False
+        return True if self._xfer([0x41])[0] == 0xF3 else False
 
     def set_fan_power(self, power):
         """Set only the Fan power.
@@ -673,15 +1046,26 @@ class OPCN2(_OPC):
         if power > 255:
             raise ValueError("The fan power should be a single byte (0-255).")
 
-        # Send the command byte and wait 10 ms
-        a = self.cnxn.xfer([0x42])[0]
-        sleep(10e-3)
+        try:
+            return self._set_fan_power(power)
+        finally:
+            # The DAC values are part of the configuration variables. They are invalidated
+            # once the bus is released, as the device cache is written to disk
+            self.invalidate_config()
 
-        # Send the next two bytes
-        b = self.cnxn.xfer([0x00])[0]
-        c = self.cnxn.xfer([power])[0]
+    @transaction
+    def _set_fan_power(self, power):
+        """Send the command to set the fan power (see set_fan_power).
+
+        :rtype: boolean
+        """
+        # Send the command byte and wait for the command delay
+        a = self._xfer([0x42])[0]
+        sleep(self.timing.command_delay)
 
-        sleep(0.1)
+        # Send the next two bytes
+        b = self._xfer([0x00])[0]
+        c = self._xfer([power])[0]
 
         return True if a == 0xF3 and b == 0x42 and c == 0x00 else False
 
@@ -699,23 +1083,34 @@ class OPCN2(_OPC):
         >>> alpha.set_laser_power(230)
         True
         """
-
         # Check to make sure the value is a single byte
         if power > 255:
             raise ValueError("Laser Power should be a single byte (0-255).")
 
-        # Send the command byte and wait 10 ms
-        a = self.cnxn.xfer([0x42])[0]
-        sleep(10e-3)
+        try:
+            return self._set_laser_power(power)
+        finally:
+            # The DAC values are part of the configuration variables. They are invalidated
+            # once the bus is released, as the device cache is written to disk
+            self.invalidate_config()
 
-        # Send the next two bytes
-        b = self.cnxn.xfer([0x01])[0]
-        c = self.cnxn.xfer([power])[0]
+    @transaction
+    def _set_laser_power(self, power):
+        """Send the command to set the laser power (see set_laser_power).
 
-        sleep(0.1)
+        :rtype: boolean
+        """
+        # Send the command byte and wait for the command delay
+        a = self._xfer([0x42])[0]
+        sleep(self.timing.command_delay)
+
+        # Send the next two bytes
+        b = self._xfer([0x01])[0]
+        c = self._xfer([power])[0]
 
         return True if a == 0xF3 and b == 0x42 and c == 0x01 else False
 
+    @transaction
     def toggle_laser(self, state):
         """Toggle the power state of the laser.
 
@@ -731,21 +1126,20 @@ class OPCN2(_OPC):
         True
         """
 
-        # Send the command byte and wait 10 ms
-        a = self.cnxn.xfer([0x03])[0]
+        # Send the command byte and wait for the command delay
+        a = self._xfer([0x03])[0]
 
-        sleep(10e-3)
+        sleep(self.timing.command_delay)
 
         # If state is true, turn the laser ON, else OFF
         if state:
-            b = self.cnxn.xfer([0x02])[0]
+            b = self._xfer([0x02])[0]
         else:
-            b = self.cnxn.xfer([0x03])[0]
-
-        sleep(0.1)
+            b = self._xfer([0x03])[0]
 
         return True if a == 0xF3 and b == 0x03 else False
 
+    @transaction
     def toggle_fan(self, state):
         """Toggle the power state of the fan.
 
@@ -761,22 +1155,21 @@ class OPCN2(_OPC):
         True
         """
 
-        # Send the command byte and wait 10 ms
-        a = self.cnxn.xfer([0x03])[0]
+        # Send the command byte and wait for the command delay
+        a = self._xfer([0x03])[0]
 
-        sleep(10e-3)
+        sleep(self.timing.command_delay)
 
         # If state is true, turn the fan ON, else OFF
         if state:
-            b = self.cnxn.xfer([0x04])[0]
+            b = self._xfer([0x04])[0]
         else:
-            b = self.cnxn.xfer([0x05])[0]
-
-        sleep(0.1)
+            b = self._xfer([0x05])[0]
 
         return True if a == 0xF3 and b == 0x03 else False
 
     @requires_firmware(18.)
+    @transaction
     def read_pot_status(self):
         """Read the status of the digital pot. Firmware v18+ only.
         The return value is a dictionary containing the following as
@@ -794,17 +1187,13 @@ class OPCN2(_OPC):
             'LaserON': 0
         }
         """
-        # Send the command byte and wait 10 ms
-        a = self.cnxn.xfer([0x13])[0]
+        # Send the command byte and wait for the command delay
+        a = self._xfer([0x13])[0]
 
-        sleep(10e-3)
+        sleep(self.timing.command_delay)
 
         # Build an array of the results
-        res = []
-        for i in range(4):
-            res.append(self.cnxn.xfer([0x00])[0])
-
-        sleep(0.1)
+        res = self._read_bytes(4)
 
         return {
             'FanON':        res[0],
@@ -814,6 +1203,7 @@ class OPCN2(_OPC):
             }
 
     @requires_firmware(18.)
+    @transaction
     def sn(self):
         """Read the Serial Number string. This method is only available on OPC-N2
         firmware versions 18+.
@@ -825,20 +1215,17 @@ class OPCN2(_OPC):
         >>> alpha.sn()
         'OPC-N2 123456789'
         """
-        string = []
-
-        # Send the command byte and sleep for 9 ms
-        self.cnxn.xfer([0x10])
-        sleep(9e-3)
+        # Send the command byte and wait for the command delay
+        self._xfer([0x10])
+        sleep(self.timing.command_delay)
 
         # Read the info string by sending 60 empty bytes
-        for i in range(60):
-            resp = self.cnxn.xfer([0x00])[0]
-            string.append(chr(resp))
+        string = [chr(b) for b in self._read_bytes(60)]
 
-        sleep(0.1)
+        self.serial_number = ''.join(string)
+        self._update_cache(sn=self.serial_number)
 
-        return ''.join(string)
+        return self.serial_number
 
     @requires_firmware(18.)
     def write_sn(self):
@@ -854,6 +1241,7 @@ class OPCN2(_OPC):
         return
 
     @requires_firmware(18.)
+    @transaction
     def read_firmware(self):
         """Read the firmware version of the OPC-N2. Firmware v18+ only.
 
@@ -868,21 +1256,19 @@ class OPCN2(_OPC):
             'version': 18.2
         }
         """
-        # Send the command byte and sleep for 9 ms
-        self.cnxn.xfer([0x12])
-        sleep(10e-3)
+        # Send the command byte and wait for the command delay
+        self._xfer([0x12])
+        sleep(self.timing.command_delay)
 
-        self.firmware['major'] = self.cnxn.xfer([0x00])[0]
-        self.firmware['minor'] = self.cnxn.xfer([0x00])[0]
+        self.firmware['major'], self.firmware['minor'] = self._read_bytes(2)
 
         # Build the firmware version
         self.firmware['version'] = float('{}.{}'.format(self.firmware['major'], self.firmware['minor']))
 
-        sleep(0.1)
-
         return self.firmware
 
     @requires_firmware(18.)
+    @transaction
     def pm(self):
         """Read the PM data and reset the histogram
 
@@ -900,29 +1286,74 @@ class OPCN2(_OPC):
         }
         """
 
-        resp = []
         data = {}
 
         # Send the command byte
-        self.cnxn.xfer([0x32])
+        self._xfer([0x32])
 
-        # Wait 10 ms
-        sleep(10e-3)
+        # Wait for the command delay
+        sleep(self.timing.command_delay)
 
-        # read the histogram
-        for i in range(12):
-            r = self.cnxn.xfer([0x00])[0]
-            resp.append(r)
+        # read the PM values, which also resets the histogram
+        resp = self._read_bytes(12)
+        self._mark_histogram_read()
 
         # convert to real things and store in dictionary!
         data['PM1']     = self._calculate_float(resp[0:4])
         data['PM2.5']   = self._calculate_float(resp[4:8])
         data['PM10']    = self._calculate_float(resp[8:])
 
-        sleep(0.1)
-
         return data
 
+    def stream(self, interval=1., mode='histogram', buffer_size=64, count=None, **kwargs):
+        """Read the OPC continuously on a fixed, drift-free schedule in a background thread,
+        and iterate over the timestamped samples. The stream stops reading once it is closed,
+        or once it is no longer referenced (e.g. after breaking out of a loop over it). See
+        opc.acquisition.Stream.
+
+        :param interval: Time between reads in seconds
+        :param mode: 'histogram' to read the full histogram, or 'pm' to read only the PM values (firmware v18+)
+        :param buffer_size: Maximum number of samples held until they are consumed
+        :param count: Stop after this many samples. By default, the stream runs until it is closed.
+        :param kwargs: Passed on to histogram (e.g. number_concentration, compact)
+
+        :type interval: float
+        :type mode: string
+        :type buffer_size: int
+        :type count: int
+
+        :rtype: opc.acquisition.Stream
+
+        :Example:
+
+        >>> alpha.on()
+        >>> for sample in alpha.stream(interval=5., count=3):
+        ...     print (sample.timestamp, sample.data['PM10'])
+        """
+        return Stream(self, interval, mode=mode, buffer_size=buffer_size, count=count, **kwargs)
+
+    def prefetch(self, interval=1., mode='histogram', **kwargs):
+        """Read the OPC on a fixed schedule in a background thread, and keep the latest
+        sample so that any number of consumers can read it without touching the bus. See
+        opc.acquisition.Prefetcher.
+
+        :param interval: Time between reads in seconds
+        :param mode: 'histogram' to read the full histogram, or 'pm' to read only the PM values (firmware v18+)
+        :param kwargs: Passed on to histogram (e.g. number_concentration, compact)
+
+        :type interval: float
+        :type mode: string
+
+        :rtype: opc.acquisition.Prefetcher
+
+        :Example:
+
+        >>> prefetcher = alpha.prefetch(interval=1.)
+        >>> prefetcher.latest(max_age=5.)
+        Sample(timestamp=1507746215.3, monotonic=1342.1, data={...})
+        """
+        return Prefetcher(self, interval, mode=mode, **kwargs)
+
 class OPCN1(_OPC):
     """Create an instance of the Alphasene OPC-N1. opc.OPCN1 inherits from
     the opc.OPC parent class.
@@ -938,64 +1369,62 @@ class OPCN1(_OPC):
     def __init(self, spi_connection, **kwargs):
         super(OPCN1, self).__init__(spi_connection, model='N1', **kwargs)
 
+    @transaction
     def on(self):
         """Turn ON the OPC (fan and laser)
 
         :returns: boolean success state
         """
-        b1 = self.cnxn.xfer([0x0C])[0]          # send the command byte
-        sleep(9e-3)                             # sleep for 9 ms
+        b1 = self._xfer([0x0C])[0]          # send the command byte
+        sleep(self.timing.command_delay)
 
         return True if b1 == 0xF3 else False
 
+    @transaction
     def off(self):
         """Turn OFF the OPC (fan and laser)
 
         :returns: boolean success state
         """
-        b1 = self.cnxn.xfer([0x03])[0]          # send the command byte
-        sleep(9e-3)                             # sleep for 9 ms
+        b1 = self._xfer([0x03])[0]          # send the command byte
+        sleep(self.timing.command_delay)
 
         return True if b1 == 0xF3 else False
 
+    @transaction
     def read_gsc_sfr(self):
         """Read the gain-scaling-coefficient and sample flow rate.
 
         :returns: dictionary containing GSC and SFR
         """
-        config  = []
         data    = {}
 
-        # Send the command byte and sleep for 10 ms
-        self.cnxn.xfer([0x33])
-        sleep(10e-3)
+        # Send the command byte and wait for the command delay
+        self._xfer([0x33])
+        sleep(self.timing.command_delay)
 
-        # Read the config variables by sending 256 empty bytes
-        for i in range(8):
-            resp = self.cnxn.xfer([0x00])[0]
-            config.append(resp)
+        # Read the config variables by sending 8 empty bytes
+        config = self._read_bytes(8)
 
         data["GSC"] = self._calculate_float(config[0:4])
         data["SFR"] = self._calculate_float(config[4:])
 
         return data
 
+    @transaction
     def read_bin_boundaries(self):
         """Return the bin boundaries.
 
         :returns: dictionary with 17 bin boundaries.
         """
-        config  = []
         data    = {}
 
-        # Send the command byte and sleep for 10 ms
-        self.cnxn.xfer([0x33])
-        sleep(10e-3)
+        # Send the command byte and wait for the command delay
+        self._xfer([0x33])
+        sleep(self.timing.command_delay)
 
-        # Read the config variables by sending 256 empty bytes
-        for i in range(30):
-            resp = self.cnxn.xfer([0x00])[0]
-            config.append(resp)
+        # Read the config variables by sending 30 empty bytes
+        config = self._read_bytes(30)
 
         # Add the bin bounds to the dictionary of data [bytes 0-29]
         for i in range(0, 14):
@@ -1010,21 +1439,18 @@ class OPCN1(_OPC):
         """
         return
 
+    @transaction
     def read_bin_particle_density(self):
         """Read the bin particle density
 
         :returns: float
         """
-        config = []
+        # Send the command byte and wait for the command delay
+        self._xfer([0x33])
+        sleep(self.timing.command_delay)
 
-        # Send the command byte and sleep for 10 ms
-        self.cnxn.xfer([0x33])
-        sleep(10e-3)
-
-        # Read the config variables by sending 256 empty bytes
-        for i in range(4):
-            resp = self.cnxn.xfer([0x00])[0]
-            config.append(resp)
+        # Read the config variables by sending 4 empty bytes
+        config = self._read_bytes(4)
 
         bpd = self._calculate_float(config)
 
@@ -1038,6 +1464,7 @@ class OPCN1(_OPC):
         """
         return
 
+    @transaction
     def read_histogram(self):
         """Read and reset the histogram. The expected return is a dictionary
         containing the counts per bin, MToF for bins 1, 3, 5, and 7, temperature,
@@ -1047,57 +1474,22 @@ class OPCN1(_OPC):
 
         :returns: dictionary
         """
-        resp = []
-        data = {}
-
         # command byte
         command = 0x30
 
         # Send the command byte
-        self.cnxn.xfer([command])
+        self._xfer([command])
 
-        # Wait 10 ms
-        sleep(10e-3)
+        # Wait for the command delay
+        sleep(self.timing.command_delay)
 
         # read the histogram
-        for i in range(62):
-            r = self.cnxn.xfer([0x00])[0]
-            resp.append(r)
+        resp = self._read_bytes(62)
 
         # convert to real things and store in dictionary!
-        data['Bin 0']           = self._16bit_unsigned(resp[0], resp[1])
-        data['Bin 1']           = self._16bit_unsigned(resp[2], resp[3])
-        data['Bin 2']           = self._16bit_unsigned(resp[4], resp[5])
-        data['Bin 3']           = self._16bit_unsigned(resp[6], resp[7])
-        data['Bin 4']           = self._16bit_unsigned(resp[8], resp[9])
-        data['Bin 5']           = self._16bit_unsigned(resp[10], resp[11])
-        data['Bin 6']           = self._16bit_unsigned(resp[12], resp[13])
-        data['Bin 7']           = self._16bit_unsigned(resp[14], resp[15])
-        data['Bin 8']           = self._16bit_unsigned(resp[16], resp[17])
-        data['Bin 9']           = self._16bit_unsigned(resp[18], resp[19])
-        data['Bin 10']          = self._16bit_unsigned(resp[20], resp[21])
-        data['Bin 11']          = self._16bit_unsigned(resp[22], resp[23])
-        data['Bin 12']          = self._16bit_unsigned(resp[24], resp[25])
-        data['Bin 13']          = self._16bit_unsigned(resp[26], resp[27])
-        data['Bin 14']          = self._16bit_unsigned(resp[28], resp[29])
-        data['Bin 15']          = self._16bit_unsigned(resp[30], resp[31])
-        data['Bin1 MToF']       = self._calculate_mtof(resp[32])
-        data['Bin3 MToF']       = self._calculate_mtof(resp[33])
-        data['Bin5 MToF']       = self._calculate_mtof(resp[34])
-        data['Bin7 MToF']       = self._calculate_mtof(resp[35])
-        data['Temperature']     = self._calculate_temp(resp[36:40])
-        data['Pressure']        = self._calculate_pressure(resp[40:44])
-        data['Sampling Period'] = self._calculate_period(resp[44:48])
-        data['Checksum']        = self._16bit_unsigned(resp[48], resp[49])
-        data['PM1']             = self._calculate_float(resp[50:54])
-        data['PM2.5']           = self._calculate_float(resp[54:58])
-        data['PM10']            = self._calculate_float(resp[58:])
-
-        # Calculate the sum of the histogram bins
-        histogram_sum = data['Bin 0'] + data['Bin 1'] + data['Bin 2']   + \
-                data['Bin 3'] + data['Bin 4'] + data['Bin 5'] + data['Bin 6']   + \
-                data['Bin 7'] + data['Bin 8'] + data['Bin 9'] + data['Bin 10']  + \
-                data['Bin 11'] + data['Bin 12'] + data['Bin 13'] + data['Bin 14'] + \
-                data['Bin 15']
+        data = N1_LAYOUT.decode(resp)
+
+        if self._metrics is not None:
+            self._metrics.sample(data['Sampling Period'])
 
         return data
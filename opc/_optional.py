@@ -0,0 +1,22 @@
+''' Optional dependencies, which are only imported when they are first needed '''
+import importlib
+
+def optional_import(module, purpose):
+    """Return a function that imports an optional dependency, raising an ImportError that
+    explains what it is needed for if it is not installed.
+
+    :param module: Name of the module
+    :param purpose: What the module is needed for, e.g. 'to read archives'
+
+    :type module: string
+    :type purpose: string
+
+    :rtype: function
+    """
+    def load():
+        try:
+            return importlib.import_module(module)
+        except ImportError:
+            raise ImportError("{} is required {}.".format(module, purpose))
+
+    return load
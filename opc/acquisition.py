@@ -0,0 +1,526 @@
+''' Continuous acquisition from the Alphasense OPC's '''
+from .timing import monotonic
+from ._optional import optional_import
+
+from collections import deque, namedtuple, OrderedDict
+import threading
+import logging
+import weakref
+import time
+
+logger = logging.getLogger(__name__)
+
+# concurrent.futures is part of the standard library on python3, and needs the futures backport on python2
+_futures = optional_import('concurrent.futures', "to poll many OPC's (pip install futures on python2)")
+
+# A single timestamped sample
+#   timestamp:  wall clock time (time.time()) at which the sample was read
+#   monotonic:  monotonic clock time at which the sample was read
+#   data:       the data returned by the OPC (histogram or PM values)
+Sample = namedtuple('Sample', ['timestamp', 'monotonic', 'data'])
+
+# A sample from one of the OPC's read by a FleetPoller
+FleetSample = namedtuple('FleetSample', ['timestamp', 'monotonic', 'device', 'data'])
+
+def unpack_sample(data, timestamp=None):
+    """Return the data and timestamp of a Sample or FleetSample, or of the data itself,
+    in which case the timestamp defaults to now. The data is None if a histogram failed
+    the checksum (see opc.OPCN2.histogram), and callers skip it.
+
+    :param data: A histogram or PM values, or a Sample/FleetSample holding them
+    :param timestamp: Time the data was read (seconds since the epoch)
+
+    :type data: dictionary, opc.records.Histogram or opc.acquisition.Sample
+    :type timestamp: float
+
+    :rtype: tuple
+    """
+    if hasattr(data, 'monotonic') and hasattr(data, 'data'):
+        return data.data, data.timestamp
+
+    return data, time.time() if timestamp is None else timestamp
+
+def _reader(mode, kwargs):
+    """Return a function that reads an OPC in the given mode."""
+    if mode == 'histogram':
+        def read(opc):
+            # The OPC-N1 has a different interface
+            if not hasattr(opc, 'histogram'):
+                return opc.read_histogram()
+
+            return opc.histogram(**kwargs)
+
+        return read
+
+    if mode == 'pm':
+        return lambda opc: opc.pm()
+
+    raise ValueError("The mode must be 'histogram' or 'pm', not {!r}".format(mode))
+
+class _Acquisition(object):
+    """Reads OPC's in a background thread, and publishes the samples (see _publish).
+
+    The background thread runs the acquisition one step at a time, and only holds on to
+    the instance while a step runs. An acquisition that is no longer referenced, e.g.
+    after breaking out of a loop over it, stops reading as if it had been closed.
+
+    :param step: Function that runs a single step of the acquisition, called with the instance. It returns the time to wait in seconds before the next step, or None once the acquisition has finished.
+    :param name: Name of the background thread
+
+    :type step: function
+    :type name: string
+    """
+    def __init__(self, step, name):
+        self._cond      = threading.Condition()
+        self._stop      = threading.Event()
+        self._done      = False
+        self._error     = None
+
+        # Stop the background thread once the instance is no longer referenced
+        ref = weakref.ref(self, lambda ref, stop=self._stop: stop.set())
+
+        # The step is passed to the thread as a plain function, so it does not hold the instance
+        self._thread    = threading.Thread(target=_Acquisition._main, args=(ref, self._stop, step), name=name)
+        self._thread.daemon = True
+
+    @staticmethod
+    def _main(ref, stop, step):
+        """Run the steps of an acquisition until it is closed, finishes, or is no longer
+        referenced. The acquisition is only referenced while a step runs."""
+        while True:
+            acq = ref()
+
+            if acq is None:
+                return
+
+            if stop.is_set():
+                return acq._finish()
+
+            try:
+                delay = step(acq)
+            except Exception as e:
+                logger.error("Stopped reading {!r}".format(acq), exc_info=True)
+
+                acq._error, delay = e, None
+
+            if delay is None:
+                return acq._finish()
+
+            del acq
+
+            if delay > 0:
+                stop.wait(delay)
+
+    def _finish(self):
+        """Mark the acquisition as finished, once the background thread stops."""
+        with self._cond:
+            self._done = True
+            self._cond.notify_all()
+
+    def close(self):
+        """Stop reading and wait for the background thread to finish. Samples that have
+        already been read can still be consumed.
+        """
+        self._stop.set()
+
+        if self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+class _Buffered(object):
+    """Mixin for acquisitions that pass their samples to the consumer through a bounded
+    buffer, and yield them when iterated. The buffer is set up with _init_buffer.
+    """
+    def _init_buffer(self, buffer_size):
+        # Number of samples discarded because the buffer was full
+        self.dropped    = 0
+
+        self._buffer    = deque(maxlen=buffer_size)
+
+    def _publish(self, sample):
+        """Add a sample to the buffer, discarding the oldest sample if it is full."""
+        with self._cond:
+            if len(self._buffer) == self._buffer.maxlen:
+                self.dropped += 1
+
+            self._buffer.append(sample)
+            self._cond.notify()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        with self._cond:
+            while not self._buffer and not self._done:
+                # Wait with a timeout so the wait can be interrupted on python2
+                self._cond.wait(0.5)
+
+            if self._buffer:
+                return self._buffer.popleft()
+
+        # Raise the error that stopped the thread, once all samples have been consumed
+        if self._error is not None:
+            error, self._error = self._error, None
+
+            raise error
+
+        raise StopIteration
+
+    next = __next__     # python2
+
+class _Schedule(_Acquisition):
+    """Reads an OPC in a background thread on a fixed schedule. Reads are scheduled on
+    absolute (monotonic) deadlines, so the schedule does not drift by the time taken to
+    read the OPC. If a read takes longer than the interval, the deadlines that were
+    missed are skipped rather than read in a burst. By default, only the latest sample is
+    kept (see _publish). The background thread is started by the subclass.
+
+    :param opc: The OPC to read
+    :param interval: Time between reads in seconds
+    :param mode: 'histogram' to read the full histogram, or 'pm' to read only the PM values (firmware v18+)
+    :param count: Stop after this many samples, or None to read until closed
+    :param name: Name of the background thread
+    :param kwargs: Passed on to opc.OPCN2.histogram (e.g. number_concentration, compact)
+
+    :type opc: opc.OPCN2
+    :type interval: float
+    :type mode: string
+    :type count: int
+    :type name: string
+    :type kwargs: dictionary
+    """
+    def __init__(self, opc, interval, mode, count, name, kwargs):
+        if interval <= 0:
+            raise ValueError("The interval must be greater than zero.")
+
+        super(_Schedule, self).__init__(_Schedule._step, name)
+
+        self.opc        = opc
+        self.interval   = interval
+        self.mode       = mode
+        self.count      = count
+
+        # Number of deadlines missed because a read took longer than the interval
+        self.missed     = 0
+
+        # The number of samples read so far, when the schedule started, and the deadline of
+        # the next read, which is always a whole number of intervals after the start
+        self._n         = 0
+        self._start     = monotonic()
+        self._deadline  = self._start
+
+        self._read      = _reader(mode, kwargs)
+
+        # The latest sample, and the number of samples published so far
+        self._latest    = None
+        self.sequence   = 0
+
+    def _publish(self, sample):
+        """Keep a sample as the latest one, and wake anyone waiting for it."""
+        with self._cond:
+            self._latest = sample
+            self.sequence += 1
+
+            self._cond.notify_all()
+
+    def _step(self):
+        """Read the OPC at the current deadline, and return the time until the next one.
+        Stops once count samples have been read."""
+        if self.count is not None and self._n >= self.count:
+            return None
+
+        data = self._read_once()
+        sample = Sample(time.time(), monotonic(), data)
+
+        if data is not None:
+            self._publish(sample)
+
+            self._n += 1
+
+            if self.count is not None and self._n >= self.count:
+                return None
+
+        self._deadline += self.interval
+
+        # Skip any deadlines that passed during the read, keeping the same schedule
+        if sample.monotonic > self._deadline:
+            missed = int((sample.monotonic - self._deadline) / self.interval) + 1
+
+            self.missed += missed
+            self._deadline += missed * self.interval
+
+        return self._deadline - monotonic()
+
+    def _read_once(self):
+        """Read the OPC once."""
+        return self._read(self.opc)
+
+class Stream(_Buffered, _Schedule):
+    """Reads an OPC on a fixed schedule in a background thread, and yields the results as
+    timestamped samples. Reads are scheduled on absolute (monotonic) deadlines, so the
+    schedule does not drift by the time taken to read the OPC. If a read takes longer
+    than the interval, the deadlines that were missed are skipped rather than read in a
+    burst.
+
+    Samples are held in a bounded buffer until they are consumed. If the buffer is full,
+    the oldest sample is discarded to make room for the newest.
+
+    The stream reads until it is closed, or until it is no longer referenced.
+
+    :param opc: The OPC to read
+    :param interval: Time between reads in seconds
+    :param mode: 'histogram' to read the full histogram, or 'pm' to read only the PM values (firmware v18+)
+    :param buffer_size: Maximum number of samples held until they are consumed
+    :param count: Stop after this many samples. By default, the stream runs until it is closed.
+    :param kwargs: Passed on to opc.OPCN2.histogram (e.g. number_concentration, compact)
+
+    :type opc: opc.OPCN2
+    :type interval: float
+    :type mode: string
+    :type buffer_size: int
+    :type count: int
+
+    :rtype: opc.acquisition.Stream
+
+    :Example:
+
+    >>> with alpha.stream(interval=1.) as samples:
+    ...     for sample in samples:
+    ...         print (sample.timestamp, sample.data['PM2.5'])
+    """
+    def __init__(self, opc, interval, mode='histogram', buffer_size=64, count=None, **kwargs):
+        self._init_buffer(buffer_size)
+
+        super(Stream, self).__init__(opc, interval, mode, count, 'opc-stream', kwargs)
+
+        self._thread.start()
+
+    def __repr__(self):
+        return "Stream({!r}, interval={}, mode={!r})".format(self.opc, self.interval, self.mode)
+
+class FleetPoller(_Buffered, _Acquisition):
+    """Reads many OPC's on a fixed schedule, and merges their samples into a single stream
+    of FleetSample(timestamp, monotonic, device, data).
+
+    OPC's are grouped by the bus they are connected on (see the bus parameter of opc.OPCN2).
+    Each group is read by a worker from a thread pool, so OPC's on different buses are read in parallel,
+    while OPC's that share a bus are read one after the other. If a group is still being
+    read when its next deadline arrives, that deadline is skipped for the group.
+
+    An error reading one OPC is logged and counted in errors, and does not stop the poller.
+
+    :param devices: The OPC's to read, as a dictionary of {name: opc}, or a list (named by their device_id or position)
+    :param interval: Time between polls in seconds
+    :param mode: 'histogram' to read the full histogram, or 'pm' to read only the PM values (OPC-N2 firmware v18+)
+    :param buses: Dictionary of {name: bus} to group the OPC's by, instead of the bus of each OPC
+    :param max_workers: Maximum number of worker threads. Defaults to one per bus.
+    :param buffer_size: Maximum number of samples held until they are consumed
+    :param count: Stop after this many polls. By default, the poller runs until it is closed.
+    :param kwargs: Passed on to opc.OPCN2.histogram (e.g. number_concentration, compact)
+
+    :type devices: dictionary or list
+    :type interval: float
+    :type mode: string
+    :type buses: dictionary
+    :type max_workers: int
+    :type buffer_size: int
+    :type count: int
+
+    :rtype: opc.acquisition.FleetPoller
+
+    :Example:
+
+    >>> fleet = FleetPoller({'roof': opc.OPCN2(spi0), 'inlet': opc.OPCN2(spi1)}, interval=5.)
+    >>> for sample in fleet:
+    ...     print (sample.device, sample.data['PM2.5'])
+    """
+    def __init__(self, devices, interval=1., mode='histogram', buses=None, max_workers=None,
+                 buffer_size=256, count=None, **kwargs):
+        futures = _futures()
+
+        if interval <= 0:
+            raise ValueError("The interval must be greater than zero.")
+
+        if not hasattr(devices, 'items'):
+            devices = OrderedDict((getattr(dev, 'device_id', None) or i, dev) for i, dev in enumerate(devices))
+
+        self._init_buffer(buffer_size)
+
+        super(FleetPoller, self).__init__(FleetPoller._step, 'opc-fleet')
+
+        self.devices    = devices
+        self.interval   = interval
+        self.mode       = mode
+        self.count      = count
+
+        # Number of deadlines skipped for a bus because it was still being read, and the
+        # number of failed reads of each OPC
+        self.missed     = 0
+        self.errors     = dict((name, 0) for name in devices)
+
+        # Group the OPC's by bus
+        self.groups = OrderedDict()
+        for name, dev in devices.items():
+            key = buses[name] if buses is not None else dev.bus
+
+            self.groups.setdefault(key, []).append((name, dev))
+
+        # The number of polls so far, the deadline of the next one, and the pending read of each bus
+        self._n         = 0
+        self._deadline  = monotonic()
+        self._pending   = {}
+
+        self._read      = _reader(mode, kwargs)
+        self._executor  = futures.ThreadPoolExecutor(max_workers=max_workers or max(len(self.groups), 1))
+        self._thread.start()
+
+    def _step(self):
+        """Submit a read of each bus at the current deadline, and return the time until the
+        next one. Stops once count polls have been submitted."""
+        if self.count is not None and self._n >= self.count:
+            return None
+
+        for key, group in self.groups.items():
+            future = self._pending.get(key)
+
+            if future is not None and not future.done():
+                self.missed += 1
+                continue
+
+            self._pending[key] = self._executor.submit(self._poll, group)
+
+        self._n += 1
+
+        if self.count is not None and self._n >= self.count:
+            return None
+
+        self._deadline += self.interval
+
+        # Keep the same schedule if submitting fell behind
+        now = monotonic()
+        if now > self._deadline:
+            self._deadline += (int((now - self._deadline) / self.interval) + 1) * self.interval
+
+        return self._deadline - now
+
+    def _finish(self):
+        # Wait for the reads that are still running
+        self._executor.shutdown(wait=True)
+
+        super(FleetPoller, self)._finish()
+
+    def _poll(self, group):
+        """Read each OPC on a bus in turn."""
+        for name, dev in group:
+            try:
+                data = self._read(dev)
+            except Exception:
+                logger.error("Could not read {}".format(name), exc_info=True)
+
+                self.errors[name] += 1
+                continue
+
+            if data is not None:
+                self._publish(FleetSample(time.time(), monotonic(), name, data))
+
+    def __repr__(self):
+        return "FleetPoller({} devices on {} buses, interval={})".format(len(self.devices), len(self.groups), self.interval)
+
+class Prefetcher(_Schedule):
+    """Reads an OPC on a fixed schedule in a background thread (like Stream), and keeps
+    only the latest sample. Any number of consumers can get the latest sample without
+    touching the bus, or resetting the histogram of the OPC.
+
+    If a read fails, the error is logged, counted in errors and kept in last_error, and
+    the prefetcher carries on with its schedule. latest() keeps returning the last sample
+    that was read, so pass max_age to ignore it once it is stale.
+
+    :param opc: The OPC to read
+    :param interval: Time between reads in seconds
+    :param mode: 'histogram' to read the full histogram, or 'pm' to read only the PM values (firmware v18+)
+    :param kwargs: Passed on to opc.OPCN2.histogram (e.g. number_concentration, compact)
+
+    :type opc: opc.OPCN2
+    :type interval: float
+    :type mode: string
+
+    :rtype: opc.acquisition.Prefetcher
+
+    :Example:
+
+    >>> prefetcher = alpha.prefetch(interval=1.)
+    >>> prefetcher.latest().data['PM2.5']
+    2.31
+    """
+    def __init__(self, opc, interval, mode='histogram', **kwargs):
+        # Number of failed reads, and the error that the last one raised
+        self.errors     = 0
+        self.last_error = None
+
+        super(Prefetcher, self).__init__(opc, interval, mode, None, 'opc-prefetch', kwargs)
+
+        self._thread.start()
+
+    def _read_once(self):
+        try:
+            return super(Prefetcher, self)._read_once()
+        except Exception as e:
+            logger.error("Could not read {!r}".format(self.opc), exc_info=True)
+
+            with self._cond:
+                self.errors += 1
+                self.last_error = e
+
+            return None
+
+    def latest(self, max_age=None):
+        """Return the latest sample, or None if no sample has been read yet.
+
+        :param max_age: If given, return None if the latest sample is older than this in seconds.
+
+        :type max_age: float
+
+        :rtype: opc.acquisition.Sample
+        """
+        if self._error is not None:
+            raise self._error
+
+        sample = self._latest
+
+        if sample is not None and max_age is not None and monotonic() - sample.monotonic > max_age:
+            return None
+
+        return sample
+
+    def wait(self, timeout=None):
+        """Wait for the next sample to be read and return it. Returns None if the timeout
+        expires or the prefetcher stops first.
+
+        :param timeout: Maximum time to wait in seconds
+
+        :type timeout: float
+
+        :rtype: opc.acquisition.Sample
+        """
+        deadline = None if timeout is None else monotonic() + timeout
+
+        with self._cond:
+            sequence = self.sequence
+
+            while self.sequence == sequence and not self._done:
+                remaining = 0.5 if deadline is None else min(deadline - monotonic(), 0.5)
+
+                if remaining <= 0:
+                    return None
+
+                self._cond.wait(remaining)
+
+            return self._latest if self.sequence != sequence else None
+
+    def __repr__(self):
+        return "Prefetcher({!r}, interval={}, mode={!r})".format(self.opc, self.interval, self.mode)
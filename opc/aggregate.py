@@ -0,0 +1,175 @@
+''' Incremental aggregation of histograms over fixed time windows '''
+from .acquisition import unpack_sample
+from .decoders import BIN_KEYS, MTOF_KEYS
+
+from collections import namedtuple
+
+# A completed time window
+#   size:       length of the window in seconds
+#   start:      start of the window (seconds since the epoch)
+#   samples:    number of histograms in the window
+#   volume:     total volume sampled in ml
+#   data:       dictionary of number concentrations (#/cc) and averages, with the same keys as opc.OPCN2.histogram()
+Window = namedtuple('Window', ['size', 'start', 'samples', 'volume', 'data'])
+
+# Bins whose MToF is sent by the OPC
+_MTOF_BINS = (1, 3, 5, 7)
+
+class _Accumulator(object):
+    """The running sums of a single window."""
+    __slots__ = ('start', 'samples', 'counts', 'volume', 'period', 'mtof', 'pm',
+                 'temperature', 'n_temperature', 'pressure', 'n_pressure')
+
+    def __init__(self, start):
+        self.start          = start
+        self.samples        = 0
+        self.counts         = [0] * 16
+        self.volume         = 0.
+        self.period         = 0.
+        self.mtof           = [0.] * 4      # MToF weighted by the counts of the bin
+        self.pm             = [0.] * 3      # PM weighted by the volume sampled
+        self.temperature    = 0.
+        self.n_temperature  = 0
+        self.pressure       = 0.
+        self.n_pressure     = 0
+
+    def result(self, size):
+        volume = self.volume
+        data = {}
+
+        for i, key in enumerate(BIN_KEYS):
+            data[key] = self.counts[i] / volume if volume else 0.
+
+        for i, key in enumerate(MTOF_KEYS):
+            counts = self.counts[_MTOF_BINS[i]]
+            data[key] = self.mtof[i] / counts if counts else 0.
+
+        for i, key in enumerate(('PM1', 'PM2.5', 'PM10')):
+            data[key] = self.pm[i] / volume if volume else 0.
+
+        data['SFR']             = volume / self.period if self.period else None
+        data['Sampling Period'] = self.period
+        data['Temperature']     = self.temperature / self.n_temperature if self.n_temperature else None
+        data['Pressure']        = self.pressure / self.n_pressure if self.n_pressure else None
+
+        return Window(size, self.start, self.samples, volume, data)
+
+class WindowAggregator(object):
+    """Aggregates raw histograms (histogram(number_concentration=False)) over tumbling time
+    windows of one or more sizes at once. Rather than averaging the concentrations of each
+    sample, the bin counts and the volume sampled (SFR x sampling period) are summed, so the
+    concentration of each window is exact. MToF's are weighted by the counts of their bins,
+    and the PM values by the volume sampled.
+
+    Each sample is added to every window size in constant time. Windows are aligned to
+    multiples of their size since the epoch (e.g. on the minute and on the hour), and a
+    window is returned by add once a sample arrives for a later window. Samples that
+    arrive for a window that has already been returned are left out of it, and counted
+    in late.
+
+    :param sizes: Window sizes in seconds
+    :param sfr: Sample flow rate in ml/s to use for firmware that does not send it (< 16), e.g. from config()
+
+    :type sizes: tuple
+    :type sfr: float
+
+    :rtype: opc.aggregate.WindowAggregator
+
+    :Example:
+
+    >>> aggregator = WindowAggregator(sizes=(60, 3600))
+    >>> for sample in alpha.stream(interval=1., number_concentration=False):
+    ...     for window in aggregator.add(sample):
+    ...         print (window.size, window.start, window.data['Bin 0'])
+    """
+    def __init__(self, sizes=(60, 3600), sfr=None):
+        self.sizes  = tuple(sizes)
+        self.sfr    = sfr
+
+        # Number of samples that arrived after their window had been returned
+        self.late   = 0
+
+        self._windows = [None] * len(self.sizes)
+
+    def add(self, data, timestamp=None):
+        """Add a raw histogram, and return the windows it completes.
+
+        :param data: A histogram of raw counts, or a Sample/FleetSample holding one
+        :param timestamp: Time the histogram was read (seconds since the epoch). Defaults to the sample timestamp, or now.
+
+        :type data: dictionary, opc.records.Histogram or opc.acquisition.Sample
+        :type timestamp: float
+
+        :rtype: list of opc.aggregate.Window
+        """
+        data, timestamp = unpack_sample(data, timestamp)
+
+        if data is None:
+            return []
+
+        counts = [data[key] for key in BIN_KEYS]
+
+        if any(isinstance(c, float) for c in counts):
+            raise ValueError("Histograms must be aggregated as raw counts (number_concentration=False).")
+
+        sfr = data.get('SFR', self.sfr)
+        if sfr is None:
+            raise ValueError("The histogram does not include the SFR, so it must be given to the aggregator.")
+
+        period = data['Sampling Period']
+        volume = sfr * period
+        mtof = [data[key] for key in MTOF_KEYS]
+        pm = (data['PM1'], data['PM2.5'], data['PM10'])
+        temperature, pressure = data.get('Temperature'), data.get('Pressure')
+
+        completed, late = [], False
+
+        for i, size in enumerate(self.sizes):
+            start = timestamp - timestamp % size
+            window = self._windows[i]
+
+            if window is not None and start != window.start:
+                if start < window.start:
+                    late = True
+                    continue
+
+                completed.append(window.result(size))
+                window = None
+
+            if window is None:
+                window = self._windows[i] = _Accumulator(start)
+
+            window.samples += 1
+            window.volume += volume
+            window.period += period
+
+            for b in range(16):
+                window.counts[b] += counts[b]
+
+            for j in range(4):
+                window.mtof[j] += mtof[j] * counts[_MTOF_BINS[j]]
+
+            for j in range(3):
+                window.pm[j] += pm[j] * volume
+
+            if temperature is not None:
+                window.temperature += temperature
+                window.n_temperature += 1
+
+            if pressure is not None:
+                window.pressure += pressure
+                window.n_pressure += 1
+
+        self.late += late
+
+        return completed
+
+    def flush(self):
+        """Return the windows that are still open, and start again.
+
+        :rtype: list of opc.aggregate.Window
+        """
+        completed = [w.result(size) for size, w in zip(self.sizes, self._windows) if w is not None]
+        self._windows = [None] * len(self.sizes)
+
+        return completed
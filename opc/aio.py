@@ -0,0 +1,269 @@
+''' An asyncio driver for the Alphasense OPC-N2 (python 3.7+) '''
+from . import OPCN2
+from .decorators import check_firmware
+from .records import ConfigVariables
+from .timing import monotonic
+
+import functools
+import asyncio
+import struct
+
+class AsyncOPCN2(object):
+    """An asyncio interface to an Alphasense OPC-N2. The delays between commands and data
+    are awaited with asyncio.sleep, and the SPI transfers run in an executor, so that a
+    single event loop can drive many OPC's at once.
+
+    An AsyncOPCN2 wraps an opc.OPCN2, which holds the firmware version, timing profile and
+    cached configuration variables. Use AsyncOPCN2.create to connect to a new OPC without
+    blocking the event loop. Commands sent to one OPC are serialized with an asyncio.Lock,
+    and hold the bus lock of the OPC (see opc.bus.BusLock) like the blocking methods. A
+    command that is cancelled (e.g. by asyncio.wait_for) keeps the bus until the transfer
+    running in the executor has finished, so the event loop must keep running until then.
+
+    :param opc: The OPC to drive
+    :param executor: The concurrent.futures.Executor to run SPI transfers in. By default, the event loop's default executor is used.
+
+    :type opc: opc.OPCN2
+    :type executor: concurrent.futures.Executor
+
+    :rtype: opc.aio.AsyncOPCN2
+
+    :Example:
+
+    >>> async def main(connections):
+    ...     opcs = [await AsyncOPCN2.create(spi) for spi in connections]
+    ...     await asyncio.gather(*[alpha.on() for alpha in opcs])
+    ...     return await asyncio.gather(*[alpha.histogram() for alpha in opcs])
+    """
+    def __init__(self, opc, executor=None):
+        self.opc        = opc
+        self.executor   = executor
+
+        # Created on first use, so that it belongs to the running event loop (python < 3.10
+        # binds an asyncio.Lock to the event loop current when it is created)
+        self._lock      = None
+
+    @classmethod
+    async def create(cls, spi_connection, executor=None, **kwargs):
+        """Connect to an OPC-N2 in the executor (which detects the firmware version) and
+        return an AsyncOPCN2 for it.
+
+        :param spi_connection: spidev.SpiDev or usbiss.spi.SPI connection
+        :param executor: The concurrent.futures.Executor to run SPI transfers in
+        :param kwargs: Passed on to opc.OPCN2
+
+        :rtype: opc.aio.AsyncOPCN2
+        """
+        loop = asyncio.get_running_loop()
+        opc = await loop.run_in_executor(executor, functools.partial(OPCN2, spi_connection, **kwargs))
+
+        return cls(opc, executor)
+
+    @property
+    def firmware(self):
+        """The firmware version of the OPC"""
+        return self.opc.firmware
+
+    async def _run(self, f, *args, **kwargs):
+        """Run a blocking function in the executor."""
+        return await self._submit(f, *args, **kwargs)
+
+    def _submit(self, f, *args, **kwargs):
+        """Start a blocking function in the executor, and return its future."""
+        loop = asyncio.get_running_loop()
+
+        return loop.run_in_executor(self.executor, functools.partial(f, *args, **kwargs))
+
+    async def _begin_transaction(self, owner, name=None):
+        """Wait until the guard time since the previous command has elapsed, and acquire
+        the bus lock on behalf of owner (see opc.OPCN2._begin_transaction).
+        """
+        lock = self.opc.bus_lock
+        start = monotonic()
+
+        def release(acquiring):
+            if not acquiring.cancelled() and acquiring.exception() is None:
+                lock.release(owner)
+
+        while True:
+            delay = self.opc._next_command - monotonic()
+
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            # Only wait for the bus in the executor if it is busy
+            if not lock.acquire(owner, blocking=False):
+                acquiring = self._submit(lock.acquire, owner)
+
+                try:
+                    await asyncio.shield(acquiring)
+                except asyncio.CancelledError:
+                    # The executor still acquires the lock, so release it once it has
+                    acquiring.add_done_callback(release)
+                    raise
+
+            if self.opc._next_command <= monotonic():
+                break
+
+            lock.release(owner)
+
+        self.opc._begin_command(name, start)
+
+    async def _command(self, name, command, nbytes=0, follow=None):
+        """Send a command sequence: the command byte, then after the command delay, either
+        nbytes of data are read or the follow bytes are sent. The sequence is not started
+        until the guard time since the previous command has elapsed. The sequence is
+        recorded under name in the metrics of the OPC.
+
+        If the command is cancelled while a transfer is running in the executor, the
+        transfer runs to completion, and the bus lock is only released once it has.
+
+        Returns the response to the command byte and the bytes that followed.
+        """
+        # Each sequence holds the bus lock as its own owner, so that the next command can
+        # not start on the bus while a cancelled one is still transferring
+        owner = object()
+
+        def end(transfer):
+            self.opc._end_transaction(owner=owner, error=True)
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            await self._begin_transaction(owner, name)
+
+            transfer = None
+
+            try:
+                transfer = self._submit(self.opc._xfer, [command])
+                resp = await asyncio.shield(transfer)
+                await asyncio.sleep(self.opc.timing.command_delay)
+
+                if follow is not None:
+                    transfer = self._submit(self.opc._xfer, follow)
+                else:
+                    transfer = self._submit(self.opc._read_bytes, nbytes)
+
+                data = await asyncio.shield(transfer)
+            except BaseException:
+                if transfer is not None and not transfer.done():
+                    transfer.add_done_callback(end)
+                else:
+                    self.opc._end_transaction(owner=owner, error=True)
+
+                raise
+
+            self.opc._end_transaction(owner=owner)
+
+        return resp[0], data
+
+    async def on(self):
+        """Turn ON the OPC (fan and laser). See opc.OPCN2.on
+
+        :rtype: boolean
+        """
+        b1, (b2, b3) = await self._command('on', 0x03, follow=[0x00, 0x01])
+
+        return True if b1 == 0xF3 and b2 == 0x03 else False
+
+    async def off(self):
+        """Turn OFF the OPC (fan and laser). See opc.OPCN2.off
+
+        :rtype: boolean
+        """
+        b1, (b2, ) = await self._command('off', 0x03, follow=[0x01])
+
+        return True if b1 == 0xF3 and b2 == 0x03 else False
+
+    async def raw_histogram(self):
+        """Read and reset the histogram, returning the raw 62 byte frame. See opc.OPCN2.raw_histogram
+
+        :rtype: bytearray
+        """
+        return (await self._raw_histogram())[0]
+
+    async def _raw_histogram(self):
+        """Read and reset the histogram. Returns the raw frame and the time since the
+        previous read (see opc.OPCN2._raw_histogram)."""
+        _, data = await self._command('raw_histogram', 0x30, 62)
+
+        return data, self.opc._mark_histogram_read()
+
+    async def histogram(self, number_concentration=True, compact=False, sfr=None):
+        """Read and reset the histogram, following the retry policy of the OPC if the
+        checksum does not match. See opc.OPCN2.histogram
+
+        :param number_concentration: If true, histogram bins are reported in number concentration vs. raw values.
+        :param compact: If true, return a compact opc.records.Histogram, which can be used like the dictionary.
+        :param sfr: Sample flow rate in ml/s to use for firmware that does not send it (< 16)
+
+        :type number_concentration: boolean
+        :type compact: boolean
+        :type sfr: float
+
+        :rtype: dictionary or opc.records.Histogram
+        """
+        resp, interval = await self._raw_histogram()
+        data = self.opc._decode_histogram(resp, number_concentration, compact, interval, sfr)
+
+        if data is None and self.opc.retry is not None:
+            for delay in self.opc.retry.delays():
+                await asyncio.sleep(delay)
+
+                resp, interval = await self._raw_histogram()
+                data = self.opc._decode_histogram(resp, number_concentration, compact, interval, sfr)
+                if data is not None:
+                    break
+
+        return data
+
+    async def pm(self):
+        """Read the PM data and reset the histogram. See opc.OPCN2.pm
+
+        **NOTE: This method is supported by firmware v18+.**
+
+        :raises: opc.exceptions.FirmwareVersionError, when awaited
+
+        :rtype: dictionary
+        """
+        check_firmware(self, 18.)
+
+        _, data = await self._command('pm', 0x32, 12)
+        self.opc._mark_histogram_read()
+
+        return dict(zip(('PM1', 'PM2.5', 'PM10'), struct.unpack_from('<3f', data)))
+
+    async def config(self, refresh=False):
+        """Return the configuration variables as a dictionary. See opc.OPCN2.config
+
+        :param refresh: If True, read the configuration variables from the OPC again
+
+        :type refresh: boolean
+
+        :rtype: dictionary
+        """
+        return dict(await self.config_record(refresh))
+
+    async def config_record(self, refresh=False):
+        """Return a copy of the configuration variables, which are cached on the opc.OPCN2
+        until they are invalidated. See opc.OPCN2.config_record
+
+        :param refresh: If True, read the configuration variables from the OPC again
+
+        :type refresh: boolean
+
+        :rtype: opc.records.ConfigVariables
+        """
+        if self.opc._config is None or refresh:
+            _, data = await self._command('read_config', 0x3C, 256)
+
+            # TOF_SFR is only sent by firmware 16+
+            self.opc._config = ConfigVariables.from_bytes(data, tof_sfr=self.opc.firmware['major'] > 15.)
+
+            await self._run(self.opc._update_cache, config=dict(self.opc._config))
+
+        return self.opc._config.copy()
+
+    def __repr__(self):
+        return "Async {}".format(self.opc)
@@ -0,0 +1,281 @@
+''' An append-only archive of raw histogram frames, with a sparse time index '''
+from ._optional import optional_import
+from .decoders import histogram_layout, decode_histograms
+
+from bisect import bisect_left
+import struct
+import time
+import os
+
+_numpy = optional_import('numpy', 'to read archives')
+
+# File header: magic, format version, record size and the number of records per index entry
+HEADER = struct.Struct('<4sBxHI4x')
+MAGIC = b'OPCA'
+VERSION = 1
+
+# Each record: wall clock timestamp, device number, firmware major and minor version, and the raw frame
+RECORD = struct.Struct('<dHBB62s')
+
+# Each index entry: timestamp and number of the first record of a block
+INDEX = struct.Struct('<dQ')
+
+# The numpy dtypes of a record and an index entry
+RECORD_FIELDS = [('timestamp', '<f8'), ('device', '<u2'), ('major', 'u1'), ('minor', 'u1'), ('frame', 'u1', (62,))]
+INDEX_FIELDS = [('timestamp', '<f8'), ('record', '<u8')]
+
+def _firmware(firmware):
+    """Return the (major, minor) firmware version from a tuple or an OPC's firmware dictionary."""
+    if hasattr(firmware, 'get'):
+        return int(firmware['major'] or 0), int(firmware['minor'] or 0)
+
+    return int(firmware[0]), int(firmware[1])
+
+class ArchiveWriter(object):
+    """Appends raw histogram frames to an archive of fixed-size records, each holding the
+    time the frame was read, a device number, the firmware version and the 62 byte frame
+    (74 bytes in all). Every index_every records, an entry is added to a sparse time index
+    in a sidecar file (path + '.idx'), so a reader can find a time range without scanning
+    the archive.
+
+    Records must be written in time order. If the archive already exists, new records are
+    appended to it, and a record left incomplete by a crash is discarded.
+
+    :param path: Path of the archive
+    :param index_every: Number of records per index entry (only used for new archives)
+
+    :type path: string
+    :type index_every: int
+
+    :rtype: opc.archive.ArchiveWriter
+
+    :Example:
+
+    >>> with ArchiveWriter('histograms.opca') as archive:
+    ...     archive.write(alpha.raw_histogram(), device=0, firmware=alpha.firmware)
+    """
+    def __init__(self, path, index_every=256):
+        self.path       = path
+        self.index_path = path + '.idx'
+
+        if os.path.exists(path) and os.path.getsize(path) >= HEADER.size:
+            with open(path, 'rb') as f:
+                magic, version, size, self.index_every = HEADER.unpack(f.read(HEADER.size))
+
+            if magic != MAGIC or version != VERSION or size != RECORD.size:
+                raise ValueError("{} is not an OPC archive (or is from an unsupported version).".format(path))
+
+            self._file = open(path, 'r+b')
+            self._file.seek(0, os.SEEK_END)
+
+            # Discard a record that was only partly written
+            self.count = (self._file.tell() - HEADER.size) // RECORD.size
+            self._file.truncate(HEADER.size + self.count * RECORD.size)
+            self._file.seek(0, os.SEEK_END)
+
+            self._last = self._read_timestamp(self.count - 1) if self.count else None
+        else:
+            self.index_every = index_every
+            self.count = 0
+            self._last = None
+
+            self._file = open(path, 'wb')
+            self._file.write(HEADER.pack(MAGIC, VERSION, RECORD.size, index_every))
+
+        self._index = open(self.index_path, 'ab')
+
+        # Drop index entries for records that were discarded, and add any that are missing
+        self._index.truncate(INDEX.size * min(self._index.tell() // INDEX.size, self._blocks()))
+        self._index.seek(0, os.SEEK_END)
+
+        for block in range(self._index.tell() // INDEX.size, self._blocks()):
+            record = block * self.index_every
+            self._index.write(INDEX.pack(self._read_timestamp(record), record))
+
+    def _blocks(self):
+        """Number of index entries for the records written so far."""
+        return (self.count + self.index_every - 1) // self.index_every
+
+    def _read_timestamp(self, record):
+        """Read the timestamp of a record that has been written."""
+        self._file.flush()
+
+        with open(self.path, 'rb') as f:
+            f.seek(HEADER.size + record * RECORD.size)
+
+            return struct.unpack('<d', f.read(8))[0]
+
+    def write(self, frame, device=0, firmware=(18, 2), timestamp=None):
+        """Append a raw histogram frame to the archive.
+
+        :param frame: The raw 62 byte frame (see opc.OPCN2.raw_histogram)
+        :param device: Device number (0-65535)
+        :param firmware: Firmware version as a tuple, or the firmware dictionary of the OPC
+        :param timestamp: Time the frame was read (seconds since the epoch). Defaults to now.
+
+        :type frame: bytes or bytearray
+        :type device: int
+        :type firmware: tuple or dictionary
+        :type timestamp: float
+        """
+        if len(frame) != 62:
+            raise ValueError("A histogram frame is 62 bytes, not {}.".format(len(frame)))
+
+        timestamp = time.time() if timestamp is None else timestamp
+
+        if self._last is not None and timestamp < self._last:
+            raise ValueError("Records must be written in time order ({} < {}).".format(timestamp, self._last))
+
+        major, minor = _firmware(firmware)
+
+        self._file.write(RECORD.pack(timestamp, device, major, minor, bytes(frame)))
+
+        if self.count % self.index_every == 0:
+            self._index.write(INDEX.pack(timestamp, self.count))
+
+        self.count += 1
+        self._last = timestamp
+
+    def flush(self):
+        """Flush the archive and index to disk."""
+        self._file.flush()
+        self._index.flush()
+
+    def close(self):
+        """Close the archive."""
+        self._file.close()
+        self._index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+class ArchiveReader(object):
+    """Reads an archive written by ArchiveWriter by memory-mapping it (requires numpy).
+    Records are returned as numpy structured arrays that are views of the file, with the
+    fields 'timestamp', 'device', 'major', 'minor' and 'frame', so even very large
+    archives can be read without loading them into memory.
+
+    :param path: Path of the archive
+
+    :type path: string
+
+    :rtype: opc.archive.ArchiveReader
+
+    :Example:
+
+    >>> archive = ArchiveReader('histograms.opca')
+    >>> records = archive.between(t0, t1)
+    >>> data = archive.decode(records[records['device'] == 0])
+    >>> data['PM2.5'].mean()
+    """
+    def __init__(self, path):
+        np = _numpy()
+
+        with open(path, 'rb') as f:
+            magic, version, size, self.index_every = HEADER.unpack(f.read(HEADER.size))
+
+        if magic != MAGIC or version != VERSION or size != RECORD.size:
+            raise ValueError("{} is not an OPC archive (or is from an unsupported version).".format(path))
+
+        self.path = path
+        self.dtype = np.dtype(RECORD_FIELDS)
+
+        count = (os.path.getsize(path) - HEADER.size) // RECORD.size
+
+        # numpy can not memory-map an empty file
+        if count:
+            self.records = np.memmap(path, dtype=self.dtype, mode='r', offset=HEADER.size, shape=(count,))
+        else:
+            self.records = np.zeros(0, dtype=self.dtype)
+
+        try:
+            index = np.fromfile(path + '.idx', dtype=np.dtype(INDEX_FIELDS))['timestamp']
+        except (IOError, OSError):
+            index = None
+
+        # Rebuild the index from the records if it is missing or does not match them
+        if index is None or len(index) != (count + self.index_every - 1) // self.index_every:
+            index = self.records['timestamp'][::self.index_every]
+
+        self._index = index.tolist()
+
+    def __len__(self):
+        return len(self.records)
+
+    def _first(self, t):
+        """Return the number of the first record at or after a time."""
+        np = _numpy()
+
+        # Find the last block that starts before t from the index, then search within it
+        block = max(bisect_left(self._index, t) - 1, 0)
+        start = block * self.index_every
+        end = min(start + self.index_every, len(self.records))
+
+        return start + int(np.searchsorted(self.records['timestamp'][start:end], t, side='left'))
+
+    def between(self, t0=None, t1=None):
+        """Return the records read at or after t0 and before t1, as a view of the archive.
+
+        :param t0: Start time (seconds since the epoch), or None for the first record
+        :param t1: End time (seconds since the epoch), or None for the last record
+
+        :type t0: float
+        :type t1: float
+
+        :rtype: numpy.ndarray
+        """
+        start = 0 if t0 is None else self._first(t0)
+        end = len(self.records) if t1 is None else self._first(t1)
+
+        return self.records[start:max(start, end)]
+
+    def decode(self, records=None, number_concentration=True, sfr=None, model='N2'):
+        """Decode the frames of a set of records with opc.decoders.decode_histograms, using
+        the layout of the model and the firmware version of each record. Returns the same
+        columns as decode_histograms, plus 'Timestamp' and 'Device'.
+
+        Records do not hold the model of the OPC, so the frames of OPC-N1's must be
+        selected (e.g. by device) and decoded with model='N1'.
+
+        :param records: Records returned by between, or None for the whole archive
+        :param number_concentration: If true, bins are converted to number concentration
+        :param sfr: Sample flow rate in ml/s to use for firmware that does not send it (< 16)
+        :param model: Model number of the OPC's that read the records ('N1' or 'N2')
+
+        :type records: numpy.ndarray
+        :type number_concentration: boolean
+        :type sfr: float
+        :type model: string
+
+        :rtype: dictionary
+        """
+        np = _numpy()
+        records = self.records if records is None else records
+        groups = []
+
+        for major, minor in set(zip(records['major'].tolist(), records['minor'].tolist())):
+            mask = (records['major'] == major) & (records['minor'] == minor)
+            layout = histogram_layout(model, float("{}.{}".format(major, minor)))
+
+            groups.append((mask, decode_histograms(records['frame'][mask], layout, number_concentration, sfr)))
+
+        # Merge the columns of each firmware version back into the order of the records
+        data = {}
+
+        for key in (groups[0][1] if groups else {}):
+            values = [decoded[key] for mask, decoded in groups]
+            data[key] = np.zeros((len(records), ) + values[0].shape[1:], dtype=np.result_type(*values))
+
+            for (mask, decoded), value in zip(groups, values):
+                data[key][mask] = value
+
+        data['Timestamp']   = np.asarray(records['timestamp'])
+        data['Device']      = np.asarray(records['device'])
+
+        return data
+
+    def __repr__(self):
+        return "ArchiveReader({!r}, {} records)".format(self.path, len(self))
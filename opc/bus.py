@@ -0,0 +1,123 @@
+''' Identification and locking of the bus an OPC is connected on '''
+import threading
+import weakref
+
+def bus_key(cnxn):
+    """Build a key that identifies the bus a connection talks on, for connections that
+    expose it: a serial port (port attribute), or an SPI bus (bus attribute, as on
+    opc.simulator.SimulatedSpiDev once opened). Connections that do not expose their bus
+    are assumed to be on a bus of their own.
+
+    spidev.SpiDev does not expose the bus it was opened on, so OPC's that share an SPI
+    bus through spidev must be given the same bus key (or bus_lock) explicitly.
+
+    :param cnxn: spidev.SpiDev or usbiss.spi.SPI connection
+
+    :rtype: string
+
+    :Example:
+
+    >>> spi = opc.simulator.SimulatedSpiDev()
+    >>> spi.open(0, 1)
+    >>> bus_key(spi)
+    'spi:0'
+    >>> bus_key(spidev.SpiDev(0, 1))
+    'cnxn:140230457391696'
+    """
+    port = getattr(cnxn, 'port', None)
+    if port is not None:
+        return 'port:{}'.format(port)
+
+    bus = getattr(cnxn, 'bus', None)
+    if bus is not None:
+        return 'spi:{}'.format(bus)
+
+    return 'cnxn:{}'.format(id(cnxn))
+
+class BusLock(object):
+    """A reentrant lock that is held for each complete command sequence on a bus, so that
+    sequences sent by different threads or to different OPC's on the bus do not interleave.
+
+    Like threading.RLock, the lock is owned by the thread that acquired it by default. An
+    owner can also be given explicitly, so that a sequence can be held across threads
+    (e.g. by opc.aio.AsyncOPCN2, whose transfers run in an executor).
+
+    :rtype: opc.bus.BusLock
+    """
+    def __init__(self):
+        self._cond  = threading.Condition(threading.Lock())
+        self._owner = None
+        self._count = 0
+
+    def acquire(self, owner=None, blocking=True):
+        """Acquire the lock.
+
+        :param owner: Owner of the lock. Defaults to the current thread.
+        :param blocking: If False, return False immediately if the lock is held by another owner.
+
+        :rtype: boolean
+        """
+        owner = threading.current_thread() if owner is None else owner
+
+        with self._cond:
+            while self._count and self._owner is not owner:
+                if not blocking:
+                    return False
+
+                self._cond.wait()
+
+            self._owner = owner
+            self._count += 1
+
+        return True
+
+    def release(self, owner=None):
+        """Release the lock.
+
+        :param owner: Owner of the lock. Defaults to the current thread.
+        """
+        owner = threading.current_thread() if owner is None else owner
+
+        with self._cond:
+            if not self._count or self._owner is not owner:
+                raise RuntimeError("Cannot release a bus lock that is not held by {!r}".format(owner))
+
+            self._count -= 1
+
+            if not self._count:
+                self._owner = None
+                self._cond.notify()
+
+    def __enter__(self):
+        self.acquire()
+
+        return self
+
+    def __exit__(self, *args):
+        self.release()
+
+# The lock of each bus, by bus key. A lock is only kept while something (e.g. an OPC) holds
+# on to it, so the locks of connections that are keyed by id() do not pile up, and a new
+# connection that reuses the id() of one that has gone does not inherit its lock
+_locks = weakref.WeakValueDictionary()
+_locks_lock = threading.Lock()
+
+def bus_lock(bus):
+    """Return the lock shared by all OPC's on the same bus. The lock is shared for as long
+    as any of them holds on to it.
+
+    :param bus: Key of the bus, or a connection to find it from (see bus_key)
+
+    :type bus: string, spidev.SpiDev or usbiss.spi.SPI
+
+    :rtype: opc.bus.BusLock
+    """
+    key = bus_key(bus) if hasattr(bus, 'xfer') else bus
+
+    with _locks_lock:
+        lock = _locks.get(key)
+
+        if lock is None:
+            lock = _locks[key] = BusLock()
+
+        return lock
@@ -0,0 +1,118 @@
+''' A persistent cache of what is known about each OPC, to speed up reconnecting '''
+import threading
+import logging
+import json
+import os
+
+logger = logging.getLogger(__name__)
+
+def device_key(cnxn):
+    """Build a key that identifies the device on the other end of a connection, for
+    connections that expose it: a serial port (port attribute), or an SPI bus and chip
+    select (bus and device attributes, as on opc.simulator.SimulatedSpiDev once opened).
+
+    spidev.SpiDev does not expose the bus and chip select it was opened with, so this
+    returns None for spidev connections, and a device_id (e.g. 'spi:0.0') must be given
+    to the OPC to use the device cache.
+
+    :param cnxn: spidev.SpiDev or usbiss.spi.SPI connection
+
+    :rtype: string
+    """
+    port = getattr(cnxn, 'port', None)
+    if port is not None:
+        return 'port:{}'.format(port)
+
+    bus, device = getattr(cnxn, 'bus', None), getattr(cnxn, 'device', None)
+    if bus is not None and device is not None:
+        return 'spi:{}.{}'.format(bus, device)
+
+    return None
+
+class DeviceCache(object):
+    """An on-disk cache of the firmware version, serial number and configuration
+    variables of each OPC, keyed by device identity (e.g. 'spi:0.0' or '/dev/ttyACM0').
+    When an OPC is created with a cache, the cached firmware version is validated with a
+    single command instead of probing the device from scratch.
+
+    The cache is a small JSON file that is rewritten atomically on every update.
+
+    :param path: Path of the cache file
+
+    :type path: string
+
+    :rtype: opc.cache.DeviceCache
+
+    :Example:
+
+    >>> cache = opc.cache.DeviceCache('/var/cache/opc.json')
+    >>> alpha = opc.OPCN2(spi, cache=cache, device_id='spi:0.0')
+    """
+    def __init__(self, path):
+        self.path   = path
+        self._lock  = threading.Lock()
+
+    def _read(self):
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except (IOError, OSError):
+            return {}
+        except ValueError:
+            logger.warning("Ignoring corrupt OPC cache file {}".format(self.path))
+
+            return {}
+
+    def _write(self, entries):
+        tmp = '{}.{}.tmp'.format(self.path, os.getpid())
+
+        with open(tmp, 'w') as f:
+            json.dump(entries, f, indent=2, sort_keys=True)
+
+        # os.replace is atomic, but is not available on python2
+        getattr(os, 'replace', os.rename)(tmp, self.path)
+
+    def get(self, key):
+        """Return the cached entry for a device, or None.
+
+        :param key: Device identity
+
+        :type key: string
+
+        :rtype: dictionary
+        """
+        with self._lock:
+            return self._read().get(key)
+
+    def update(self, key, **values):
+        """Update the cached entry for a device. A value of None removes it from the entry.
+
+        :param key: Device identity
+        :param values: Values to store, e.g. firmware=..., sn=..., config=...
+
+        :type key: string
+        """
+        with self._lock:
+            entries = self._read()
+            entry = entries.setdefault(key, {})
+
+            for name, value in values.items():
+                if value is None:
+                    entry.pop(name, None)
+                else:
+                    entry[name] = value
+
+            self._write(entries)
+
+    def remove(self, key):
+        """Remove a device from the cache.
+
+        :param key: Device identity
+
+        :type key: string
+        """
+        with self._lock:
+            entries = self._read()
+
+            if entries.pop(key, None) is not None:
+                self._write(entries)
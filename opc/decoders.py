@@ -0,0 +1,261 @@
+''' Decoders for the raw histogram frames sent by the Alphasense OPC's '''
+from ._optional import optional_import
+from .records import Histogram
+
+from array import array
+import struct
+
+_numpy = optional_import('numpy', 'to decode histograms in batches')
+
+# Keys used for the histogram bins and the bin MToF's
+BIN_KEYS    = tuple('Bin {}'.format(i) for i in range(16))
+MTOF_KEYS   = ('Bin1 MToF', 'Bin3 MToF', 'Bin5 MToF', 'Bin7 MToF')
+
+class HistogramLayout(object):
+    """The layout of the 62 byte histogram frame sent by a model/firmware version. Each
+    layout holds a precompiled struct.Struct so that a frame is decoded in a single call
+    to unpack_from.
+
+    The decoded values are, in order: the 16 bin counts, the 4 raw MToF bytes, then the
+    layout specific fields, the checksum and PM1, PM2.5 and PM10.
+
+    :param name: Name of the layout
+    :param fmt: struct format string describing the frame
+    :param decoder: function that returns the SFR, temperature, pressure and sampling period from the unpacked values
+    :param fields: (name, type) pairs of the layout specific fields, used to build the numpy dtype
+
+    :type name: string
+    :type fmt: string
+    :type decoder: function
+    :type fields: list
+
+    :rtype: opc.decoders.HistogramLayout
+    """
+    def __init__(self, name, fmt, decoder, fields):
+        self.name       = name
+        self.struct     = struct.Struct(fmt)
+        self.size       = self.struct.size
+        self._decoder   = decoder
+
+        self.fields     = [('bins', '<u2', (16,)), ('mtof', 'u1', (4,))] + list(fields) + \
+                          [('checksum', '<u2'), ('pm', '<f4', (3,))]
+
+    @property
+    def dtype(self):
+        """The numpy structured dtype of a frame (requires numpy).
+
+        :rtype: numpy.dtype
+        """
+        return _numpy().dtype(self.fields)
+
+    def columns(self, number_concentration=True):
+        """The typed columns of a decoded histogram of this layout, for storing samples in
+        a fixed schema (see opc.sinks). Each column is a (key, typecode, nullable) tuple,
+        where the typecode is an array module typecode and nullable is True for values that
+        are not sent in every frame.
+
+        :param number_concentration: If true, the bins hold number concentrations rather than counts
+
+        :type number_concentration: boolean
+
+        :rtype: list
+        """
+        names = [field[0] for field in self.fields]
+
+        columns = [(key, 'f' if number_concentration else 'H', False) for key in BIN_KEYS]
+        columns += [(key, 'f', False) for key in MTOF_KEYS]
+
+        if 'sfr' in names:
+            columns.append(('SFR', 'f', False))
+
+        # Temperature and pressure share a field, and are sent in alternate frames
+        shared = 'temp_pressure' in names
+
+        columns += [('Temperature', 'f', shared), ('Pressure', 'I', shared), ('Sampling Period', 'f', False),
+                    ('Checksum', 'H', False), ('PM1', 'f', False), ('PM2.5', 'f', False), ('PM10', 'f', False)]
+
+        return columns
+
+    def unpack(self, buf, offset=0):
+        """Unpack the raw values of a frame without interpreting them.
+
+        :param buf: The raw frame
+        :param offset: Offset of the frame within buf
+
+        :type buf: bytes, bytearray or memoryview
+
+        :rtype: tuple
+        """
+        return self.struct.unpack_from(buf, offset)
+
+    def decode(self, buf, offset=0):
+        """Decode a frame into a dictionary with the same keys as opc.OPCN2.histogram().
+        The bins are returned as raw counts.
+
+        :param buf: The raw frame
+        :param offset: Offset of the frame within buf
+
+        :type buf: bytes, bytearray or memoryview
+
+        :rtype: dictionary
+        """
+        vals = self.struct.unpack_from(buf, offset)
+
+        # zip stops at the end of the keys, so only the 16 bins are used
+        data = dict(zip(BIN_KEYS, vals))
+
+        data['Bin1 MToF']   = vals[16] / 3.0
+        data['Bin3 MToF']   = vals[17] / 3.0
+        data['Bin5 MToF']   = vals[18] / 3.0
+        data['Bin7 MToF']   = vals[19] / 3.0
+        data['Checksum']    = vals[23]
+        data['PM1']         = vals[24]
+        data['PM2.5']       = vals[25]
+        data['PM10']        = vals[26]
+
+        sfr, data['Temperature'], data['Pressure'], data['Sampling Period'] = self._decoder(vals)
+
+        if sfr is not None:
+            data['SFR'] = sfr
+
+        return data
+
+    def decode_compact(self, buf, offset=0):
+        """Decode a frame into a compact opc.records.Histogram, which supports the same
+        dictionary-style access as decode() while using a fraction of the memory.
+        The bins are returned as raw counts.
+
+        :param buf: The raw frame
+        :param offset: Offset of the frame within buf
+
+        :type buf: bytes, bytearray or memoryview
+
+        :rtype: opc.records.Histogram
+        """
+        vals = self.struct.unpack_from(buf, offset)
+        sfr, temperature, pressure, period = self._decoder(vals)
+
+        return Histogram(array('H', vals[:16]), array('f', (vals[16] / 3.0, vals[17] / 3.0, vals[18] / 3.0, vals[19] / 3.0)),
+                         sfr, temperature, pressure, period, vals[23], vals[24], vals[25], vals[26])
+
+    def __repr__(self):
+        return "HistogramLayout({!r})".format(self.name)
+
+def _decode_legacy(vals):
+    """Temperature, pressure and a sampling period in 12 MHz clock ticks"""
+    return None, vals[20] / 10.0, vals[21], vals[22] / 12e6
+
+def _decode_sfr(vals):
+    """SFR, either temperature or pressure, and a sampling period in seconds"""
+    # Temperature and pressure share a field, so tell them apart by their value
+    tmp = vals[21]
+    if tmp > 98000:
+        return vals[20], None, tmp, vals[22]
+    elif tmp / 10.0 < 500:
+        return vals[20], tmp / 10.0, None, vals[22]
+
+    return vals[20], None, None, vals[22]
+
+# OPC-N2 firmware versions 14 and 15
+N2_LEGACY   = HistogramLayout('OPC-N2 (firmware < 16)', '<16H4B3IH3f', _decode_legacy,
+                    [('temperature', '<u4'), ('pressure', '<u4'), ('period', '<u4')])
+
+# OPC-N2 firmware versions 16-18
+N2          = HistogramLayout('OPC-N2', '<16H4BfIfH3f', _decode_sfr,
+                    [('sfr', '<f4'), ('temp_pressure', '<u4'), ('period', '<f4')])
+
+# OPC-N1
+N1          = HistogramLayout('OPC-N1', '<16H4B3IH3f', _decode_legacy,
+                    [('temperature', '<u4'), ('pressure', '<u4'), ('period', '<u4')])
+
+def histogram_layout(model, version):
+    """Return the histogram layout used by a model and firmware version.
+
+    :param model: Model number of the OPC ('N1' or 'N2')
+    :param version: Firmware version
+
+    :type model: string
+    :type version: float
+
+    :rtype: opc.decoders.HistogramLayout
+    """
+    if model == 'N1':
+        return N1
+
+    return N2_LEGACY if version < 16. else N2
+
+def decode_histograms(frames, layout, number_concentration=True, sfr=None):
+    """Decode many raw histogram frames at once using numpy (required). This is the batch
+    equivalent of opc.OPCN2.histogram(), and returns a dictionary of column arrays with
+    one row per frame:
+
+      * 'Bins': (N, 16) array of counts, or number concentrations (#/cc) if number_concentration is True
+      * 'MToF': (N, 4) array of the MToF of bins 1, 3, 5 and 7
+      * 'SFR', 'Temperature', 'Pressure', 'Sampling Period', 'PM1', 'PM2.5', 'PM10': (N,) float arrays.
+        Values that are not present in a frame are NaN.
+      * 'Checksum': (N,) array of checksums
+      * 'Valid': (N,) boolean array, False where the checksum does not match the sum of the bins
+
+    :param frames: (N, 62) uint8 array, or a buffer of N concatenated frames
+    :param layout: The layout of the frames (see histogram_layout)
+    :param number_concentration: If true, bins are converted to number concentration
+    :param sfr: Sample flow rate in ml/s to use for layouts that do not include it (firmware < 16)
+
+    :type frames: numpy.ndarray, bytes or bytearray
+    :type layout: opc.decoders.HistogramLayout
+    :type number_concentration: boolean
+    :type sfr: float
+
+    :rtype: dictionary
+
+    :Example:
+
+    >>> frames = numpy.fromfile('histograms.bin', dtype=numpy.uint8).reshape(-1, 62)
+    >>> data = decode_histograms(frames, histogram_layout('N2', 18.2))
+    >>> data['Bins'][data['Valid']].mean(axis=0)
+    """
+    np = _numpy()
+    dtype = layout.dtype
+
+    if isinstance(frames, np.ndarray):
+        raw = np.ascontiguousarray(frames, dtype=np.uint8).reshape(-1, layout.size).view(dtype)[:, 0]
+    else:
+        raw = np.frombuffer(frames, dtype=dtype)
+
+    bins = raw['bins']
+    data = {}
+
+    data['MToF']            = raw['mtof'] / 3.0
+    data['Checksum']        = raw['checksum']
+    data['Valid']           = (bins.sum(axis=1, dtype=np.uint32) & 0xFFFF) == raw['checksum']
+    data['PM1']             = raw['pm'][:, 0].astype(np.float64)
+    data['PM2.5']           = raw['pm'][:, 1].astype(np.float64)
+    data['PM10']            = raw['pm'][:, 2].astype(np.float64)
+
+    if 'sfr' in dtype.names:
+        tmp = raw['temp_pressure']
+
+        data['SFR']             = raw['sfr'].astype(np.float64)
+        data['Sampling Period'] = raw['period'].astype(np.float64)
+
+        # Temperature and pressure share a field, so tell them apart by their value
+        data['Pressure']        = np.where(tmp > 98000, tmp, np.nan)
+        data['Temperature']     = np.where((tmp <= 98000) & (tmp / 10.0 < 500), tmp / 10.0, np.nan)
+    else:
+        data['SFR']             = np.full(len(raw), np.nan if sfr is None else float(sfr))
+        data['Sampling Period'] = raw['period'] / 12e6
+        data['Temperature']     = raw['temperature'] / 10.0
+        data['Pressure']        = raw['pressure'].astype(np.float64)
+
+    if number_concentration is True:
+        if 'sfr' not in dtype.names and sfr is None:
+            raise ValueError("The {} layout does not include the SFR, so it must be given to calculate "
+                             "number concentrations.".format(layout.name))
+
+        # Divider in units of ml (cc)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            data['Bins'] = bins / (data['SFR'] * data['Sampling Period'])[:, np.newaxis]
+    else:
+        data['Bins'] = bins
+
+    return data
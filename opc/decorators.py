@@ -1,16 +1,44 @@
 from functools import wraps
 from .exceptions import FirmwareVersionError
 
+def check_firmware(opc, major):
+    """Raise a FirmwareVersionError if the firmware of an OPC is older than major. Coroutines
+    call this from their body (see opc.aio), so the error is raised when they are awaited.
+    """
+    if float(opc.firmware['version']) < float(major):
+        msg = """Your current firmware ({}) does not support this method.
+            Firmware v{} is required.""".format(opc.firmware['version'], major)
+
+        raise FirmwareVersionError(msg)
+
 def requires_firmware(major):
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            if float(args[0].firmware['version']) < float(major):
-                msg = """Your current firmware ({}) does not support this method.
-                    Firmware v{} is required.""".format(args[0].firmware['version'], major)
-
-                raise FirmwareVersionError(msg)
+            check_firmware(args[0], major)
 
             return f(*args, **kwargs)
         return decorated_function
     return decorator
+
+def transaction(f):
+    """Mark a method as a complete command sequence on the bus. The method is not started
+    until the guard time since the previous command has elapsed, and the guard is re-armed
+    once it returns. The command is named after the method in the metrics of the OPC.
+    """
+    name = f.__name__.lstrip('_')
+
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        args[0]._begin_transaction(name=name)
+
+        try:
+            result = f(*args, **kwargs)
+        except:
+            args[0]._end_transaction(error=True)
+            raise
+
+        args[0]._end_transaction()
+
+        return result
+    return decorated_function
@@ -0,0 +1,236 @@
+''' An HTTP endpoint exposing the metrics of every OPC in the Prometheus text format '''
+from .metrics import instances
+
+from collections import Counter, OrderedDict
+import threading
+
+try:
+    from http.server import HTTPServer, BaseHTTPRequestHandler
+except ImportError:
+    from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Latency quantiles exported for each command
+QUANTILES = (0.5, 0.9, 0.99)
+
+def _escape(value):
+    """Escape a label value."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _labels(labels):
+    return '{' + ','.join('{}="{}"'.format(k, _escape(v)) for k, v in labels) + '}'
+
+def _number(value):
+    if value is None:
+        return 'NaN'
+
+    if value == float('inf'):
+        return '+Inf'
+
+    return repr(float(value))
+
+class _Family(object):
+    """The samples of a single metric."""
+    def __init__(self, name, kind, help):
+        self.name, self.kind, self.help = name, kind, help
+        self.samples = []
+
+    def add(self, labels, value, suffix=''):
+        self.samples.append((self.name + suffix, labels, value))
+
+    def lines(self):
+        yield '# HELP {} {}'.format(self.name, self.help)
+        yield '# TYPE {} {}'.format(self.name, self.kind)
+
+        for name, labels, value in self.samples:
+            yield '{}{} {}'.format(name, _labels(labels), _number(value))
+
+def _device_labels(opcs):
+    """Return the labels of each OPC: its device (the device_id, or the bus if it has none), its
+    bus, and an opc_instance label that numbers the OPC's with the same device in the order they
+    are given. OPC's that share a device_id (e.g. an instance that is still referenced after
+    reconnecting to the same device) therefore have distinct series, as Prometheus rejects a
+    scrape with duplicate series. The label is not called instance, which Prometheus reserves
+    for the target."""
+    seen = Counter()
+
+    labels = []
+    for opc in opcs:
+        device = opc.device_id or opc.bus
+
+        labels.append((('device', device), ('bus', opc.bus), ('opc_instance', seen[device])))
+        seen[device] += 1
+
+    return labels
+
+def render(opcs=None):
+    """Render the metrics of a set of OPC's in the Prometheus text format. OPC's that do not
+    record metrics (see opc.OPCN2.metrics) only appear in opc_info and the lost frame counters.
+    Each OPC is labelled with its device and bus, and OPC's that share a device_id are told
+    apart by an opc_instance label, which numbers them in the order they are given.
+
+    Rates, such as the poll rate and the checksum failure rate, are left to Prometheus,
+    e.g. rate(opc_histograms_total[5m]), and the latency percentiles can be computed from
+    the opc_command_latency_seconds histogram across devices, or read from
+    opc_command_latency_quantile_seconds.
+
+    :param opcs: The OPC's to include. By default, every OPC in the process is included, in the order they were created.
+
+    :type opcs: list
+
+    :rtype: string
+    """
+    opcs = instances() if opcs is None else opcs
+
+    # Each OPC is only rendered once, even if it is given more than once
+    opcs = list(OrderedDict((id(opc), opc) for opc in opcs).values())
+
+    families = [
+        _Family('opc_info', 'gauge', 'Model and firmware version of each OPC'),
+        _Family('opc_metrics_enabled', 'gauge', 'Whether the OPC is recording metrics'),
+        _Family('opc_histograms_total', 'counter', 'Histograms read successfully'),
+        _Family('opc_checksum_failures_total', 'counter', 'Histograms that failed the checksum'),
+        _Family('opc_lost_frames_total', 'counter', 'Histograms lost because they failed the checksum'),
+        _Family('opc_lost_sampling_seconds_total', 'counter', 'Sampling time covered by the histograms that were lost'),
+        _Family('opc_firmware_retries_total', 'counter', 'Retries while detecting the firmware version'),
+        _Family('opc_last_sample_age_seconds', 'gauge', 'Time since the last histogram was read'),
+        _Family('opc_sampling_period_seconds', 'gauge', 'Mean sampling period of the histograms'),
+        _Family('opc_sampling_period_jitter_seconds', 'gauge', 'Standard deviation of the sampling period of the histograms'),
+        _Family('opc_transfer_bytes_total', 'counter', 'Bytes transferred on the bus'),
+        _Family('opc_commands_total', 'counter', 'Commands sent'),
+        _Family('opc_command_errors_total', 'counter', 'Commands that raised an exception'),
+        _Family('opc_command_wait_seconds_total', 'counter', 'Time spent waiting for the guard time and the bus lock'),
+        _Family('opc_command_transfer_seconds_total', 'counter', 'Time spent transferring bytes'),
+        _Family('opc_command_latency_seconds', 'histogram', 'Latency of each command, once it holds the bus'),
+        _Family('opc_command_latency_quantile_seconds', 'gauge', 'Estimated quantiles of the latency of each command'),
+    ]
+    f = dict((family.name, family) for family in families)
+
+    for opc, device in zip(opcs, _device_labels(opcs)):
+        firmware = opc.firmware['version']
+
+        f['opc_info'].add(device + (('model', opc.model), ('firmware', firmware)), 1)
+
+        # Only the OPC-N2 checks the histogram checksum
+        if hasattr(opc, 'lost_frames'):
+            f['opc_lost_frames_total'].add(device, opc.lost_frames)
+            f['opc_lost_sampling_seconds_total'].add(device, opc.lost_sampling_time)
+
+        metrics = opc._metrics
+        f['opc_metrics_enabled'].add(device, 0 if metrics is None else 1)
+
+        if metrics is None:
+            continue
+
+        # Every value comes from a single snapshot, taken under the lock of the metrics
+        stats = metrics.snapshot()
+
+        f['opc_histograms_total'].add(device, stats['samples'])
+        f['opc_checksum_failures_total'].add(device, stats['checksum_failures'])
+        f['opc_firmware_retries_total'].add(device, stats['firmware_retries'])
+        f['opc_last_sample_age_seconds'].add(device, stats['last_sample_age'])
+        f['opc_sampling_period_seconds'].add(device, stats['sampling_period'])
+        f['opc_sampling_period_jitter_seconds'].add(device, stats['sampling_period_jitter'])
+        f['opc_transfer_bytes_total'].add(device, stats['bytes'])
+
+        for name, command in sorted(stats['commands'].items()):
+            labels = device + (('command', name), )
+            latency = command['latency']
+
+            f['opc_commands_total'].add(labels, command['count'])
+            f['opc_command_errors_total'].add(labels, command['errors'])
+            f['opc_command_wait_seconds_total'].add(labels, command['wait'])
+            f['opc_command_transfer_seconds_total'].add(labels, command['transfer'])
+
+            family, total = f['opc_command_latency_seconds'], 0
+
+            for bound, n in latency['buckets']:
+                total += n
+                family.add(labels + (('le', _number(bound)), ), total, '_bucket')
+
+            family.add(labels, latency['total'], '_sum')
+            family.add(labels, command['count'], '_count')
+
+            for q in QUANTILES:
+                f['opc_command_latency_quantile_seconds'].add(labels + (('quantile', q), ), latency['p{:g}'.format(100 * q)])
+
+    return '\n'.join(line for family in families for line in family.lines()) + '\n'
+
+class _Handler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+
+        body = render(self.server.opcs).encode('utf-8')
+
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class MetricsExporter(object):
+    """Serves the metrics of every OPC in the process (see render) over HTTP at /metrics,
+    for Prometheus to scrape. The server runs in a daemon thread, and only uses the
+    standard library. OPC's must be created with metrics=True (or have enable_metrics
+    called) for their counters to be exported.
+
+    :param port: Port to listen on, or 0 to pick a free one
+    :param address: Address to listen on. By default, every interface.
+    :param opcs: The OPC's to export. By default, every OPC in the process is exported.
+
+    :type port: int
+    :type address: string
+    :type opcs: list
+
+    :rtype: opc.exporter.MetricsExporter
+
+    :Example:
+
+    >>> alpha = opc.OPCN2(spi, metrics=True)
+    >>> exporter = MetricsExporter(port=9464).start()
+    >>> for sample in alpha.stream(interval=1.):
+    ...     pass
+    """
+    def __init__(self, port=9464, address='', opcs=None):
+        self._server        = HTTPServer((address, port), _Handler)
+        self._server.opcs   = opcs
+        self._thread        = None
+
+    @property
+    def port(self):
+        """The port the exporter is listening on"""
+        return self._server.server_address[1]
+
+    def start(self):
+        """Start serving in a daemon thread.
+
+        :rtype: opc.exporter.MetricsExporter
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever, name='opc-exporter')
+            self._thread.daemon = True
+            self._thread.start()
+
+        return self
+
+    def close(self):
+        """Stop serving and close the socket."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,145 @@
+''' Recomputing PM mass concentrations on the host from the histogram bins '''
+from ._optional import optional_import
+from .acquisition import unpack_sample
+from .decoders import BIN_KEYS
+
+_numpy = optional_import('numpy', 'to calculate PM in batches')
+
+class MassCalculator(object):
+    """Calculates PM mass concentrations (ug/m3) from histogram bins, using the
+    configuration variables of the OPC (see opc.OPCN2.config): the bin boundaries, and
+    the volume (BPV), density (BPD) and sample volume weighting (BSVW) of each bin. The
+    mass of each bin is its number concentration x BPV x BPD x BSVW.
+
+    The weight of each bin for each cutoff is calculated once, so the PM of a histogram
+    (pm) or of many at once (pm_batch) is a single weighted sum. Bins that straddle a
+    cutoff are included in proportion to the part of the bin below it, unless interpolate
+    is False, in which case only bins entirely below the cutoff are included.
+
+    :param config: Configuration variables of the OPC
+    :param density: Particle density in g/cm3 to use instead of BPD, for every bin (float) or each bin (list of 16)
+    :param cutoffs: Cutoff diameters in microns
+    :param max_diameter: Upper boundary of the last bin in microns
+    :param interpolate: If True, bins that straddle a cutoff are partly included
+
+    :type config: opc.records.ConfigVariables or dictionary
+    :type density: float or list
+    :type cutoffs: tuple
+    :type max_diameter: float
+    :type interpolate: boolean
+
+    :rtype: opc.mass.MassCalculator
+
+    :Example:
+
+    >>> calculator = MassCalculator(alpha.config(), density=1.2)
+    >>> calculator.pm(alpha.histogram())
+    {'PM1': 1.52, 'PM2.5': 4.83, 'PM10': 10.01}
+    """
+    def __init__(self, config, density=None, cutoffs=(1., 2.5, 10.), max_diameter=17., interpolate=True):
+        if hasattr(config, 'bin_diameters'):
+            diameters = config.bin_diameters
+        else:
+            from .lookup_table import OPC_LOOKUP
+
+            diameters = [OPC_LOOKUP[min(config['Bin Boundary {}'.format(i)], 4095)] for i in range(16)]
+
+        self.config         = config
+        self.cutoffs        = tuple(cutoffs)
+        self.keys           = tuple('PM{:g}'.format(c) for c in self.cutoffs)
+        self.boundaries     = list(diameters) + [max_diameter]
+        self.interpolate    = interpolate
+
+        self.volumes        = [config['BPV {}'.format(i)] for i in range(16)]
+        self.weightings     = [config['BSVW {}'.format(i)] for i in range(16)]
+
+        self.set_density(density)
+
+    def set_density(self, density=None):
+        """Change the particle density, and recalculate the weight of each bin.
+
+        :param density: Particle density in g/cm3, for every bin (float) or each bin (list of 16). None to use BPD.
+
+        :type density: float or list
+        """
+        if density is None:
+            density = [self.config['BPD {}'.format(i)] for i in range(16)]
+        elif not hasattr(density, '__len__'):
+            density = [density] * 16
+
+        if len(density) != 16:
+            raise ValueError("A density is needed for each of the 16 bins, not {}.".format(len(density)))
+
+        self.density = list(density)
+
+        # Mass of each bin in ug/m3 for a number concentration of 1 #/cc
+        mass = [v * d * w for v, d, w in zip(self.volumes, self.density, self.weightings)]
+
+        self.weights = [[m * self._fraction(i, cutoff) for i, m in enumerate(mass)] for cutoff in self.cutoffs]
+        self._array = None
+
+    def _fraction(self, i, cutoff):
+        """Fraction of bin i below a cutoff diameter."""
+        lower, upper = self.boundaries[i], self.boundaries[i + 1]
+
+        if upper <= cutoff:
+            return 1.
+
+        if lower >= cutoff or not self.interpolate or upper <= lower:
+            return 0.
+
+        return (cutoff - lower) / (upper - lower)
+
+    def _concentrations(self, data):
+        """Return the number concentration of each bin of a histogram."""
+        bins = list(data.bins) if hasattr(data, 'bins') else [data[key] for key in BIN_KEYS]
+
+        # Raw counts are converted using the volume sampled
+        if not any(isinstance(b, float) for b in bins):
+            sfr = data.get('SFR')
+            sfr = self.config['SFR'] if sfr is None else sfr
+            volume = sfr * data['Sampling Period']
+
+            return [b / volume if volume else 0. for b in bins]
+
+        return bins
+
+    def pm(self, data):
+        """Calculate the PM of a histogram, in number concentration or raw counts (in which
+        case the SFR of the configuration variables is used if the histogram has none).
+
+        :param data: A histogram, or a Sample holding one
+
+        :type data: dictionary or opc.records.Histogram
+
+        :rtype: dictionary
+        """
+        data = unpack_sample(data)[0]
+
+        bins = self._concentrations(data)
+
+        return dict((key, sum(w * b for w, b in zip(weights, bins))) for key, weights in zip(self.keys, self.weights))
+
+    def pm_batch(self, bins):
+        """Calculate the PM of many histograms at once (requires numpy).
+
+        :param bins: (N, 16) array of number concentrations (#/cc), or the columns returned by opc.decoders.decode_histograms or opc.archive.ArchiveReader.decode with number_concentration=True
+
+        :type bins: numpy.ndarray or dictionary
+
+        :rtype: dictionary of (N,) arrays
+        """
+        np = _numpy()
+
+        if self._array is None:
+            self._array = np.array(self.weights, dtype=np.float64).T
+
+        if hasattr(bins, 'keys'):
+            bins = bins['Bins']
+
+        pm = np.dot(np.asarray(bins, dtype=np.float64).reshape(-1, 16), self._array)
+
+        return dict((key, pm[:, i]) for i, key in enumerate(self.keys))
+
+    def __repr__(self):
+        return "MassCalculator(cutoffs={}, interpolate={})".format(self.cutoffs, self.interpolate)
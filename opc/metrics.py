@@ -0,0 +1,253 @@
+''' Per-command instrumentation of an OPC '''
+from .timing import monotonic
+
+from bisect import bisect_left
+import itertools
+import threading
+import weakref
+
+# Upper bounds of the latency histogram buckets in seconds; the last bucket is unbounded
+BUCKETS = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1., 2., 5.)
+
+class CommandStats(object):
+    """The running totals of a single command."""
+    __slots__ = ('count', 'errors', 'bytes', 'wait', 'transfer', 'latency', 'max_latency', 'buckets')
+
+    def __init__(self):
+        self.count          = 0
+        self.errors         = 0
+        self.bytes          = 0
+        self.wait           = 0.    # waiting for the guard time and the bus lock
+        self.transfer       = 0.    # in xfer
+        self.latency        = 0.    # from acquiring the bus lock to the end of the command
+        self.max_latency    = 0.
+        self.buckets        = [0] * (len(BUCKETS) + 1)
+
+    def quantile(self, q):
+        """Estimate a quantile of the latency from the histogram, by interpolating within
+        the bucket it falls in.
+
+        :param q: Quantile (0-1)
+
+        :type q: float
+
+        :rtype: float
+        """
+        if not self.count:
+            return 0.
+
+        rank, seen = q * self.count, 0
+
+        for i, n in enumerate(self.buckets):
+            if n and seen + n >= rank:
+                lower = BUCKETS[i - 1] if i > 0 else 0.
+                upper = BUCKETS[i] if i < len(BUCKETS) else self.max_latency
+
+                return min(lower + (upper - lower) * (rank - seen) / n, self.max_latency)
+
+            seen += n
+
+        return self.max_latency
+
+    def snapshot(self):
+        return {
+            'count':        self.count,
+            'errors':       self.errors,
+            'bytes':        self.bytes,
+            'wait':         self.wait,
+            'transfer':     self.transfer,
+            'delay':        max(self.latency - self.transfer, 0.),
+            'latency':      {
+                'total':    self.latency,
+                'mean':     self.latency / self.count if self.count else 0.,
+                'max':      self.max_latency,
+                'p50':      self.quantile(0.5),
+                'p90':      self.quantile(0.9),
+                'p99':      self.quantile(0.99),
+                'buckets':  list(zip(BUCKETS + (float('inf'), ), self.buckets)),
+            },
+        }
+
+class Metrics(object):
+    """Collects the latency, bytes transferred and errors of every command sent to an OPC.
+    An OPC only records metrics if it was created with metrics=True, or after
+    enable_metrics is called; otherwise each command only pays for a single check.
+
+    Each command is timed from the moment its command sequence holds the bus (see
+    opc.decorators.transaction) until it returns, and the time spent waiting for the
+    guard time and the bus lock beforehand is recorded separately as wait. The latency
+    is further split into the time spent in xfer (transfer) and the rest (delay), which
+    is mostly the command delay.
+
+    Commands are named after the methods that send them, e.g. 'raw_histogram' for
+    histogram and 'read_config' for config. Commands are timed while the bus lock of the
+    OPC is held. Every counter is updated and read under a lock of the Metrics itself,
+    because some (checksum_failures and the sampling period of each histogram) are
+    updated after the bus lock is released, and snapshot can be called from any thread.
+
+    :rtype: opc.metrics.Metrics
+
+    :Example:
+
+    >>> alpha = opc.OPCN2(spi, metrics=True)
+    >>> alpha.histogram()
+    >>> alpha.metrics()['commands']['raw_histogram']['latency']['mean']
+    0.0213
+    """
+    def __init__(self):
+        self._lock              = threading.Lock()
+
+        self.started            = monotonic()
+        self.commands           = {}
+
+        self.bytes              = 0
+        self.checksum_failures  = 0
+        self.firmware_retries   = 0
+
+        # Histograms read, when the last one was read, and the running mean and sum of
+        # squared differences of their sampling periods (Welford's method)
+        self.samples            = 0
+        self.last_sample        = None
+        self._period_mean       = 0.
+        self._period_m2         = 0.
+
+        # The command in progress: its stats, when it started and how deeply it is nested
+        self._current           = None
+        self._start             = None
+        self._depth             = 0
+
+    def _stats(self, name):
+        stats = self.commands.get(name)
+
+        if stats is None:
+            stats = self.commands[name] = CommandStats()
+
+        return stats
+
+    def begin(self, name, wait=0.):
+        """Mark the start of a command, once the bus lock is held.
+
+        :param name: Name of the command
+        :param wait: Time spent waiting for the guard time and the bus lock in seconds
+
+        :type name: string
+        :type wait: float
+        """
+        self._depth += 1
+
+        # Commands sent from within another command are counted as part of it
+        if self._depth > 1:
+            return
+
+        with self._lock:
+            self._current = self._stats(name)
+            self._current.wait += wait
+
+        self._start = monotonic()
+
+    def end(self, error=False):
+        """Mark the end of the command in progress.
+
+        :param error: True if the command raised an exception
+
+        :type error: boolean
+        """
+        # Ignore commands that started before metrics were enabled
+        if self._depth == 0:
+            return
+
+        self._depth -= 1
+
+        if self._depth > 0:
+            return
+
+        latency = monotonic() - self._start
+
+        with self._lock:
+            stats, self._current = self._current, None
+
+            stats.count += 1
+            stats.errors += bool(error)
+            stats.latency += latency
+            stats.max_latency = max(stats.max_latency, latency)
+            stats.buckets[bisect_left(BUCKETS, latency)] += 1
+
+    def transfer(self, nbytes, elapsed):
+        """Record a transfer, as part of the command in progress if there is one.
+
+        :param nbytes: Number of bytes sent (and received)
+        :param elapsed: Time spent in xfer in seconds
+
+        :type nbytes: int
+        :type elapsed: float
+        """
+        with self._lock:
+            self.bytes += nbytes
+
+            if self._current is not None:
+                self._current.bytes += nbytes
+                self._current.transfer += elapsed
+
+    def sample(self, period):
+        """Record a histogram that was read successfully.
+
+        :param period: The sampling period of the histogram in seconds
+
+        :type period: float
+        """
+        with self._lock:
+            self.samples += 1
+            self.last_sample = monotonic()
+
+            delta = period - self._period_mean
+            self._period_mean += delta / self.samples
+            self._period_m2 += delta * (period - self._period_mean)
+
+    def checksum_failure(self):
+        """Record a histogram that failed the checksum."""
+        with self._lock:
+            self.checksum_failures += 1
+
+    def firmware_retry(self):
+        """Record a retry while detecting the firmware version."""
+        with self._lock:
+            self.firmware_retries += 1
+
+    def snapshot(self):
+        """Return a copy of the metrics collected so far.
+
+        :rtype: dictionary
+        """
+        with self._lock:
+            return {
+                'uptime':               monotonic() - self.started,
+                'bytes':                self.bytes,
+                'checksum_failures':    self.checksum_failures,
+                'firmware_retries':     self.firmware_retries,
+                'samples':              self.samples,
+                'last_sample_age':      monotonic() - self.last_sample if self.last_sample is not None else None,
+                'sampling_period':      self._period_mean,
+                'sampling_period_jitter': (self._period_m2 / (self.samples - 1)) ** 0.5 if self.samples > 1 else 0.,
+                'commands':             dict((name, stats.snapshot()) for name, stats in self.commands.items()),
+            }
+
+    def __repr__(self):
+        return "Metrics({} commands, {} bytes, {} checksum failures)".format(
+            sum(s.count for s in self.commands.values()), self.bytes, self.checksum_failures)
+
+# Every OPC created in this process, so they can be exported (see opc.exporter), and the
+# order they were created in
+_instances = weakref.WeakKeyDictionary()
+_created = itertools.count()
+
+def register(opc):
+    """Add an OPC to the instances returned by instances."""
+    _instances[opc] = next(_created)
+
+def instances():
+    """Return every OPC that has been created in this process and is still in use, in the
+    order they were created.
+
+    :rtype: list
+    """
+    return [opc for opc, n in sorted(list(_instances.items()), key=lambda item: item[1])]
@@ -0,0 +1,249 @@
+''' Compact record types for the data returned by the Alphasense OPC's '''
+from .lookup_table import OPC_LOOKUP
+
+from array import array
+import struct
+
+try:
+    from collections.abc import Mapping
+except ImportError:     # python2
+    from collections import Mapping as _Mapping
+
+    # The python2 Mapping and its bases have no __slots__, so records that inherit from it
+    # would still have a __dict__. Instead, the records share a slotted copy of its methods.
+    class Mapping(object):
+        __slots__ = ()
+        __hash__ = None
+
+    for _name in ('__contains__', 'keys', 'items', 'values', 'iterkeys', 'itervalues', 'iteritems',
+                  'get', '__eq__', '__ne__'):
+        setattr(Mapping, _name, vars(_Mapping)[_name])
+
+    _Mapping.register(Mapping)
+
+class Histogram(Mapping):
+    """A compact histogram sample. The bins and MToF's are stored in arrays and the
+    remaining values in slots, so a sample uses a fraction of the memory of the
+    dictionary returned by opc.OPCN2.histogram(). For backwards compatibility, it can
+    be used as a read-only dictionary with the same keys.
+
+    :param bins: The 16 bin counts (array('H')) or number concentrations (array('f'))
+    :param mtof: MToF of bins 1, 3, 5 and 7
+    :param sfr: Sample flow rate in ml/s, or None if not sent by the firmware
+    :param temperature: Temperature in degrees celcius, or None
+    :param pressure: Pressure in pascals, or None
+    :param period: Sampling period in seconds
+    :param checksum: Checksum sent with the histogram
+    :param pm1: PM1 in ug/m3
+    :param pm25: PM2.5 in ug/m3
+    :param pm10: PM10 in ug/m3
+
+    :rtype: opc.records.Histogram
+
+    :Example:
+
+    >>> hist = alpha.histogram(compact=True)
+    >>> hist['Bin 0'], hist.bins[0]
+    (1.7553, 1.7553)
+    >>> dict(hist)
+    {
+        'Bin 0': 1.7553,
+        ...
+    }
+    """
+    __slots__ = ('bins', 'mtof', 'sfr', 'temperature', 'pressure', 'period',
+                 'checksum', 'pm1', 'pm25', 'pm10')
+
+    # Map each dictionary key to a slot, and an index for the array slots
+    _FIELDS = dict([('Bin {}'.format(i), ('bins', i)) for i in range(16)] +
+                   [('Bin{} MToF'.format(b), ('mtof', i)) for i, b in enumerate((1, 3, 5, 7))] +
+                   [('SFR', ('sfr', None)), ('Temperature', ('temperature', None)),
+                    ('Pressure', ('pressure', None)), ('Sampling Period', ('period', None)),
+                    ('Checksum', ('checksum', None)), ('PM1', ('pm1', None)),
+                    ('PM2.5', ('pm25', None)), ('PM10', ('pm10', None))])
+
+    _KEYS = tuple(['Bin {}'.format(i) for i in range(16)] + ['Bin1 MToF', 'Bin3 MToF', 'Bin5 MToF', 'Bin7 MToF',
+                   'SFR', 'Temperature', 'Pressure', 'Sampling Period', 'Checksum', 'PM1', 'PM2.5', 'PM10'])
+
+    def __init__(self, bins, mtof, sfr, temperature, pressure, period, checksum, pm1, pm25, pm10):
+        self.bins           = bins
+        self.mtof           = mtof
+        self.sfr            = sfr
+        self.temperature    = temperature
+        self.pressure       = pressure
+        self.period         = period
+        self.checksum       = checksum
+        self.pm1            = pm1
+        self.pm25           = pm25
+        self.pm10           = pm10
+
+    def to_number_concentration(self, sfr=None):
+        """Convert the bin counts to number concentration (#/cc) in place, using the SFR and
+        sampling period of the sample. Firmware < 16 does not send the SFR, so it must be
+        given for those samples.
+
+        :param sfr: Sample flow rate in ml/s to use if the sample does not include it
+
+        :type sfr: float
+
+        :raises: ValueError if the sample does not include the SFR and none is given
+
+        :rtype: opc.records.Histogram
+        """
+        sfr = self.sfr if self.sfr is not None else sfr
+
+        if sfr is None:
+            raise ValueError("The histogram does not include the SFR (firmware < 16), so it must be given "
+                             "to calculate number concentrations.")
+
+        conv = sfr * self.period     # Divider in units of ml (cc)
+
+        self.bins = array('f', [b / conv for b in self.bins])
+
+        return self
+
+    def __getitem__(self, key):
+        try:
+            name, index = self._FIELDS[key]
+        except KeyError:
+            raise KeyError(key)
+
+        # SFR is only a key if the firmware sends it
+        if name == 'sfr' and self.sfr is None:
+            raise KeyError(key)
+
+        value = getattr(self, name)
+
+        return value if index is None else value[index]
+
+    def __iter__(self):
+        for key in self._KEYS:
+            if key != 'SFR' or self.sfr is not None:
+                yield key
+
+    def __len__(self):
+        return len(self._KEYS) if self.sfr is not None else len(self._KEYS) - 1
+
+    def __repr__(self):
+        return "Histogram({!r})".format(dict(self))
+
+class ConfigVariables(Mapping):
+    """The decoded configuration variables of an OPC-N2, as returned by
+    opc.OPCN2.config_record(). The per-bin values are stored in arrays, and it can be used
+    as a read-only dictionary with the same keys as the dictionary returned by config().
+
+    :param bin_boundaries: The 16 bin boundaries as ADC values
+    :param bpv: The 16 Bin Particle Volumes
+    :param bpd: The 16 Bin Particle Densities
+    :param bsvw: The 16 Bin Sample Volume Weights
+    :param gsc: Gain Scaling Coefficient
+    :param sfr: Sample Flow Rate in ml/s
+    :param laser_dac: Laser DAC value
+    :param fan_dac: Fan DAC value
+    :param tof_sfr: Time of flight to SFR conversion factor, or None if not sent by the firmware (< 16)
+
+    :rtype: opc.records.ConfigVariables
+    """
+    __slots__ = ('bin_boundaries', 'bpv', 'bpd', 'bsvw', 'gsc', 'sfr', 'laser_dac', 'fan_dac', 'tof_sfr')
+
+    # The first 235 bytes of the 256 byte response to the 0x3C command. All 16 bin
+    # boundaries are decoded (bytes 0-31), while config() before v1.6.0 only decoded 15.
+    STRUCT = struct.Struct('<16H16f16f16f2f3B')
+
+    _FIELDS = dict([('Bin Boundary {}'.format(i), ('bin_boundaries', i)) for i in range(16)] +
+                   [('BPV {}'.format(i), ('bpv', i)) for i in range(16)] +
+                   [('BPD {}'.format(i), ('bpd', i)) for i in range(16)] +
+                   [('BSVW {}'.format(i), ('bsvw', i)) for i in range(16)] +
+                   [('GSC', ('gsc', None)), ('SFR', ('sfr', None)), ('LaserDAC', ('laser_dac', None)),
+                    ('FanDAC', ('fan_dac', None)), ('TOF_SFR', ('tof_sfr', None))])
+
+    _KEYS = tuple(['Bin Boundary {}'.format(i) for i in range(16)] + ['BPV {}'.format(i) for i in range(16)] +
+                  ['BPD {}'.format(i) for i in range(16)] + ['BSVW {}'.format(i) for i in range(16)] +
+                  ['GSC', 'SFR', 'LaserDAC', 'FanDAC', 'TOF_SFR'])
+
+    def __init__(self, bin_boundaries, bpv, bpd, bsvw, gsc, sfr, laser_dac, fan_dac, tof_sfr=None):
+        self.bin_boundaries = bin_boundaries
+        self.bpv            = bpv
+        self.bpd            = bpd
+        self.bsvw           = bsvw
+        self.gsc            = gsc
+        self.sfr            = sfr
+        self.laser_dac      = laser_dac
+        self.fan_dac        = fan_dac
+        self.tof_sfr        = tof_sfr
+
+    @classmethod
+    def from_bytes(cls, buf, tof_sfr=True):
+        """Decode the response to the read configuration variables command.
+
+        :param buf: The 256 byte response
+        :param tof_sfr: Whether or not the firmware sends TOF_SFR (firmware 16+)
+
+        :type buf: bytes, bytearray or memoryview
+        :type tof_sfr: boolean
+
+        :rtype: opc.records.ConfigVariables
+        """
+        vals = cls.STRUCT.unpack_from(buf)
+
+        return cls(array('H', vals[0:16]), array('f', vals[16:32]), array('f', vals[32:48]),
+                   array('f', vals[48:64]), vals[64], vals[65], vals[66], vals[67],
+                   vals[68] if tof_sfr else None)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build the configuration variables from a dictionary with the same keys (e.g. a
+        cached copy).
+
+        :param data: dictionary of configuration variables
+
+        :type data: dictionary
+
+        :rtype: opc.records.ConfigVariables
+        """
+        def _array(typecode, name):
+            return array(typecode, [data['{} {}'.format(name, i)] for i in range(16)])
+
+        return cls(_array('H', 'Bin Boundary'), _array('f', 'BPV'), _array('f', 'BPD'), _array('f', 'BSVW'),
+                   data['GSC'], data['SFR'], data['LaserDAC'], data['FanDAC'], data.get('TOF_SFR'))
+
+    def copy(self):
+        """Return a copy of the configuration variables that does not share their arrays.
+
+        :rtype: opc.records.ConfigVariables
+        """
+        return type(self)(array('H', self.bin_boundaries), array('f', self.bpv), array('f', self.bpd),
+                          array('f', self.bsvw), self.gsc, self.sfr, self.laser_dac, self.fan_dac, self.tof_sfr)
+
+    @property
+    def bin_diameters(self):
+        """The bin boundaries in microns, from the lookup table provided by Alphasense.
+
+        :rtype: list
+        """
+        return [OPC_LOOKUP[min(adc, 4095)] for adc in self.bin_boundaries]
+
+    def __getitem__(self, key):
+        try:
+            name, index = self._FIELDS[key]
+        except KeyError:
+            raise KeyError(key)
+
+        value = getattr(self, name)
+
+        # TOF_SFR is only a key if the firmware sends it
+        if value is None:
+            raise KeyError(key)
+
+        return value if index is None else value[index]
+
+    def __iter__(self):
+        for key in self._KEYS:
+            if key != 'TOF_SFR' or self.tof_sfr is not None:
+                yield key
+
+    def __len__(self):
+        return len(self._KEYS) if self.tof_sfr is not None else len(self._KEYS) - 1
+
+    def __repr__(self):
+        return "ConfigVariables({!r})".format(dict(self))
@@ -0,0 +1,254 @@
+''' Recording and replaying the raw SPI traffic of an OPC '''
+from .timing import accepts_delay, monotonic, transport_name
+
+from bisect import bisect_right
+from collections import namedtuple
+from time import sleep
+import threading
+import struct
+import time
+
+# File header: magic, format version, wall clock time at which the recording started
+HEADER = struct.Struct('<4sB3xd')
+MAGIC = b'OPCR'
+VERSION = 1
+
+# Each transfer: seconds since the start of the recording (monotonic) and the number of
+# bytes, followed by the bytes sent and then the bytes received
+RECORD = struct.Struct('<dH')
+
+# A single recorded transfer
+Transfer = namedtuple('Transfer', ['time', 'sent', 'received'])
+
+class ReplayError(Exception):
+    """Raised when the bytes sent to a ReplayTransport differ from the recording."""
+    pass
+
+class RecordingTransport(object):
+    """Wraps a spidev.SpiDev or usbiss.spi.SPI connection, and records every byte sent and
+    received by xfer to a compact binary file with monotonic timestamps. Every other
+    attribute is passed through to the connection, so it can be used in its place.
+
+    :param cnxn: The connection to record
+    :param path: Path of the recording, or a file object opened in binary mode
+
+    :type cnxn: spidev.SpiDev or usbiss.spi.SPI
+    :type path: string or file
+
+    :rtype: opc.replay.RecordingTransport
+
+    :Example:
+
+    >>> with RecordingTransport(spi, 'field.opcr') as recorder:
+    ...     alpha = opc.OPCN2(recorder)
+    ...     alpha.histogram()
+    """
+    def __init__(self, cnxn, path):
+        own = object.__setattr__
+
+        own(self, 'cnxn', cnxn)
+        own(self, '_file', open(path, 'wb') if isinstance(path, str) else path)
+        own(self, '_lock', threading.Lock())
+        own(self, '_start', monotonic())
+
+        self._file.write(HEADER.pack(MAGIC, VERSION, time.time()))
+
+    @property
+    def transport_name(self):
+        """The transport of the wrapped connection (see opc.timing.transport_name)"""
+        return transport_name(self.cnxn)
+
+    @property
+    def accepts_delay(self):
+        """Whether the wrapped connection accepts a delay (see opc.timing.accepts_delay)"""
+        return accepts_delay(self.cnxn)
+
+    def xfer(self, values, *args):
+        """Transfer a list of bytes with the wrapped connection and record them.
+
+        :param values: list of bytes to send
+        :param args: Passed on to the connection (speed_hz, delay_usecs, bits_per_word)
+
+        :type values: list
+
+        :rtype: list
+        """
+        values = list(values)
+        resp = self.cnxn.xfer(values, *args)
+
+        with self._lock:
+            self._file.write(RECORD.pack(monotonic() - self._start, len(values)))
+            self._file.write(bytearray(values))
+            self._file.write(bytearray(resp))
+
+        return resp
+
+    def flush(self):
+        """Flush the recording to disk."""
+        with self._lock:
+            self._file.flush()
+
+    def close(self):
+        """Close the recording. The wrapped connection is not closed."""
+        with self._lock:
+            self._file.close()
+
+    def __getattr__(self, name):
+        return getattr(self.cnxn, name)
+
+    def __setattr__(self, name, value):
+        setattr(self.cnxn, name, value)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+def read_recording(path):
+    """Read a recording made by RecordingTransport.
+
+    :param path: Path of the recording
+
+    :type path: string
+
+    :rtype: (float, list) the wall clock start time, and a list of opc.replay.Transfer
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    if len(data) < HEADER.size:
+        raise ValueError("{} is not an OPC recording.".format(path))
+
+    magic, version, started = HEADER.unpack_from(data)
+
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("{} is not an OPC recording (or is from an unsupported version).".format(path))
+
+    transfers, offset = [], HEADER.size
+
+    while offset + RECORD.size <= len(data):
+        t, n = RECORD.unpack_from(data, offset)
+        offset += RECORD.size
+
+        # Ignore a transfer that was cut short at the end of the file
+        if offset + 2 * n > len(data):
+            break
+
+        transfers.append(Transfer(t, data[offset:offset + n], data[offset + n:offset + 2 * n]))
+        offset += 2 * n
+
+    return started, transfers
+
+class ReplayTransport(object):
+    """Stands in for a spidev.SpiDev connection, and answers with the bytes of a recording
+    made by RecordingTransport. The recording is replayed as a stream of bytes, so the
+    transfers do not need to be split up the same way as when it was recorded (e.g.
+    with frame_reads on or off).
+
+    By default the recording is replayed as fast as possible, and OPC's created on a
+    ReplayTransport use a timing profile with no delays. If realtime is True, each byte
+    is not returned before the time at which it was recorded.
+
+    :param path: Path of the recording
+    :param realtime: If True, replay the recording at the speed it was recorded
+    :param speed: Speed up factor for realtime replays
+    :param strict: If True, raise ReplayError if the bytes sent differ from the recording
+
+    :type path: string
+    :type realtime: boolean
+    :type speed: float
+    :type strict: boolean
+
+    :rtype: opc.replay.ReplayTransport
+
+    :Example:
+
+    >>> alpha = opc.OPCN2(ReplayTransport('field.opcr'))
+    >>> alpha.histogram()
+    """
+    transport_name = 'replay'
+
+    def __init__(self, path, realtime=False, speed=1., strict=True):
+        self.mode           = 1
+        self.max_speed_hz   = 500000
+
+        self.realtime       = realtime
+        self.speed          = speed
+        self.strict         = strict
+
+        self.started, transfers = read_recording(path)
+
+        # The recording as two byte streams, with the offset and time of each transfer
+        self._sent      = b''.join(t.sent for t in transfers)
+        self._received  = b''.join(t.received for t in transfers)
+        self._offsets   = []
+        self._times     = [t.time for t in transfers]
+
+        offset = 0
+        for t in transfers:
+            self._offsets.append(offset)
+            offset += len(t.sent)
+
+        self._position  = 0
+        self._lock      = threading.Lock()
+        self._start     = None
+
+    def open(self, bus, device):
+        pass
+
+    def close(self):
+        pass
+
+    @property
+    def remaining(self):
+        """Number of recorded bytes that have not been replayed yet"""
+        return len(self._received) - self._position
+
+    def xfer(self, values, speed_hz=0, delay_usecs=0, bits_per_word=0):
+        """Return the recorded response to a list of bytes.
+
+        :param values: list of bytes to send
+        :param speed_hz: Ignored
+        :param delay_usecs: Ignored
+        :param bits_per_word: Ignored
+
+        :type values: list
+
+        :rtype: list
+        """
+        values = bytearray(values)
+
+        with self._lock:
+            start, end = self._position, self._position + len(values)
+
+            if end > len(self._received):
+                raise EOFError("The end of the recording has been reached.")
+
+            if self.strict and self._sent[start:end] != values:
+                raise ReplayError("The bytes sent at offset {} differ from the recording: {} != {}".format(
+                    start, list(values), list(bytearray(self._sent[start:end]))))
+
+            if self.realtime:
+                self._wait(end - 1)
+
+            self._position = end
+
+            return list(bytearray(self._received[start:end]))
+
+    def _wait(self, offset):
+        """Wait until the time at which the byte at offset was recorded."""
+        now = monotonic()
+
+        # The replay starts at the time of the first transfer
+        if self._start is None:
+            self._start = now - (self._times[0] / self.speed if self._times else 0.)
+
+        recorded = self._times[bisect_right(self._offsets, offset) - 1]
+        delay = self._start + recorded / self.speed - now
+
+        if delay > 0:
+            sleep(delay)
+
+    def __repr__(self):
+        return "ReplayTransport({} of {} bytes replayed)".format(self._position, len(self._received))
@@ -0,0 +1,65 @@
+''' Retrying histograms that fail the checksum '''
+import random
+
+class RetryPolicy(object):
+    """How often, and after how long, a histogram that fails the checksum is read again.
+    The delay before each retry grows by multiplier from backoff, up to max_backoff, and
+    is spread by up to +/- jitter of itself, so OPC's on the same bus do not retry in
+    lockstep.
+
+    Reading a histogram resets it, so the counts of a frame that fails the checksum are
+    lost whether or not it is retried; each retry only shortens the gap. The OPC counts
+    the frames lost and the sampling time they covered (see opc.OPCN2.lost_frames).
+
+    :param max_attempts: Maximum number of reads, including the first
+    :param backoff: Delay before the first retry in seconds
+    :param multiplier: Factor by which the delay grows with each retry
+    :param max_backoff: Longest delay between retries in seconds
+    :param jitter: Fraction of each delay by which it is randomly spread (0-1)
+    :param seed: Seed for the jitter
+
+    :type max_attempts: int
+    :type backoff: float
+    :type multiplier: float
+    :type max_backoff: float
+    :type jitter: float
+    :type seed: int
+
+    :rtype: opc.retry.RetryPolicy
+
+    :Example:
+
+    >>> alpha = opc.OPCN2(spi, retry=RetryPolicy(max_attempts=3, backoff=0.05))
+    >>> alpha.histogram()
+    """
+    def __init__(self, max_attempts=3, backoff=0.05, multiplier=2., max_backoff=1., jitter=0.25, seed=None):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1.")
+
+        if not 0 <= jitter <= 1:
+            raise ValueError("jitter must be between 0 and 1.")
+
+        self.max_attempts   = max_attempts
+        self.backoff        = backoff
+        self.multiplier     = multiplier
+        self.max_backoff    = max_backoff
+        self.jitter         = jitter
+
+        self._random        = random.Random(seed)
+
+    def delays(self):
+        """Yield the delay before each retry in seconds (max_attempts - 1 of them).
+
+        :rtype: generator of float
+        """
+        delay = self.backoff
+
+        for i in range(self.max_attempts - 1):
+            yield delay * (1. + self.jitter * self._random.uniform(-1., 1.))
+
+            delay = min(delay * self.multiplier, self.max_backoff)
+
+    def __repr__(self):
+        return ("RetryPolicy(max_attempts={}, backoff={}, multiplier={}, max_backoff={}, "
+                "jitter={})".format(self.max_attempts, self.backoff, self.multiplier,
+                self.max_backoff, self.jitter))
@@ -0,0 +1,376 @@
+''' A simulated Alphasense OPC that can stand in for a spidev.SpiDev connection '''
+from .lookup_table import adc_value
+from .timing import monotonic
+
+from time import sleep
+import threading
+import random
+import struct
+import math
+
+# Default bin boundaries of the OPC-N2 in microns (16 bins)
+N2_BIN_BOUNDARIES = [0.38, 0.54, 0.78, 1.05, 1.34, 1.59, 2.07, 3.0, 4.0, 5.0,
+                     6.5, 8.0, 10.0, 12.0, 14.0, 16.0, 17.0]
+
+# Byte returned while the OPC is not yet ready to send data
+BUSY = 0x31
+
+class SimulatedSpiDev(object):
+    """A simulated OPC-N2 (firmware 14-18) or OPC-N1 that implements the
+    spidev.SpiDev interface, so that opc.OPCN2 and opc.OPCN1 can be tested and
+    benchmarked without any hardware.
+
+    The simulator answers the real command bytes with frames laid out the same way
+    as the firmware it simulates. Particle counts are drawn from a Poisson distribution
+    around a log-normal size distribution, and accumulate for as long as the fan and
+    laser are on, until the histogram is read and reset.
+
+    :param model: Model of the OPC to simulate ('N2' or 'N1')
+    :param firmware: Firmware version as a tuple. Ex. (18, 2)
+    :param serial_number: Serial number returned by sn()
+    :param concentration: Total particle number concentration in #/cc
+    :param median_diameter: Count median diameter of the size distribution in microns
+    :param gsd: Geometric standard deviation of the size distribution
+    :param density: Particle density in g/cc, used for the PM values
+    :param sfr: Sample flow rate in ml/s
+    :param temperature: Temperature in degrees celcius
+    :param pressure: Pressure in pascals
+    :param sampling_period: Fixed sampling period in seconds. By default, the time since the histogram was last read is used.
+    :param error_rate: Probability that a histogram frame is corrupted on the way to the host
+    :param byte_time: Time taken to clock a single byte in seconds
+    :param xfer_overhead: Fixed time taken by each call to xfer in seconds (ioctl or serial round trip)
+    :param command_delay: Time the OPC needs after a command byte before data can be read, in seconds.
+        Bytes read before this has elapsed are returned as 0x31, so give the OPC a timing profile that waits for it.
+    :param seed: Seed for the random number generator
+
+    :type model: string
+    :type firmware: tuple
+    :type serial_number: string
+    :type concentration: float
+    :type median_diameter: float
+    :type gsd: float
+    :type density: float
+    :type sfr: float
+    :type temperature: float
+    :type pressure: int
+    :type sampling_period: float
+    :type error_rate: float
+    :type byte_time: float
+    :type xfer_overhead: float
+    :type command_delay: float
+    :type seed: int
+
+    :rtype: opc.simulator.SimulatedSpiDev
+
+    :Example:
+
+    >>> spi = SimulatedSpiDev(firmware=(18, 2), concentration=50.)
+    >>> alpha = opc.OPCN2(spi)
+    >>> alpha
+    Alphasense OPC-N2v18.2
+    """
+    transport_name = 'simulator'
+
+    def __init__(self, model='N2', firmware=(18, 2), serial_number='123456789', concentration=10.,
+                 median_diameter=0.5, gsd=1.8, density=1.65, sfr=3.7, temperature=23.5, pressure=101325,
+                 sampling_period=None, error_rate=0., byte_time=0., xfer_overhead=0., command_delay=0.,
+                 seed=None):
+        self.mode           = 1
+        self.max_speed_hz   = 500000
+        self.bus            = None
+        self.device         = None
+
+        self.model          = model
+        self.firmware       = firmware
+        self.serial_number  = serial_number
+        self.concentration  = concentration
+        self.median_diameter = median_diameter
+        self.gsd            = gsd
+        self.density        = density
+        self.sfr            = sfr
+        self.temperature    = temperature
+        self.pressure       = pressure
+        self.sampling_period = sampling_period
+        self.error_rate     = error_rate
+        self.byte_time      = byte_time
+        self.xfer_overhead  = xfer_overhead
+        self.command_delay  = command_delay
+
+        self.fan_on         = False
+        self.laser_on       = False
+        self.fan_dac        = 255
+        self.laser_dac      = 230
+
+        self.bin_boundaries = list(N2_BIN_BOUNDARIES)
+
+        self._random        = random.Random(seed)
+        self._lock          = threading.Lock()
+        self._last_reset    = monotonic()
+        self._reads         = 0
+
+        # The response currently being clocked out, and the handler for the bytes that follow
+        self._response      = []
+        self._handler       = None
+        self._ready_at      = 0.
+
+    def open(self, bus, device):
+        """Open the (simulated) SPI device.
+
+        :param bus: SPI bus number
+        :param device: Chip select number
+        """
+        self.bus, self.device = bus, device
+
+    def close(self):
+        """Close the (simulated) SPI device."""
+        pass
+
+    def xfer(self, values, speed_hz=0, delay_usecs=0, bits_per_word=0):
+        """Transfer a list of bytes to the OPC and return the bytes it sent back.
+
+        :param values: list of bytes to send
+        :param speed_hz: Ignored
+        :param delay_usecs: Delay after the last byte in microseconds (applied once per transfer, as spidev does)
+        :param bits_per_word: Ignored
+
+        :type values: list
+
+        :rtype: list
+        """
+        with self._lock:
+            duration = self.xfer_overhead + len(values) * self.byte_time + delay_usecs * 1e-6
+
+            if duration > 0:
+                sleep(duration)
+
+            return [self._exchange(b) for b in values]
+
+    def _exchange(self, value):
+        """Clock a single byte in and return the byte clocked out."""
+        if self._response:
+            if monotonic() < self._ready_at:
+                return BUSY
+
+            return self._response.pop(0)
+
+        if self._handler is not None:
+            handler, self._handler = self._handler, None
+
+            return handler(value)
+
+        return self._command(value)
+
+    def _respond(self, data):
+        """Queue a response to be clocked out after the command delay."""
+        self._response = list(bytearray(data))
+        self._ready_at = monotonic() + self.command_delay
+
+        return 0xF3
+
+    def _command(self, cmd):
+        """Handle a command byte."""
+        v18 = self.firmware[0] >= 18
+
+        if cmd == 0xCF or cmd == 0x41:
+            return 0xF3
+
+        if cmd == 0x30:
+            return self._respond(self._histogram_frame())
+
+        if cmd == 0x3F:
+            return self._respond(self._info_string())
+
+        if self.model == 'N1':
+            if cmd == 0x0C:
+                self.fan_on, self.laser_on = True, True
+
+                return 0xF3
+
+            if cmd == 0x03:
+                self.fan_on, self.laser_on = False, False
+
+                return 0xF3
+
+            if cmd == 0x33:
+                return self._respond(struct.pack('<2f', 1.0, self.sfr))
+
+            return 0x00
+
+        if cmd == 0x03:
+            self._handler = self._power
+            return 0xF3
+
+        if cmd == 0x42:
+            self._handler = self._dac_select
+            return 0xF3
+
+        if cmd == 0x43:
+            self._handler = self._save(0x43, 5)
+            return 0xF3
+
+        if cmd == 0x3C:
+            return self._respond(self._config())
+
+        if cmd == 0x3D and v18:
+            return self._respond(struct.pack('<2H2BHB', 1, 0, 0, 0, 61798, 0))
+
+        if cmd == 0x10 and v18:
+            return self._respond(self._string('OPC-{} {}'.format(self.model, self.serial_number), ' '))
+
+        if cmd == 0x12 and v18:
+            return self._respond(bytearray(self.firmware))
+
+        if cmd == 0x13 and v18:
+            return self._respond(bytearray([int(self.fan_on), int(self.laser_on), self.fan_dac, self.laser_dac]))
+
+        if cmd == 0x32 and v18:
+            counts, period = self._sample()
+            return self._respond(struct.pack('<3f', *self._pm(counts, period)))
+
+        return 0x00
+
+    def _power(self, option):
+        """Handle the byte following the 0x03 (power) command."""
+        if option == 0x00:
+            self.fan_on, self.laser_on = True, True
+        elif option == 0x01:
+            self.fan_on, self.laser_on = False, False
+        elif option in (0x02, 0x03):
+            self.laser_on = option == 0x02
+        elif option in (0x04, 0x05):
+            self.fan_on = option == 0x04
+
+        return 0x03
+
+    def _dac_select(self, selector):
+        """Handle the byte following the 0x42 (set fan/laser power) command."""
+        def _set(power):
+            if selector == 0x00:
+                self.fan_dac = power
+            else:
+                self.laser_dac = power
+
+            return selector
+
+        self._handler = _set
+
+        return 0x42
+
+    def _save(self, previous, remaining):
+        """Build a handler that echoes the bytes of the save config sequence."""
+        def _echo(value):
+            if remaining > 1:
+                self._handler = self._save(value, remaining - 1)
+
+            return previous
+
+        return _echo
+
+    def _string(self, text, pad='.'):
+        """Encode a string as the 60 byte response used by the OPC."""
+        return bytearray(text.ljust(60, pad)[:60].encode('ascii'))
+
+    def _info_string(self):
+        major, minor = self.firmware
+
+        return self._string('OPC-{} FirmwareVer=OPC-{:03d}.{}'.format(self.model, major, minor))
+
+    def _config(self):
+        """Build the 256 byte configuration variables response."""
+        bounds = [adc_value(d) for d in self.bin_boundaries[:16]]
+        bpv = [math.pi / 6. * self._midpoint(i) ** 3 for i in range(16)]
+
+        data = struct.pack('<16H', *bounds)
+        data += struct.pack('<16f', *bpv)
+        data += struct.pack('<16f', *([self.density] * 16))
+        data += struct.pack('<16f', *([1.0] * 16))
+        data += struct.pack('<2f', 1.0, self.sfr)
+        data += struct.pack('<3B', self.laser_dac, self.fan_dac, 0)
+
+        return data.ljust(256, b'\x00')
+
+    def _midpoint(self, i):
+        """Return the (geometric) midpoint diameter of a bin in microns."""
+        return math.sqrt(self.bin_boundaries[i] * self.bin_boundaries[i + 1])
+
+    def _bin_fractions(self):
+        """Return the fraction of particles that fall into each bin."""
+        def _cdf(d):
+            return 0.5 * (1. + math.erf(math.log(d / self.median_diameter) / (math.log(self.gsd) * math.sqrt(2.))))
+
+        edges = [_cdf(d) for d in self.bin_boundaries]
+
+        return [edges[i + 1] - edges[i] for i in range(16)]
+
+    def _poisson(self, lam):
+        """Draw a poisson distributed random number."""
+        if lam <= 0:
+            return 0
+
+        if lam > 30:
+            return max(0, int(round(self._random.gauss(lam, math.sqrt(lam)))))
+
+        limit, k, p = math.exp(-lam), 0, 1.
+
+        while True:
+            p *= self._random.random()
+
+            if p <= limit:
+                return k
+
+            k += 1
+
+    def _sample(self):
+        """Read and reset the accumulated histogram. Returns the counts and the sampling period."""
+        now = monotonic()
+        period = self.sampling_period if self.sampling_period is not None else now - self._last_reset
+        self._last_reset = now
+
+        if not (self.fan_on and self.laser_on):
+            return [0] * 16, period
+
+        volume = self.sfr * period
+        counts = [min(self._poisson(self.concentration * f * volume), 0xFFFF) for f in self._bin_fractions()]
+
+        return counts, period
+
+    def _pm(self, counts, period):
+        """Calculate PM1, PM2.5 and PM10 in ug/m3 from the bin counts."""
+        volume = self.sfr * period
+        pm = []
+
+        for cutoff in (1., 2.5, 10.):
+            mass = 0.
+
+            for i in range(16):
+                if self.bin_boundaries[i + 1] <= cutoff and volume > 0:
+                    mass += counts[i] / volume * math.pi / 6. * self._midpoint(i) ** 3 * self.density
+
+            pm.append(mass)
+
+        return pm
+
+    def _histogram_frame(self):
+        """Build the 62 byte histogram response for the firmware being simulated."""
+        counts, period = self._sample()
+        mtof = [int(3 * (10 + 2 * i)) if counts[i] else 0 for i in (1, 3, 5, 7)]
+        temperature, pressure = int(round(self.temperature * 10)), int(self.pressure)
+
+        if self.model == 'N1' or self.firmware[0] < 16:
+            # The period is counted in ticks of a 12 MHz clock, which wraps like the device's counter
+            ticks = int(period * 12e6) & 0xFFFFFFFF
+
+            frame = struct.pack('<16H4B3I', *(counts + mtof + [temperature, pressure, ticks]))
+        else:
+            # Temperature and pressure are sent on alternate reads
+            tp = pressure if self._reads % 2 else temperature
+            frame = struct.pack('<16H4BfIf', *(counts + mtof + [self.sfr, tp, period]))
+
+        self._reads += 1
+
+        frame = bytearray(frame + struct.pack('<H3f', sum(counts) & 0xFFFF, *self._pm(counts, period)))
+
+        if self.error_rate and self._random.random() < self.error_rate:
+            frame[self._random.randrange(32)] ^= 0xFF
+
+        return frame
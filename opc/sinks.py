@@ -0,0 +1,389 @@
+''' Sinks that store decoded histograms in batches '''
+from ._optional import optional_import
+from .acquisition import unpack_sample
+from .decoders import histogram_layout
+from .timing import monotonic
+
+from array import array
+import threading
+import sqlite3
+
+_pyarrow = optional_import('pyarrow', 'to write Arrow or Parquet files')
+
+# The Arrow type of each array typecode used by HistogramLayout.columns
+_ARROW_TYPES = {'H': 'uint16', 'I': 'uint32', 'f': 'float32', 'd': 'float64'}
+
+def _histogram_layout(layout):
+    """Return the histogram layout of an OPC, or the layout itself."""
+    if hasattr(layout, 'firmware'):
+        return histogram_layout(layout.model, layout.firmware['version'])
+
+    return layout
+
+class ArrowSink(object):
+    """Buffers decoded histograms in typed column arrays, and writes them as Parquet row
+    groups or Arrow record batches (requires pyarrow). The schema is fixed by the histogram
+    layout of the firmware, and has a 'Timestamp' column followed by the keys returned by
+    opc.OPCN2.histogram.
+
+    A batch is written when batch_size samples have been buffered, or when a sample is
+    written more than max_delay seconds after the first sample of the batch, and when the
+    sink is flushed or closed.
+
+    :param path: Path of the file to write
+    :param layout: The histogram layout of the firmware, or the OPC itself
+    :param format: 'parquet' or 'arrow' (the Arrow IPC file format)
+    :param batch_size: Number of samples per row group/record batch
+    :param max_delay: Maximum time in seconds that a sample is buffered before it is written
+    :param number_concentration: Whether the histograms hold number concentrations (histogram(number_concentration=True)) or raw counts
+    :param compression: Parquet compression codec
+
+    :type path: string
+    :type layout: opc.decoders.HistogramLayout or opc.OPCN2
+    :type format: string
+    :type batch_size: int
+    :type max_delay: float
+    :type number_concentration: boolean
+    :type compression: string
+
+    :rtype: opc.sinks.ArrowSink
+
+    :Example:
+
+    >>> with ArrowSink('histograms.parquet', alpha) as sink:
+    ...     for sample in alpha.stream(interval=1.):
+    ...         sink.write(sample)
+    """
+    def __init__(self, path, layout, format='parquet', batch_size=1024, max_delay=60.,
+                 number_concentration=True, compression='snappy'):
+        pa = _pyarrow()
+        layout = _histogram_layout(layout)
+
+        if format not in ('parquet', 'arrow'):
+            raise ValueError("The format must be 'parquet' or 'arrow', not {!r}".format(format))
+
+        self.path           = path
+        self.layout         = layout
+        self.format         = format
+        self.batch_size     = batch_size
+        self.max_delay      = max_delay
+
+        # The number of samples buffered and written
+        self.rows           = 0
+        self.written        = 0
+
+        self._columns       = layout.columns(number_concentration)
+        self._lock          = threading.Lock()
+        self._first         = None
+        self._reset()
+
+        fields = [pa.field('Timestamp', pa.timestamp('us', tz='UTC'), nullable=False)]
+        fields += [pa.field(key, getattr(pa, _ARROW_TYPES[code])(), nullable=nullable)
+                   for key, code, nullable in self._columns]
+
+        self.schema = pa.schema(fields)
+
+        if format == 'parquet':
+            import pyarrow.parquet
+
+            self._writer = pyarrow.parquet.ParquetWriter(path, self.schema, compression=compression)
+        else:
+            self._writer = pa.ipc.new_file(path, self.schema)
+
+    def _reset(self):
+        """Start a new batch."""
+        self._timestamps = array('q')
+        self._buffers = [(array(code), bytearray() if nullable else None) for key, code, nullable in self._columns]
+        self.rows = 0
+
+    def write(self, data, timestamp=None):
+        """Buffer a decoded histogram, and write the batch if it is full or old enough.
+
+        :param data: A histogram as returned by opc.OPCN2.histogram, or a Sample yielded by opc.OPCN2.stream
+        :param timestamp: Time the histogram was read (seconds since the epoch). Defaults to the sample timestamp, or now.
+
+        :type data: dictionary, opc.records.Histogram or opc.acquisition.Sample
+        :type timestamp: float
+        """
+        data, timestamp = unpack_sample(data, timestamp)
+
+        if data is None:
+            return
+
+        with self._lock:
+            if not self.rows:
+                self._first = monotonic()
+
+            self._timestamps.append(int(round(timestamp * 1e6)))
+
+            for (key, code, nullable), (values, nulls) in zip(self._columns, self._buffers):
+                value = data.get(key)
+
+                if nulls is not None:
+                    nulls.append(value is None)
+
+                    if value is None:
+                        value = 0
+
+                values.append(value)
+
+            self.rows += 1
+
+            if self.rows >= self.batch_size or monotonic() - self._first >= self.max_delay:
+                self._flush()
+
+    def _batch(self):
+        """Build a record batch from the buffered columns without copying them."""
+        pa = _pyarrow()
+        n = self.rows
+
+        arrays = [pa.Array.from_buffers(self.schema.field('Timestamp').type, n, [None, pa.py_buffer(self._timestamps)])]
+
+        for field, (values, nulls) in zip(list(self.schema)[1:], self._buffers):
+            validity = None
+
+            if nulls is not None and any(nulls):
+                validity = pa.array([not null for null in nulls], type=pa.bool_()).buffers()[1]
+
+            arrays.append(pa.Array.from_buffers(field.type, n, [validity, pa.py_buffer(values)]))
+
+        return pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+
+    def _flush(self):
+        if not self.rows:
+            return
+
+        batch = self._batch()
+
+        if self.format == 'parquet':
+            self._writer.write_table(_pyarrow().Table.from_batches([batch]))
+        else:
+            self._writer.write_batch(batch)
+
+        self.written += self.rows
+        self._reset()
+
+    def flush(self):
+        """Write the buffered samples as a batch."""
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        """Write the buffered samples and close the file."""
+        with self._lock:
+            self._flush()
+            self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __repr__(self):
+        return "ArrowSink({!r}, {})".format(self.path, self.layout)
+
+class SQLiteSink(object):
+    """A local store-and-forward buffer of decoded histograms in an SQLite database. Samples
+    are inserted in batches, each in a single transaction, with the database in WAL mode.
+    Samples that have not been uploaded yet can be drained to an uploader in bulk, which
+    keeps a watermark of the last sample it received. If max_rows is given, the oldest
+    samples are evicted (whether or not they have been uploaded) to bound the size of the
+    database.
+
+    The histograms table has the columns 'id', 'Timestamp', 'Device' and the keys returned
+    by opc.OPCN2.histogram.
+
+    :param path: Path of the database
+    :param layout: The histogram layout of the firmware, or the OPC itself
+    :param batch_size: Number of samples inserted per transaction
+    :param max_delay: Maximum time in seconds that a sample is buffered before it is inserted
+    :param max_rows: Maximum number of samples to keep, or None for no limit
+    :param number_concentration: Whether the histograms hold number concentrations (histogram(number_concentration=True)) or raw counts
+
+    :type path: string
+    :type layout: opc.decoders.HistogramLayout or opc.OPCN2
+    :type batch_size: int
+    :type max_delay: float
+    :type max_rows: int
+    :type number_concentration: boolean
+
+    :rtype: opc.sinks.SQLiteSink
+
+    :Example:
+
+    >>> sink = SQLiteSink('/var/lib/opc/buffer.db', alpha, max_rows=1000000)
+    >>> for sample in alpha.stream(interval=1.):
+    ...     sink.write(sample)
+    ...     if connected():
+    ...         sink.drain(upload)
+    """
+    def __init__(self, path, layout, batch_size=100, max_delay=60., max_rows=None, number_concentration=True):
+        layout = _histogram_layout(layout)
+
+        self.path           = path
+        self.layout         = layout
+        self.batch_size     = batch_size
+        self.max_delay      = max_delay
+        self.max_rows       = max_rows
+
+        # Number of samples evicted before they were uploaded
+        self.evicted        = 0
+
+        self._columns       = layout.columns(number_concentration)
+        self._keys          = [key for key, code, nullable in self._columns]
+        self._rows          = []
+        self._first         = None
+        self._lock          = threading.Lock()
+
+        types = ['"{}" {}'.format(key, 'REAL' if code in 'fd' else 'INTEGER') for key, code, nullable in self._columns]
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+
+        with self._conn:
+            self._conn.execute('CREATE TABLE IF NOT EXISTS histograms (id INTEGER PRIMARY KEY AUTOINCREMENT, '
+                               '"Timestamp" REAL NOT NULL, "Device" TEXT, {})'.format(', '.join(types)))
+            self._conn.execute("CREATE TABLE IF NOT EXISTS watermarks (name TEXT PRIMARY KEY, id INTEGER NOT NULL)")
+
+        self._insert = 'INSERT INTO histograms ("Timestamp", "Device", {}) VALUES ({})'.format(
+                        ', '.join('"{}"'.format(key) for key in self._keys), ', '.join('?' * (len(self._keys) + 2)))
+
+    def write(self, data, timestamp=None, device=None):
+        """Buffer a decoded histogram, and insert the batch if it is full or old enough.
+
+        :param data: A histogram as returned by opc.OPCN2.histogram, or a Sample/FleetSample
+        :param timestamp: Time the histogram was read (seconds since the epoch). Defaults to the sample timestamp, or now.
+        :param device: Name of the OPC. Defaults to the device of a FleetSample.
+
+        :type data: dictionary, opc.records.Histogram or opc.acquisition.Sample
+        :type timestamp: float
+        :type device: string
+        """
+        device = getattr(data, 'device', device)
+        data, timestamp = unpack_sample(data, timestamp)
+
+        if data is None:
+            return
+
+        with self._lock:
+            if not self._rows:
+                self._first = monotonic()
+
+            self._rows.append([timestamp, None if device is None else str(device)] + [data.get(key) for key in self._keys])
+
+            if len(self._rows) >= self.batch_size or monotonic() - self._first >= self.max_delay:
+                self._flush()
+
+    def _flush(self):
+        if not self._rows:
+            return
+
+        with self._conn:
+            self._conn.executemany(self._insert, self._rows)
+
+            if self.max_rows is not None:
+                self._evict()
+
+        self._rows = []
+
+    def _evict(self):
+        """Delete the oldest samples beyond max_rows."""
+        last = self._conn.execute("SELECT MAX(id) FROM histograms").fetchone()[0] or 0
+        cutoff = last - self.max_rows
+
+        # Count the samples that no uploader has received yet
+        watermark = self._conn.execute("SELECT MIN(id) FROM watermarks").fetchone()[0] or 0
+
+        if cutoff > watermark:
+            self.evicted += self._conn.execute("SELECT COUNT(*) FROM histograms WHERE id > ? AND id <= ?",
+                                               (watermark, cutoff)).fetchone()[0]
+
+        self._conn.execute("DELETE FROM histograms WHERE id <= ?", (cutoff, ))
+
+    def flush(self):
+        """Insert the buffered samples."""
+        with self._lock:
+            self._flush()
+
+    def watermark(self, name='default'):
+        """Return the id of the last sample received by an uploader.
+
+        :param name: Name of the uploader
+
+        :type name: string
+
+        :rtype: int
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT id FROM watermarks WHERE name = ?", (name, )).fetchone()
+
+        return row[0] if row else 0
+
+    def pending(self, name='default'):
+        """Return the number of stored samples that have not been received by an uploader.
+
+        :param name: Name of the uploader
+
+        :type name: string
+
+        :rtype: int
+        """
+        watermark = self.watermark(name)
+
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM histograms WHERE id > ?", (watermark, )).fetchone()[0]
+
+    def drain(self, uploader, name='default', batch_size=1000):
+        """Send the samples that have not been uploaded yet to an uploader, oldest first, in
+        batches. The uploader is called with a list of dictionaries (one per sample, with the
+        keys 'id', 'Timestamp', 'Device' and the histogram keys) and should raise an exception
+        if the upload fails. The watermark is advanced after each successful batch, so a failed
+        drain can be retried later.
+
+        :param uploader: Function that uploads a list of samples
+        :param name: Name of the uploader, which has its own watermark
+        :param batch_size: Maximum number of samples per call to the uploader
+
+        :type uploader: function
+        :type name: string
+        :type batch_size: int
+
+        :rtype: int the number of samples uploaded
+        """
+        self.flush()
+
+        columns = ['id', 'Timestamp', 'Device'] + self._keys
+        select = 'SELECT {} FROM histograms WHERE id > ? ORDER BY id LIMIT ?'.format(', '.join('"{}"'.format(c) for c in columns))
+        uploaded, watermark = 0, self.watermark(name)
+
+        while True:
+            with self._lock:
+                rows = self._conn.execute(select, (watermark, batch_size)).fetchall()
+
+            if not rows:
+                return uploaded
+
+            uploader([dict(zip(columns, row)) for row in rows])
+
+            watermark = rows[-1][0]
+            uploaded += len(rows)
+
+            with self._lock, self._conn:
+                self._conn.execute("INSERT OR REPLACE INTO watermarks (name, id) VALUES (?, ?)", (name, watermark))
+
+    def close(self):
+        """Insert the buffered samples and close the database."""
+        with self._lock:
+            self._flush()
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __repr__(self):
+        return "SQLiteSink({!r}, {})".format(self.path, self.layout)
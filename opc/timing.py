@@ -0,0 +1,164 @@
+''' Timing profiles for the Alphasense OPC's '''
+import time
+
+# time.monotonic is not available on python2, so fall back to the wall clock
+monotonic = getattr(time, 'monotonic', time.time)
+
+class TimingProfile(object):
+    """Holds the delays used when talking to an OPC over a particular transport.
+
+    :param name: Name of the profile
+    :param command_delay: Delay between the command byte and the first data byte in seconds.
+    :param byte_delay_us: Delay after each transfer of a response in microseconds, passed to spidev as delay_usecs (transports that do not accept it ignore it). Responses are read one byte per transfer by default, so this is the gap between bytes; with frame_reads, spidev waits once, after the whole frame.
+    :param guard: Minimum time between the end of one command and the start of the next in seconds.
+    :param startup: Time to wait after initialization before the first command is sent in seconds.
+
+    :type name: string
+    :type command_delay: float
+    :type byte_delay_us: int
+    :type guard: float
+    :type startup: float
+
+    :rtype: opc.timing.TimingProfile
+
+    :Example:
+
+    >>> fast = TimingProfile('fast', command_delay=10e-3, guard=20e-3)
+    >>> alpha = opc.OPCN2(spi, timing=fast)
+    """
+    def __init__(self, name, command_delay=10e-3, byte_delay_us=10, guard=0.1, startup=1.0):
+        self.name           = name
+        self.command_delay  = command_delay
+        self.byte_delay_us  = byte_delay_us
+        self.guard          = guard
+        self.startup        = startup
+
+    def copy(self, **kwargs):
+        """Return a copy of the profile with some of the values replaced.
+
+        :rtype: opc.timing.TimingProfile
+
+        :Example:
+
+        >>> DEFAULT.copy(guard=0.05)
+        TimingProfile(name='default', command_delay=0.01, byte_delay_us=10, guard=0.05, startup=1.0)
+        """
+        values = dict(self.__dict__)
+        values.update(kwargs)
+
+        return TimingProfile(**values)
+
+    def __repr__(self):
+        return ("TimingProfile(name={!r}, command_delay={}, byte_delay_us={}, "
+                "guard={}, startup={})".format(self.name, self.command_delay,
+                self.byte_delay_us, self.guard, self.startup))
+
+# The timings used by py-opc prior to v1.7
+DEFAULT = TimingProfile('default')
+
+# The USB-ISS does not accept a delay, but the serial round trip of each single byte
+# transfer already leaves a longer gap between bytes than the OPC requires (with
+# frame_reads, the bytes of a frame are sent back-to-back)
+USBISS = TimingProfile('usbiss', byte_delay_us=0)
+
+# A recording (opc.replay.ReplayTransport) does not need to wait for the OPC
+REPLAY = TimingProfile('replay', command_delay=0., byte_delay_us=0, guard=0., startup=0.)
+
+# The simulator (opc.simulator.SimulatedSpiDev) answers at once, unless it is given a command_delay
+SIMULATOR = TimingProfile('simulator', command_delay=0., byte_delay_us=0, guard=0., startup=0.)
+
+# Registered profiles, keyed by (transport, firmware major version). None acts as a wildcard.
+_PROFILES = {
+    (None, None):           DEFAULT,
+    ('usbiss', None):       USBISS,
+    ('replay', None):       REPLAY,
+    ('simulator', None):    SIMULATOR,
+}
+
+def transport_name(cnxn):
+    """Return the name of the package that provides the SPI connection, e.g. 'spidev' or 'usbiss'.
+
+    :param cnxn: spidev.SpiDev or usbiss.spi.SPI connection
+
+    :rtype: string
+    """
+    # Connections that wrap or stand in for another one can name their transport
+    name = getattr(cnxn, 'transport_name', None)
+    if isinstance(name, str):
+        return name
+
+    return type(cnxn).__module__.split('.')[0]
+
+def accepts_delay(cnxn):
+    """Return whether the xfer of a connection takes a speed and a delay after the bytes to
+    send, as spidev.SpiDev.xfer(values, speed_hz, delay_usecs) does. usbiss.spi.SPI.xfer
+    only takes the bytes.
+
+    :param cnxn: spidev.SpiDev or usbiss.spi.SPI connection
+
+    :rtype: boolean
+    """
+    # Connections that wrap or stand in for another one can say whether it accepts a delay
+    accepts = getattr(cnxn, 'accepts_delay', None)
+    if isinstance(accepts, bool):
+        return accepts
+
+    # The xfer of spidev is a C function, whose signature can not be inspected
+    if transport_name(cnxn) == 'spidev':
+        return True
+
+    # inspect is imported here as it is slow to import and only needed once per OPC
+    import inspect
+
+    try:
+        params = list(inspect.signature(cnxn.xfer).parameters.values())
+    except AttributeError:      # python2
+        try:
+            spec = inspect.getargspec(cnxn.xfer)
+        except TypeError:
+            return False
+
+        return spec.varargs is not None or len(spec.args) - inspect.ismethod(cnxn.xfer) >= 3
+    except (TypeError, ValueError):
+        return False
+
+    positional = [p for p in params if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)]
+
+    return len(positional) >= 3 or any(p.kind == p.VAR_POSITIONAL for p in params)
+
+def register_profile(profile, transport=None, firmware=None):
+    """Register a timing profile to be used for a transport and/or firmware major version.
+
+    :param profile: The timing profile
+    :param transport: Name of the transport ('spidev', 'usbiss', ...) or None for any
+    :param firmware: Firmware major version or None for any
+
+    :type profile: opc.timing.TimingProfile
+    :type transport: string
+    :type firmware: int
+
+    :Example:
+
+    >>> register_profile(TimingProfile('n2-v18', guard=20e-3), transport='spidev', firmware=18)
+    """
+    _PROFILES[(transport, int(firmware) if firmware is not None else None)] = profile
+
+def select_profile(cnxn, firmware=None):
+    """Select the most specific timing profile registered for a connection and firmware
+    major version, in the order: (transport, firmware), (transport, any), (any, firmware), default.
+
+    :param cnxn: spidev.SpiDev or usbiss.spi.SPI connection
+    :param firmware: Firmware major version, or None if it is not yet known
+
+    :type firmware: int
+
+    :rtype: opc.timing.TimingProfile
+    """
+    transport = transport_name(cnxn)
+    firmware = int(firmware) if firmware is not None else None
+
+    for key in ((transport, firmware), (transport, None), (None, firmware)):
+        if key in _PROFILES:
+            return _PROFILES[key]
+
+    return _PROFILES[(None, None)]
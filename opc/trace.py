@@ -0,0 +1,209 @@
+''' Tracing every byte sent to and received from an OPC in a fixed-size ring buffer '''
+from collections import namedtuple
+import threading
+import struct
+
+# Each byte: time of its transfer (monotonic), command sequence number, command name
+# number, flags, and the bytes sent and received
+RECORD = struct.Struct('<dIBBBB')
+
+# Set on the first byte of each transfer
+FIRST = 0x01
+
+# A single byte of a trace
+TraceRecord = namedtuple('TraceRecord', ['time', 'sequence', 'command', 'first', 'sent', 'received'])
+
+# A single transfer (call to xfer) of a traced command
+TraceTransfer = namedtuple('TraceTransfer', ['time', 'sent', 'received'])
+
+# A traced command sequence, with complete set to False if its first bytes were overwritten
+TraceSequence = namedtuple('TraceSequence', ['sequence', 'command', 'start', 'transfers', 'complete'])
+
+class TraceRing(object):
+    """Records every byte an OPC sends and receives, with the time of its transfer and the
+    command it was sent by, into a fixed-size ring buffer that is allocated up front. Once
+    the buffer is full, the oldest bytes are overwritten, so a trace can be left on in
+    production and dumped after an anomaly, such as a checksum failure.
+
+    Each byte takes 16 bytes of the buffer. Every command of an OPC is a command sequence;
+    transfers made outside one (e.g. by calling _xfer directly) are recorded with no
+    command. A ring can be shared by several OPC's.
+
+    Any object with the begin, end and record methods can be used as a trace.
+
+    :param size: Number of bytes to keep
+
+    :type size: int
+
+    :rtype: opc.trace.TraceRing
+
+    :Example:
+
+    >>> trace = TraceRing(4096)
+    >>> alpha = opc.OPCN2(spi, trace=trace)
+    >>> if alpha.histogram() is None:
+    ...     print (trace.dump())
+    """
+    def __init__(self, size=4096):
+        self.size       = size
+
+        # Number of bytes recorded since the ring was created
+        self.count      = 0
+
+        self._buffer    = bytearray(size * RECORD.size)
+        self._lock      = threading.Lock()
+        self._sequence  = 0
+
+        # Command names and their numbers (0 for no command)
+        self._names     = [None]
+        self._codes     = {None: 0}
+
+        # The command each OPC is sending: sequence number, name number and depth
+        self._context   = {}
+
+    def _code(self, name):
+        code = self._codes.get(name)
+
+        if code is None:
+            if len(self._names) > 255:
+                return 0
+
+            code = self._codes[name] = len(self._names)
+            self._names.append(name)
+
+        return code
+
+    def begin(self, opc, name):
+        """Mark the start of a command sequence by an OPC.
+
+        :param opc: The OPC sending the command
+        :param name: Name of the command
+
+        :type name: string
+        """
+        with self._lock:
+            context = self._context.get(id(opc))
+
+            # Commands sent from within another command are traced as part of it
+            if context is not None:
+                context[2] += 1
+                return
+
+            self._sequence = (self._sequence + 1) & 0xFFFFFFFF
+            self._context[id(opc)] = [self._sequence, self._code(name), 1]
+
+    def end(self, opc):
+        """Mark the end of the command sequence of an OPC.
+
+        :param opc: The OPC that sent the command
+        """
+        with self._lock:
+            context = self._context.get(id(opc))
+
+            if context is None:
+                return
+
+            context[2] -= 1
+
+            if context[2] == 0:
+                del self._context[id(opc)]
+
+    def record(self, opc, sent, received, time):
+        """Record a transfer.
+
+        :param opc: The OPC that made the transfer
+        :param sent: The bytes sent
+        :param received: The bytes received
+        :param time: Time at which the transfer started (opc.timing.monotonic)
+
+        :type sent: list
+        :type received: list
+        :type time: float
+        """
+        with self._lock:
+            sequence, code, depth = self._context.get(id(opc)) or (0, 0, 0)
+            flags = FIRST
+
+            for tx, rx in zip(sent, received):
+                RECORD.pack_into(self._buffer, (self.count % self.size) * RECORD.size,
+                                 time, sequence, code, flags, tx & 0xFF, rx & 0xFF)
+                self.count += 1
+                flags = 0
+
+    def clear(self):
+        """Discard the bytes recorded so far."""
+        with self._lock:
+            self.count = 0
+
+    def records(self):
+        """Return the bytes in the ring, oldest first.
+
+        :rtype: list of opc.trace.TraceRecord
+        """
+        with self._lock:
+            buffer, count, names = bytes(self._buffer), self.count, list(self._names)
+
+        start = max(count - self.size, 0)
+        records = []
+
+        for i in range(start, count):
+            time, sequence, code, flags, tx, rx = RECORD.unpack_from(buffer, (i % self.size) * RECORD.size)
+            records.append(TraceRecord(time, sequence, names[code], bool(flags & FIRST), tx, rx))
+
+        return records
+
+    def sequences(self):
+        """Return the bytes in the ring grouped into transfers and command sequences,
+        oldest first. Consecutive transfers made outside a command sequence are grouped
+        together.
+
+        :rtype: list of opc.trace.TraceSequence
+        """
+        sequences, current = [], None
+
+        for i, r in enumerate(self.records()):
+            if current is None or r.sequence != current.sequence or r.command != current.command:
+                # The first bytes of the oldest sequence may have been overwritten
+                complete = r.first and (i > 0 or self.count <= self.size)
+                current = TraceSequence(r.sequence, r.command, r.time, [], complete)
+                sequences.append(current)
+
+            if r.first or not current.transfers:
+                current.transfers.append(TraceTransfer(r.time, bytearray(), bytearray()))
+
+            current.transfers[-1].sent.append(r.sent)
+            current.transfers[-1].received.append(r.received)
+
+        return sequences
+
+    def dump(self, last=None):
+        """Decode the ring into readable command sequences, e.g.
+
+        ``#12 raw_histogram at 1204.501832 s``
+        ``  +0.000 ms  tx 30  rx F3``
+
+        :param last: Only dump the last few command sequences
+
+        :type last: int
+
+        :rtype: string
+        """
+        sequences = self.sequences()
+        lines = []
+
+        for s in sequences[-last:] if last else sequences:
+            lines.append("#{} {} at {:.6f} s{}".format(s.sequence, s.command or '(no command)', s.start,
+                                                    '' if s.complete else ' (truncated)'))
+
+            for t in s.transfers:
+                lines.append("  +{:.3f} ms  tx {}  rx {}".format((t.time - s.start) * 1e3,
+                             ' '.join('{:02X}'.format(b) for b in t.sent),
+                             ' '.join('{:02X}'.format(b) for b in t.received)))
+
+        return '\n'.join(lines)
+
+    def __len__(self):
+        return min(self.count, self.size)
+
+    def __repr__(self):
+        return "TraceRing({} of {} bytes)".format(len(self), self.size)
@@ -16,6 +16,8 @@ setup(
     name = 'py-opc',
     version = VERSION,
     packages = ['opc'],
+    package_data = {'opc': ['lookup_table.bin']},
+    install_requires = ['futures; python_version < "3"'],
     description = 'Python libary for operating the Alphasense OPC-N2 optical particle counter',
     author = 'David H Hagan',
     author_email = 'david@davidhhagan.com',
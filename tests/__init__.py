@@ -0,0 +1,22 @@
+from opc.simulator import SimulatedSpiDev
+from opc.timing import monotonic
+
+class CountingSpiDev(SimulatedSpiDev):
+    """Records the command byte of each command and the time it was received, and the bytes
+    sent by and the delay passed to each transfer."""
+    def __init__(self, *args, **kwargs):
+        super(CountingSpiDev, self).__init__(*args, **kwargs)
+        self.commands = []
+        self.command_times = []
+        self.transfers = []
+
+    def _command(self, cmd):
+        self.commands.append(cmd)
+        self.command_times.append(monotonic())
+
+        return super(CountingSpiDev, self)._command(cmd)
+
+    def xfer(self, values, speed_hz=0, delay_usecs=0, bits_per_word=0):
+        self.transfers.append((list(values), delay_usecs))
+
+        return super(CountingSpiDev, self).xfer(values, speed_hz, delay_usecs, bits_per_word)
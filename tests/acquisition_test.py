@@ -0,0 +1,206 @@
+import unittest
+import threading
+import time
+import opc
+from opc.simulator import SimulatedSpiDev
+from opc.acquisition import FleetPoller
+from opc.bus import bus_key
+from opc.timing import SIMULATOR
+from tests import CountingSpiDev
+
+try:
+    import concurrent.futures
+except ImportError:     # python2, without the futures backport
+    concurrent = None
+
+class StreamTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.spi = SimulatedSpiDev(firmware=(18, 2), concentration=50., sampling_period=1., seed=1)
+        self.alpha = opc.OPCN2(self.spi)
+        self.alpha.on()
+
+    def test_histogram(self):
+        spi = CountingSpiDev(firmware=(18, 2), concentration=50., sampling_period=1., seed=1)
+        alpha = opc.OPCN2(spi)
+        alpha.on()
+        spi.command_times = []
+
+        stream = alpha.stream(interval=0.02, count=5, number_concentration=False)
+        samples = list(stream)
+
+        self.assertEqual(len(samples), 5)
+        self.assertTrue(all('Bin 0' in s.data for s in samples))
+
+        # Reads are scheduled on absolute deadlines, so they don't drift: counted in intervals from
+        # the start, each read is sent in a later interval than the one before it, and no read is
+        # sent before its deadline (allowing 5% of an interval for the clock resolution)
+        slots = [int((sent - stream._start) / 0.02 + 0.05) for sent in spi.command_times]
+
+        self.assertEqual(len(slots), 5)
+        self.assertEqual(slots, sorted(set(slots)))
+        self.assertTrue(all(slot >= k for k, slot in enumerate(slots)))
+
+    def test_pm(self):
+        samples = list(self.alpha.stream(interval=0.01, mode='pm', count=3))
+
+        self.assertEqual(len(samples), 3)
+        self.assertEqual(sorted(samples[0].data.keys()), ['PM1', 'PM10', 'PM2.5'])
+
+    def test_bounded_buffer(self):
+        stream = self.alpha.stream(interval=0.001, count=10, buffer_size=4)
+        stream._thread.join()
+
+        self.assertEqual(len(list(stream)), 4)
+        self.assertEqual(stream.dropped, 6)
+
+    def test_close(self):
+        with self.alpha.stream(interval=0.01) as stream:
+            next(stream)
+
+        self.assertFalse(stream._thread.is_alive())
+
+    def test_error(self):
+        self.alpha.histogram = lambda **kwargs: 1 / 0
+
+        with self.assertRaises(ZeroDivisionError):
+            list(self.alpha.stream(interval=0.01))
+
+    def test_abandoned(self):
+        spi = CountingSpiDev(firmware=(18, 2), sampling_period=1.)
+        alpha = opc.OPCN2(spi)
+
+        running = set(threading.enumerate())
+
+        for sample in alpha.stream(interval=0.01):
+            thread, = set(threading.enumerate()) - running
+            break
+
+        # Breaking out of the loop drops the stream, which stops reading
+        thread.join(1.)
+        self.assertFalse(thread.is_alive())
+
+        reads = spi.commands.count(0x30)
+        time.sleep(0.05)
+        self.assertEqual(spi.commands.count(0x30), reads)
+
+    def test_mode(self):
+        with self.assertRaises(ValueError):
+            self.alpha.stream(mode='bins')
+
+class PrefetcherTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.spi = SimulatedSpiDev(firmware=(18, 2), concentration=50., sampling_period=1., seed=1)
+        self.alpha = opc.OPCN2(self.spi)
+        self.alpha.on()
+
+    def test_latest(self):
+        with self.alpha.prefetch(interval=0.01, mode='pm') as prefetcher:
+            first = prefetcher.wait(timeout=1.)
+            second = prefetcher.wait(timeout=1.)
+
+            self.assertTrue('PM10' in first.data)
+            self.assertGreater(second.monotonic, first.monotonic)
+            self.assertIsNotNone(prefetcher.latest())
+
+            # Samples are only available through latest() and wait()
+            with self.assertRaises(TypeError):
+                iter(prefetcher)
+
+        # The latest sample is kept after the prefetcher stops, until it goes stale
+        self.assertIsNotNone(prefetcher.latest(max_age=10.))
+        self.assertIsNone(prefetcher.latest(max_age=0.))
+        self.assertIsNone(prefetcher.wait(timeout=0.05))
+
+    def test_error(self):
+        histogram, failures = self.alpha.histogram, [IOError('bus error')] * 3
+
+        def flaky(**kwargs):
+            if failures:
+                raise failures.pop()
+
+            return histogram(**kwargs)
+
+        self.alpha.histogram = flaky
+
+        # A few failed reads do not stop the prefetcher
+        with self.alpha.prefetch(interval=0.01) as prefetcher:
+            self.assertIsNotNone(prefetcher.wait(timeout=1.))
+            self.assertIsNotNone(prefetcher.latest())
+
+        self.assertEqual(prefetcher.errors, 3)
+        self.assertIsInstance(prefetcher.last_error, IOError)
+
+@unittest.skipIf(concurrent is None, "futures is not installed")
+class FleetPollerTestCase(unittest.TestCase):
+
+    def make_opc(self, bus, device, **kwargs):
+        spi = CountingSpiDev(firmware=(18, 2), concentration=50., sampling_period=1., **kwargs)
+        spi.open(bus, device)
+
+        alpha = opc.OPCN2(spi, timing=SIMULATOR.copy(command_delay=kwargs.get('command_delay', 0.)))
+        alpha.on()
+
+        return alpha
+
+    def test_bus_key(self):
+        spi = SimulatedSpiDev()
+        spi.open(1, 0)
+
+        self.assertEqual(bus_key(spi), 'spi:1')
+        self.assertTrue(bus_key(SimulatedSpiDev()).startswith('cnxn:'))
+
+    def test_merged_stream(self):
+        devices = dict(('opc-{}'.format(i), self.make_opc(i // 2, i % 2)) for i in range(4))
+
+        fleet = FleetPoller(devices, interval=0.02, count=3)
+        samples = list(fleet)
+
+        # A bus that is still being read at a deadline skips it, losing a sample of both of its OPC's
+        self.assertEqual(len(fleet.groups), 2)
+        self.assertEqual(len(samples), 12 - 2 * fleet.missed)
+        self.assertEqual(set(s.device for s in samples), set(devices))
+
+    def test_explicit_bus(self):
+        devices = [opc.OPCN2(SimulatedSpiDev(firmware=(18, 2)), bus='spi:0') for i in range(2)]
+
+        fleet = FleetPoller(devices, count=1)
+        list(fleet)
+
+        self.assertEqual(list(fleet.groups), ['spi:0'])
+
+    def test_parallel_buses(self):
+        # Each read holds its bus for at least 50 ms, and the two OPC's on each bus are read in turn
+        devices = [self.make_opc(i // 2, i % 2, command_delay=0.05) for i in range(4)]
+
+        for alpha in devices:
+            alpha.cnxn.command_times = []
+
+        samples = list(FleetPoller(devices, count=1))
+        self.assertEqual(len(samples), 4)
+
+        # The time each OPC was sent the histogram command, by bus
+        (a, b), (c, d) = [[devices[i].cnxn.command_times[0] for i in bus] for bus in ((0, 1), (2, 3))]
+
+        # OPC's on the same bus are not read at the same time
+        self.assertGreaterEqual(abs(b - a), 0.05)
+        self.assertGreaterEqual(abs(d - c), 0.05)
+
+        # while the buses are read in parallel: each bus is read before the last read on the other
+        self.assertLess(min(a, b), max(c, d))
+        self.assertLess(min(c, d), max(a, b))
+
+    def test_errors(self):
+        good, bad = self.make_opc(0, 0), self.make_opc(1, 0)
+        bad.histogram = lambda **kwargs: 1 / 0
+
+        fleet = FleetPoller({'good': good, 'bad': bad}, interval=0.01, count=2)
+        samples = list(fleet)
+
+        self.assertEqual(set(s.device for s in samples), set(['good']))
+        self.assertEqual(fleet.errors['good'], 0)
+        self.assertEqual(len(samples) + fleet.errors['bad'], 4 - fleet.missed)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+import opc
+from opc.aggregate import WindowAggregator
+from opc.simulator import SimulatedSpiDev
+
+class WindowAggregatorTestCase(unittest.TestCase):
+
+    def setUp(self):
+        spi = SimulatedSpiDev(firmware=(18, 2), concentration=50., sampling_period=10., seed=11)
+        self.alpha = opc.OPCN2(spi)
+        self.alpha.on()
+
+        self.samples = [self.alpha.histogram(number_concentration=False) for i in range(12)]
+
+    def test_exact_concentration(self):
+        aggregator = WindowAggregator(sizes=(60, ))
+        windows = []
+
+        for i, sample in enumerate(self.samples):
+            windows += aggregator.add(sample, timestamp=6000. + 10 * i)
+
+        self.assertEqual([(w.start, w.samples) for w in windows], [(6000., 6)])
+
+        window = windows[0]
+        counts = sum(s['Bin 2'] for s in self.samples[:6])
+        volume = sum(s['SFR'] * s['Sampling Period'] for s in self.samples[:6])
+
+        self.assertAlmostEqual(window.volume, volume)
+        self.assertAlmostEqual(window.data['Bin 2'], counts / volume)
+        self.assertAlmostEqual(window.data['Sampling Period'], 60.)
+        self.assertEqual(window.data['Temperature'], 23.5)
+        self.assertEqual(window.data['Pressure'], 101325)
+
+    def test_window_sizes(self):
+        aggregator = WindowAggregator(sizes=(20, 60))
+        windows = []
+
+        for i, sample in enumerate(self.samples):
+            windows += aggregator.add(sample, timestamp=6000. + 10 * i)
+
+        windows += aggregator.flush()
+
+        self.assertEqual([w.size for w in windows].count(20), 6)
+        self.assertEqual([w.size for w in windows].count(60), 2)
+        self.assertEqual(sum(w.samples for w in windows if w.size == 20), 12)
+
+    def test_late(self):
+        aggregator = WindowAggregator(sizes=(60, ))
+
+        aggregator.add(self.samples[0], timestamp=6070.)
+        aggregator.add(self.samples[1], timestamp=6010.)
+
+        self.assertEqual(aggregator.late, 1)
+        self.assertEqual(aggregator.flush()[0].samples, 1)
+
+    def test_number_concentration(self):
+        aggregator = WindowAggregator()
+
+        self.assertRaises(ValueError, aggregator.add, self.alpha.histogram())
+
+    def test_legacy_sfr(self):
+        spi = SimulatedSpiDev(firmware=(15, 0), sampling_period=10., seed=11)
+        alpha = opc.OPCN2(spi)
+        sample = alpha.histogram(number_concentration=False)
+
+        self.assertRaises(ValueError, WindowAggregator().add, sample)
+
+        aggregator = WindowAggregator(sizes=(60, ), sfr=3.7)
+        aggregator.add(sample, timestamp=0.)
+        self.assertAlmostEqual(aggregator.flush()[0].volume, 37., places=4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+import unittest
+import sys
+import opc
+from opc.simulator import SimulatedSpiDev
+from opc.timing import SIMULATOR, monotonic
+
+if sys.version_info >= (3, 7):
+    import asyncio
+    from opc.aio import AsyncOPCN2
+
+# The tests drive the coroutines from a synchronous test with run, rather than from an
+# async def, so that this module can still be imported on python < 3.7
+@unittest.skipIf(sys.version_info < (3, 7), "asyncio driver requires python 3.7+")
+class AsyncOPCN2TestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def run_async(self, coro):
+        return self.loop.run_until_complete(coro)
+
+    def gather(self, *coros, **kwargs):
+        # Outside of a coroutine, gather only picks the loop up from tasks already on it
+        return asyncio.gather(*[self.loop.create_task(coro) for coro in coros], **kwargs)
+
+    def test_histogram(self):
+        spi = SimulatedSpiDev(firmware=(18, 2), concentration=50., sampling_period=1., seed=3)
+        alpha = self.run_async(AsyncOPCN2.create(spi))
+
+        self.assertTrue(self.run_async(alpha.on()))
+        hist = self.run_async(alpha.histogram(number_concentration=False))
+        pm = self.run_async(alpha.pm())
+        config = self.run_async(alpha.config())
+        self.assertTrue(self.run_async(alpha.off()))
+
+        self.assertTrue(sum(hist[key] for key in opc.BIN_KEYS) > 0)
+        self.assertEqual(sorted(pm.keys()), ['PM1', 'PM10', 'PM2.5'])
+        self.assertAlmostEqual(config['SFR'], 3.7, places=5)
+        self.assertFalse(spi.fan_on)
+
+    def test_pm_resets_histogram(self):
+        spi = SimulatedSpiDev(firmware=(18, 2), concentration=50., seed=3)
+        alpha = self.run_async(AsyncOPCN2.create(spi))
+
+        self.run_async(alpha.histogram())
+        self.run_async(asyncio.sleep(0.2))
+        self.run_async(alpha.pm())
+
+        spi.error_rate = 1.
+        hist = self.run_async(alpha.histogram())
+
+        # Only the time since pm() is lost
+        self.assertIsNone(hist)
+        self.assertEqual(alpha.opc.lost_frames, 1)
+        self.assertLess(alpha.opc.lost_sampling_time, 0.1)
+
+    def test_pm_firmware(self):
+        alpha = AsyncOPCN2(opc.OPCN2(SimulatedSpiDev(firmware=(17, 0))))
+
+        # The firmware is checked when the coroutine is awaited, not when it is created
+        pm = alpha.pm()
+
+        with self.assertRaises(opc.FirmwareVersionError):
+            self.run_async(pm)
+
+        results = self.run_async(self.gather(alpha.pm(), alpha.on(), return_exceptions=True))
+
+        self.assertIsInstance(results[0], opc.FirmwareVersionError)
+        self.assertTrue(results[1])
+
+    def test_lock_created_in_loop(self):
+        # Created outside of any event loop, then used in one
+        alpha = AsyncOPCN2(opc.OPCN2(SimulatedSpiDev(firmware=(18, 2))))
+        self.assertIsNone(alpha._lock)
+
+        self.assertTrue(self.run_async(alpha.on()))
+        self.assertIsNotNone(alpha._lock)
+
+    def test_multiplex(self):
+        # Each command waits 50 ms on the device, which is awaited rather than slept
+        timing = SIMULATOR.copy(command_delay=0.05)
+        devices = [AsyncOPCN2(opc.OPCN2(SimulatedSpiDev(command_delay=0.05), timing=timing)) for i in range(4)]
+
+        start = monotonic()
+        results = self.run_async(self.gather(*[alpha.histogram() for alpha in devices]))
+        elapsed = monotonic() - start
+
+        self.assertEqual(len(results), 4)
+        self.assertTrue(all(r is not None for r in results))
+        self.assertLess(elapsed, 0.15)
+
+    def test_cancel_while_bus_busy(self):
+        alpha = opc.OPCN2(SimulatedSpiDev(firmware=(18, 2)))
+        device = AsyncOPCN2(alpha)
+        blocker = object()
+
+        alpha.bus_lock.acquire(blocker)
+
+        with self.assertRaises(asyncio.TimeoutError):
+            self.run_async(asyncio.wait_for(device.histogram(), 0.2))
+
+        # The executor acquires the bus once it is free, and releases it straight away
+        alpha.bus_lock.release(blocker)
+        self.run_async(asyncio.sleep(0.1))
+
+        self.assertIsNotNone(self.run_async(asyncio.wait_for(self.loop.run_in_executor(None, alpha.histogram), 2.)))
+
+    def test_cancel_during_transfer(self):
+        # Reading the histogram takes about 0.3 s
+        alpha = opc.OPCN2(SimulatedSpiDev(firmware=(18, 2), byte_time=0.005))
+        device = AsyncOPCN2(alpha)
+        other = object()
+
+        with self.assertRaises(asyncio.TimeoutError):
+            self.run_async(asyncio.wait_for(device.histogram(), 0.05))
+
+        # The bus is held until the transfer has finished
+        self.assertFalse(alpha.bus_lock.acquire(other, blocking=False))
+
+        self.run_async(asyncio.sleep(0.5))
+        self.assertTrue(alpha.bus_lock.acquire(other, blocking=False))
+        alpha.bus_lock.release(other)
+
+        self.assertIsNotNone(self.run_async(asyncio.wait_for(self.loop.run_in_executor(None, alpha.histogram), 2.)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import unittest
+import tempfile
+import shutil
+import os
+import opc
+from opc.archive import ArchiveWriter, ArchiveReader, RECORD, HEADER
+from opc.decoders import N1
+from opc.simulator import SimulatedSpiDev
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+class ArchiveTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'histograms.opca')
+
+        self.alpha = opc.OPCN2(SimulatedSpiDev(firmware=(18, 2), concentration=50., sampling_period=1., seed=5))
+        self.alpha.on()
+
+        self.frames = [self.alpha.raw_histogram() for i in range(100)]
+
+        with ArchiveWriter(self.path, index_every=16) as archive:
+            for i, frame in enumerate(self.frames):
+                archive.write(frame, device=i % 2, firmware=self.alpha.firmware, timestamp=1000. + i)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_size(self):
+        self.assertEqual(os.path.getsize(self.path), HEADER.size + 100 * RECORD.size)
+        self.assertEqual(os.path.getsize(self.path + '.idx'), 7 * 16)
+
+    def test_order(self):
+        with ArchiveWriter(self.path) as archive:
+            self.assertRaises(ValueError, archive.write, self.frames[0], timestamp=0.)
+
+    def test_append(self):
+        # A record cut short by a crash is discarded when the archive is reopened
+        with open(self.path, 'ab') as f:
+            f.write(b'\x00' * 10)
+
+        with ArchiveWriter(self.path) as archive:
+            self.assertEqual(archive.count, 100)
+            self.assertEqual(archive.index_every, 16)
+
+            archive.write(self.frames[0], timestamp=2000.)
+
+        self.assertEqual(os.path.getsize(self.path), HEADER.size + 101 * RECORD.size)
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_between(self):
+        archive = ArchiveReader(self.path)
+
+        self.assertEqual(len(archive), 100)
+        self.assertEqual(len(archive.between()), 100)
+
+        records = archive.between(1020., 1050.5)
+        self.assertEqual(records['timestamp'].tolist(), [1000. + i for i in range(20, 51)])
+        self.assertEqual(bytearray(records['frame'][0]), self.frames[20])
+
+        # The records are views of the memory-mapped file
+        self.assertFalse(records.flags.owndata)
+
+        self.assertEqual(len(archive.between(5000.)), 0)
+        self.assertEqual(len(archive.between(None, 999.)), 0)
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_missing_index(self):
+        os.remove(self.path + '.idx')
+
+        self.assertEqual(len(ArchiveReader(self.path).between(1090.)), 10)
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_decode(self):
+        archive = ArchiveReader(self.path)
+        records = archive.between(1010., 1020.)
+        data = archive.decode(records[records['device'] == 1], number_concentration=False)
+
+        expected = [self.alpha._decode_histogram(self.frames[i], number_concentration=False) for i in range(11, 20, 2)]
+
+        self.assertEqual(data['Bins'].tolist(), [[h[key] for key in opc.BIN_KEYS] for h in expected])
+        self.assertEqual(data['Timestamp'].tolist(), [1000. + i for i in range(11, 20, 2)])
+        self.assertTrue(data['Valid'].all())
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_mixed_firmware(self):
+        legacy = SimulatedSpiDev(firmware=(15, 0), sampling_period=1., seed=5)
+        frame = opc.OPCN2(legacy).raw_histogram()
+
+        with ArchiveWriter(self.path) as archive:
+            archive.write(frame, firmware=(15, 0), timestamp=3000.)
+
+        data = ArchiveReader(self.path).decode(sfr=3.7)
+
+        self.assertEqual(len(data['Bins']), 101)
+        self.assertAlmostEqual(data['SFR'][-1], 3.7, places=5)
+        self.assertTrue(data['Valid'].all())
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_model(self):
+        # The OPC-N1 also sends 62 byte frames, in a different layout
+        frame = N1.struct.pack(*(list(range(16)) + [1, 2, 3, 4, 5, 6, 7, 120, 1.5, 2.5, 3.5]))
+
+        with ArchiveWriter(self.path) as archive:
+            archive.write(frame, device=2, firmware=(0, 0), timestamp=3000.)
+
+        archive = ArchiveReader(self.path)
+        records = archive.records[archive.records['device'] == 2]
+        data = archive.decode(records, number_concentration=False, model='N1')
+
+        self.assertEqual(data['Bins'].tolist(), [list(range(16))])
+        self.assertAlmostEqual(data['PM2.5'][0], 2.5)
+        self.assertTrue(data['Valid'].all())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+import threading
+import gc
+import opc
+from opc.bus import BusLock, bus_lock
+from opc.simulator import SimulatedSpiDev
+
+class BusLockTestCase(unittest.TestCase):
+
+    def test_shared(self):
+        a, b, c = SimulatedSpiDev(), SimulatedSpiDev(), SimulatedSpiDev()
+        a.open(3, 0)
+        b.open(3, 1)
+
+        self.assertIs(bus_lock(a), bus_lock(b))
+        self.assertIsNot(bus_lock(a), bus_lock(c))
+        self.assertIs(bus_lock('spi:3'), bus_lock(a))
+
+    def test_explicit_bus(self):
+        # Like spidev.SpiDev, unopened simulators do not expose their bus
+        a = opc.OPCN2(SimulatedSpiDev(firmware=(18, 2)), bus='spi:7')
+        b = opc.OPCN2(SimulatedSpiDev(firmware=(18, 2)), bus='spi:7')
+        c = opc.OPCN2(SimulatedSpiDev(firmware=(18, 2)))
+
+        self.assertEqual(a.bus, 'spi:7')
+        self.assertIs(a.bus_lock, b.bus_lock)
+        self.assertIsNot(a.bus_lock, c.bus_lock)
+
+    def test_released(self):
+        from opc import bus
+
+        # Connections that do not expose their bus each get a lock of their own, which is
+        # dropped along with the OPC. OPC's left alive by other tests keep theirs.
+        before = set(bus._locks.keys())
+
+        for i in range(20):
+            alpha = opc.OPCN2(SimulatedSpiDev(firmware=(18, 2)))
+
+        del alpha
+        gc.collect()
+
+        self.assertLessEqual(set(bus._locks.keys()), before)
+
+    def test_owner(self):
+        lock, owner = BusLock(), object()
+
+        self.assertTrue(lock.acquire(owner))
+        self.assertTrue(lock.acquire(owner))
+        self.assertFalse(lock.acquire(blocking=False))
+
+        # The lock can be released from another thread by its owner
+        t = threading.Thread(target=lambda: [lock.release(owner), lock.release(owner)])
+        t.start()
+        t.join()
+
+        self.assertTrue(lock.acquire(blocking=False))
+        self.assertRaises(RuntimeError, lock.release, owner)
+
+    def test_concurrent_sequences(self):
+        # Two OPC objects and four threads on one (simulated) connection
+        spi = SimulatedSpiDev(firmware=(18, 2), concentration=1000., sampling_period=1., byte_time=1e-5)
+        opcs = [opc.OPCN2(spi), opc.OPCN2(spi)]
+        opcs[0].on()
+
+        results = []
+
+        def poll(alpha):
+            for i in range(20):
+                results.append(alpha.histogram())
+
+        threads = [threading.Thread(target=poll, args=(opcs[i % 2], )) for i in range(4)]
+
+        for t in threads:
+            t.start()
+
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(results), 80)
+        self.assertTrue(all(r is not None for r in results))
+
+if __name__ == '__main__':
+    unittest.main()
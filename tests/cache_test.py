@@ -0,0 +1,128 @@
+import unittest
+import tempfile
+import shutil
+import os
+import opc
+from opc.cache import DeviceCache, device_key
+from opc.simulator import SimulatedSpiDev
+from tests import CountingSpiDev
+
+class DeviceCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.cache = DeviceCache(os.path.join(self.dir, 'opc.json'))
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_device_key(self):
+        spi = SimulatedSpiDev()
+        self.assertIsNone(device_key(spi))
+
+        spi.open(0, 1)
+        self.assertEqual(device_key(spi), 'spi:0.1')
+
+    def test_device_id_required(self):
+        # Like spidev.SpiDev, an unopened simulator does not expose its bus and chip select
+        spi = CountingSpiDev(firmware=(18, 2))
+
+        alpha = opc.OPCN2(spi, cache=self.cache)
+        alpha.sn()
+        self.assertIsNone(alpha.device_id)
+        self.assertEqual(self.cache.get('spi:0.0'), None)
+
+        alpha = opc.OPCN2(spi, cache=self.cache, device_id='spi:0.0')
+        alpha.sn()
+        self.assertIn('sn', self.cache.get('spi:0.0'))
+
+    def test_update(self):
+        self.assertIsNone(self.cache.get('a'))
+
+        self.cache.update('a', sn='123', config={'SFR': 3.7})
+        self.cache.update('a', config=None)
+
+        self.assertEqual(self.cache.get('a'), {'sn': '123'})
+
+    def test_reconnect(self):
+        spi = CountingSpiDev(firmware=(18, 2))
+        spi.open(0, 0)
+
+        alpha = opc.OPCN2(spi, cache=self.cache)
+        alpha.sn()
+        alpha.config()
+
+        entry = self.cache.get('spi:0.0')
+        self.assertEqual(entry['firmware'], {'major': 18, 'minor': 2, 'version': 18.2})
+        self.assertAlmostEqual(entry['config']['SFR'], 3.7, places=5)
+
+        # The firmware version is validated with a single command
+        spi.commands = []
+        alpha = opc.OPCN2(spi, cache=self.cache)
+
+        self.assertEqual(spi.commands, [0x12])
+        self.assertEqual(alpha.firmware['version'], 18.2)
+        self.assertTrue('123456789' in alpha.serial_number)
+
+        # The config is served from the cache until it is invalidated
+        self.assertAlmostEqual(alpha.config()['SFR'], 3.7, places=5)
+        self.assertEqual(spi.commands, [0x12])
+
+        alpha.set_laser_power(200)
+        self.assertNotIn('config', self.cache.get('spi:0.0'))
+        self.assertEqual(alpha.config()['LaserDAC'], 200)
+
+    def test_invalidate_after_transaction(self):
+        spi = SimulatedSpiDev(firmware=(18, 2))
+        spi.open(0, 0)
+
+        alpha = opc.OPCN2(spi, cache=self.cache)
+        update, held = self.cache.update, []
+
+        def record(*args, **kwargs):
+            held.append(alpha.bus_lock._count)
+
+            return update(*args, **kwargs)
+
+        self.cache.update = record
+
+        # The cache is written to disk once the bus has been released
+        alpha.set_fan_power(200)
+        alpha.set_laser_power(200)
+        alpha.save_config_variables()
+
+        self.assertEqual(held, [0, 0, 0])
+
+    def test_legacy_firmware(self):
+        spi = CountingSpiDev(firmware=(15, 0))
+        opc.OPCN2(spi, cache=self.cache, device_id='opc-1')
+
+        spi.commands = []
+        alpha = opc.OPCN2(spi, cache=self.cache, device_id='opc-1')
+
+        self.assertEqual(spi.commands, [0x3F])
+        self.assertEqual(alpha.firmware['major'], 15)
+
+    def test_swapped_legacy_device(self):
+        opc.OPCN2(SimulatedSpiDev(firmware=(15, 0)), cache=self.cache, device_id='opc-1')
+
+        # A different device answers on the same device_id
+        spi = SimulatedSpiDev(firmware=(18, 2), sampling_period=1.)
+        alpha = opc.OPCN2(spi, cache=self.cache, device_id='opc-1')
+
+        self.assertEqual(alpha.firmware['version'], 18.2)
+        self.assertEqual(self.cache.get('opc-1')['firmware']['version'], 18.2)
+
+        alpha.on()
+        self.assertAlmostEqual(alpha.histogram()['Sampling Period'], 1., places=5)
+
+    def test_stale(self):
+        self.cache.update('opc-1', firmware={'major': 17, 'minor': 0, 'version': 18.0})
+
+        alpha = opc.OPCN2(SimulatedSpiDev(firmware=(18, 2)), cache=self.cache, device_id='opc-1')
+
+        self.assertEqual(alpha.firmware['version'], 18.2)
+        self.assertEqual(self.cache.get('opc-1')['firmware']['version'], 18.2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+import unittest
+import struct
+import opc
+from opc import decoders, records
+from opc.simulator import SimulatedSpiDev
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+class HistogramLayoutTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.bins = list(range(100, 116))
+
+    def test_sizes(self):
+        for layout in (decoders.N2_LEGACY, decoders.N2, decoders.N1):
+            self.assertEqual(layout.size, 62)
+
+    def test_layout_selection(self):
+        self.assertIs(decoders.histogram_layout('N2', 15.), decoders.N2_LEGACY)
+        self.assertIs(decoders.histogram_layout('N2', 18.2), decoders.N2)
+        self.assertIs(decoders.histogram_layout('N1', 18.2), decoders.N1)
+
+    def test_decode_legacy(self):
+        frame = struct.pack('<16H4B3IH3f', *(self.bins + [3, 6, 9, 12, 235, 101325, 24000000, sum(self.bins), 1., 2., 3.]))
+        data = decoders.N2_LEGACY.decode(frame)
+
+        self.assertEqual(data['Bin 15'], 115)
+        self.assertEqual(data['Bin7 MToF'], 4.)
+        self.assertEqual(data['Temperature'], 23.5)
+        self.assertEqual(data['Pressure'], 101325)
+        self.assertEqual(data['Sampling Period'], 2.)
+        self.assertEqual(data['Checksum'], sum(self.bins))
+        self.assertEqual(data['PM10'], 3.)
+
+    def test_decode_temperature_or_pressure(self):
+        fmt = '<16H4BfIfH3f'
+
+        data = decoders.N2.decode(struct.pack(fmt, *(self.bins + [0, 0, 0, 0, 3.5, 235, 1.5, 0, 0., 0., 0.])))
+        self.assertEqual((data['SFR'], data['Sampling Period']), (3.5, 1.5))
+        self.assertEqual((data['Temperature'], data['Pressure']), (23.5, None))
+
+        data = decoders.N2.decode(struct.pack(fmt, *(self.bins + [0, 0, 0, 0, 3.5, 101325, 1.5, 0, 0., 0., 0.])))
+        self.assertEqual((data['Temperature'], data['Pressure']), (None, 101325))
+
+        data = decoders.N2.decode(struct.pack(fmt, *(self.bins + [0, 0, 0, 0, 3.5, 50000, 1.5, 0, 0., 0., 0.])))
+        self.assertEqual((data['Temperature'], data['Pressure']), (None, None))
+
+    def test_decode_offset(self):
+        frame = b'\x00' * 10 + struct.pack('<16H4B3IH3f', *(self.bins + [0] * 8 + [0., 0., 0.]))
+
+        self.assertEqual(decoders.N1.decode(memoryview(frame), 10)['Bin 0'], 100)
+
+class CompactHistogramTestCase(unittest.TestCase):
+
+    def setUp(self):
+        spi = SimulatedSpiDev(firmware=(18, 2), concentration=100., sampling_period=3., seed=1)
+        self.alpha = opc.OPCN2(spi)
+        self.alpha.on()
+
+    def test_matches_dictionary(self):
+        frame = self.alpha.raw_histogram()
+
+        self.assertEqual(dict(decoders.N2.decode_compact(frame)), decoders.N2.decode(frame))
+        self.assertEqual(decoders.N2.decode_compact(frame), decoders.N2.decode(frame))
+
+    def test_legacy_has_no_sfr(self):
+        frame = struct.pack('<16H4B3IH3f', *([0] * 24 + [0., 0., 0.]))
+        hist = decoders.N2_LEGACY.decode_compact(frame)
+
+        self.assertFalse('SFR' in hist)
+        self.assertEqual(len(hist), 27)
+        self.assertRaises(KeyError, lambda: hist['SFR'])
+
+    def test_histogram(self):
+        hist = self.alpha.histogram(compact=True)
+
+        self.assertTrue(isinstance(hist, records.Histogram))
+        self.assertAlmostEqual(hist['Bin 0'], hist.bins[0])
+        self.assertAlmostEqual(sum(hist.bins) * hist.sfr * hist.period, hist.checksum, places=2)
+        self.assertRaises(AttributeError, setattr, hist, 'foo', 1)
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class DecodeHistogramsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        spi = SimulatedSpiDev(firmware=(18, 2), concentration=100., sampling_period=3., seed=1)
+        self.alpha = opc.OPCN2(spi)
+        self.alpha.on()
+
+        self.frames = [bytes(self.alpha.raw_histogram()) for i in range(10)]
+
+    def test_matches_histogram(self):
+        data = decoders.decode_histograms(np.frombuffer(b''.join(self.frames), dtype=np.uint8).reshape(-1, 62), decoders.N2)
+
+        self.assertEqual(data['Bins'].shape, (10, 16))
+        self.assertTrue(data['Valid'].all())
+
+        for i, frame in enumerate(self.frames):
+            expected = decoders.N2.decode(frame)
+            conv = expected['SFR'] * expected['Sampling Period']
+
+            for j in range(16):
+                self.assertAlmostEqual(data['Bins'][i, j], expected['Bin {}'.format(j)] / conv)
+
+            self.assertEqual(data['PM10'][i], expected['PM10'])
+            self.assertEqual(np.isnan(data['Temperature'][i]), expected['Temperature'] is None)
+            self.assertEqual(np.isnan(data['Pressure'][i]), expected['Pressure'] is None)
+
+    def test_checksum(self):
+        frame = bytearray(self.frames[0])
+        frame[0] ^= 0xFF
+
+        data = decoders.decode_histograms(bytes(frame) + self.frames[1], decoders.N2, number_concentration=False)
+
+        self.assertEqual(list(data['Valid']), [False, True])
+        self.assertEqual(data['Bins'].dtype, np.uint16)
+
+    def test_legacy_requires_sfr(self):
+        frame = b'\x00' * 62
+
+        self.assertRaises(ValueError, decoders.decode_histograms, frame, decoders.N2_LEGACY)
+        self.assertEqual(decoders.decode_histograms(frame, decoders.N2_LEGACY, sfr=3.7)['SFR'][0], 3.7)
+
+if __name__ == '__main__':
+    unittest.main()
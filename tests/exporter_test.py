@@ -0,0 +1,83 @@
+import unittest
+import opc
+from opc.exporter import MetricsExporter, render
+from opc.simulator import SimulatedSpiDev
+
+try:
+    from urllib.request import urlopen
+except ImportError:
+    from urllib2 import urlopen
+
+class ExporterTestCase(unittest.TestCase):
+
+    def setUp(self):
+        spi = SimulatedSpiDev(firmware=(18, 2), sampling_period=1.)
+        spi.open(0, 0)
+
+        self.alpha = opc.OPCN2(spi, metrics=True)
+        self.alpha.on()
+        self.alpha.histogram()
+        self.alpha.histogram()
+
+    def test_render(self):
+        text = render([self.alpha])
+        labels = 'device="spi:0.0",bus="spi:0",opc_instance="0"'
+
+        self.assertIn('# TYPE opc_command_latency_seconds histogram', text)
+        self.assertIn('opc_histograms_total{%s} 2.0' % labels, text)
+        self.assertIn('opc_checksum_failures_total{%s} 0.0' % labels, text)
+        self.assertIn('opc_lost_frames_total{%s} 0.0' % labels, text)
+        self.assertIn('opc_sampling_period_jitter_seconds{%s} 0.0' % labels, text)
+        self.assertIn('opc_command_latency_seconds_bucket{%s,command="raw_histogram",le="+Inf"} 2.0' % labels, text)
+        self.assertIn('opc_command_latency_seconds_count{%s,command="raw_histogram"} 2.0' % labels, text)
+        self.assertIn('opc_command_latency_quantile_seconds{%s,command="raw_histogram",quantile="0.99"}' % labels, text)
+
+    def test_disabled(self):
+        self.alpha.disable_metrics()
+        text = render([self.alpha])
+
+        self.assertIn('opc_metrics_enabled{device="spi:0.0",bus="spi:0",opc_instance="0"} 0.0', text)
+        self.assertNotIn('opc_histograms_total{', text)
+
+    def test_registry(self):
+        # Other tests may leave OPC's on spi:0.0 alive, so use a device_id of our own
+        alpha = opc.OPCN2(SimulatedSpiDev(firmware=(18, 2)), metrics=True, device_id='registry')
+
+        self.assertEqual(render().count('opc_metrics_enabled{device="registry"'), 1)
+
+    def test_shared_device_id(self):
+        spi = SimulatedSpiDev(firmware=(18, 2), sampling_period=1.)
+        spi.open(0, 0)
+
+        # An old instance is still referenced after reconnecting to the same device
+        beta = opc.OPCN2(spi, metrics=True)
+        beta.histogram()
+
+        lines = [line for line in render([self.alpha, beta, beta]).splitlines()
+                 if line.startswith('opc_histograms_total{')]
+
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(len(set(line.split(' ')[0] for line in lines)), 2)
+        self.assertIn('opc_instance="0"', lines[0])
+        self.assertIn('opc_instance="1"', lines[1])
+
+    def test_labels_are_stable(self):
+        # OPC's without a device_id are labelled by their bus, and numbered in the order they were created
+        first = opc.OPCN2(SimulatedSpiDev(firmware=(18, 2)), bus='stable')
+        second = opc.OPCN2(SimulatedSpiDev(firmware=(18, 2)), bus='stable')
+
+        lines = [line for line in render().splitlines() if line.startswith('opc_info{device="stable"')]
+
+        self.assertEqual(len(lines), 2)
+        self.assertIn('opc_instance="0"', lines[0])
+        self.assertIn('opc_instance="1"', lines[1])
+
+    def test_http(self):
+        with MetricsExporter(port=0, address='127.0.0.1', opcs=[self.alpha]) as exporter:
+            resp = urlopen('http://127.0.0.1:{}/metrics'.format(exporter.port))
+
+            self.assertEqual(resp.getcode(), 200)
+            self.assertIn(b'opc_commands_total{', resp.read())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,29 @@
+import unittest
+import random
+from opc.lookup_table import OPC_LOOKUP, adc_value, adc_values
+
+def linear_search(bb):
+    return min(enumerate(OPC_LOOKUP), key = lambda x: abs(x[1] - bb))[0]
+
+class LookupTableTestCase(unittest.TestCase):
+
+    def setUp(self):
+        rnd = random.Random(0)
+
+        self.diameters = [rnd.uniform(-1., 20.) for i in range(200)] + \
+                [0., 0.01, 0.04, 1.0, 17.49, 17.5, 100.] + OPC_LOOKUP[::97]
+
+    def test_adc_value(self):
+        for d in self.diameters:
+            self.assertEqual(adc_value(d), linear_search(d))
+
+    def test_plateau(self):
+        # The first ADC value of a plateau is returned
+        self.assertEqual(adc_value(0.01), 0)
+        self.assertEqual(adc_value(17.5), OPC_LOOKUP.index(17.5))
+
+    def test_adc_values(self):
+        self.assertEqual([int(v) for v in adc_values(self.diameters)], [linear_search(d) for d in self.diameters])
+
+if __name__ == '__main__':
+    unittest.main()
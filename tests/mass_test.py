@@ -0,0 +1,83 @@
+import unittest
+import opc
+from opc.decoders import histogram_layout, decode_histograms
+from opc.mass import MassCalculator
+from opc.simulator import SimulatedSpiDev
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+class MassCalculatorTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.spi = SimulatedSpiDev(firmware=(18, 2), concentration=200., density=1.65, sampling_period=1., seed=11)
+        self.alpha = opc.OPCN2(self.spi)
+        self.alpha.on()
+        self.config = self.alpha.config()
+
+    def test_matches_firmware(self):
+        # The simulator only includes bins entirely below each cutoff
+        calculator = MassCalculator(self.config, interpolate=False)
+
+        for compact in (False, True):
+            hist = self.alpha.histogram(number_concentration=False, compact=compact)
+            pm = calculator.pm(hist)
+
+            for key in ('PM1', 'PM2.5', 'PM10'):
+                self.assertAlmostEqual(pm[key], hist[key], delta=1e-3 * max(hist[key], 1.))
+
+        # The same in number concentration
+        hist = self.alpha.histogram()
+        self.assertAlmostEqual(calculator.pm(hist)['PM10'], hist['PM10'], delta=1e-3 * max(hist['PM10'], 1.))
+
+    def test_interpolate(self):
+        hist = self.alpha.histogram()
+
+        whole = MassCalculator(self.config, interpolate=False).pm(hist)
+        partial = MassCalculator(self.config).pm(hist)
+
+        for key in whole:
+            self.assertGreaterEqual(partial[key], whole[key])
+
+        # Bin 3 (1.05 - 1.34 um) is partly below 1.1 um
+        calculator = MassCalculator(self.config, cutoffs=(1.1, ))
+        self.assertEqual(calculator.keys, ('PM1.1', ))
+        self.assertAlmostEqual(calculator._fraction(3, 1.1), (1.1 - calculator.boundaries[3]) /
+                               (calculator.boundaries[4] - calculator.boundaries[3]))
+
+    def test_density(self):
+        hist = self.alpha.histogram()
+        calculator = MassCalculator(self.config)
+        pm = calculator.pm(hist)
+
+        calculator.set_density(1.65 * 2)
+        doubled = calculator.pm(hist)
+
+        for key in pm:
+            self.assertAlmostEqual(doubled[key], 2 * pm[key], delta=1e-6 * max(pm[key], 1.))
+
+        self.assertRaises(ValueError, calculator.set_density, [1.] * 3)
+
+    def test_dictionary(self):
+        hist = self.alpha.histogram()
+
+        self.assertEqual(MassCalculator(dict(self.config)).pm(hist), MassCalculator(self.config).pm(hist))
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_batch(self):
+        calculator = MassCalculator(self.config, density=1.2)
+        frames = [self.alpha.raw_histogram() for i in range(20)]
+
+        data = decode_histograms(b''.join(bytes(f) for f in frames), histogram_layout('N2', 18.2))
+        pm = calculator.pm_batch(data)
+
+        self.assertEqual(pm['PM2.5'].shape, (20, ))
+
+        for i, frame in enumerate(frames):
+            single = calculator.pm(self.alpha._decode_histogram(frame))
+            self.assertAlmostEqual(pm['PM2.5'][i], single['PM2.5'], places=4)
+
+if __name__ == '__main__':
+    unittest.main()
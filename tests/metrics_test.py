@@ -0,0 +1,130 @@
+import unittest
+import threading
+import opc
+from opc.metrics import BUCKETS, CommandStats, Metrics
+from opc.simulator import SimulatedSpiDev
+
+class MetricsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.spi = SimulatedSpiDev(firmware=(18, 2), sampling_period=1.)
+
+    def test_disabled(self):
+        alpha = opc.OPCN2(self.spi)
+        alpha.histogram()
+
+        self.assertIsNone(alpha.metrics())
+
+    def test_commands(self):
+        alpha = opc.OPCN2(self.spi, metrics=True)
+        alpha.on()
+        alpha.histogram()
+        alpha.histogram()
+        alpha.config()
+
+        stats = alpha.metrics()
+        commands = stats['commands']
+
+        # read_info_string and read_firmware are sent while detecting the firmware version
+        self.assertEqual(commands['read_info_string']['count'], 1)
+        self.assertEqual(commands['read_firmware']['count'], 1)
+        self.assertEqual(commands['on']['count'], 1)
+        self.assertEqual(commands['read_config']['count'], 1)
+
+        histogram = commands['raw_histogram']
+        self.assertEqual(histogram['count'], 2)
+        self.assertEqual(histogram['errors'], 0)
+        self.assertEqual(histogram['bytes'], 2 * 63)
+        self.assertEqual(len(histogram['latency']['buckets']), len(BUCKETS) + 1)
+        self.assertEqual(sum(n for bound, n in histogram['latency']['buckets']), 2)
+        self.assertGreaterEqual(histogram['latency']['max'], histogram['latency']['mean'])
+
+        self.assertEqual(stats['bytes'], sum(c['bytes'] for c in commands.values()))
+        self.assertEqual(stats['checksum_failures'], 0)
+        self.assertEqual(stats['firmware_retries'], 0)
+
+    def test_enable(self):
+        alpha = opc.OPCN2(self.spi)
+        alpha.enable_metrics()
+        alpha.pm()
+
+        self.assertEqual(list(alpha.metrics()['commands']), ['pm'])
+
+        alpha.disable_metrics()
+        alpha.pm()
+
+        self.assertIsNone(alpha.metrics())
+
+    def test_errors(self):
+        alpha = opc.OPCN2(self.spi, metrics=True)
+
+        # A frame with a bad checksum
+        frame = alpha.raw_histogram()
+        frame[0] ^= 0x01
+
+        self.assertIsNone(alpha._decode_histogram(frame))
+        self.assertEqual(alpha.metrics()['checksum_failures'], 1)
+
+        # A command that raises is counted as an error
+        alpha.cnxn = None
+
+        self.assertRaises(AttributeError, alpha.raw_histogram)
+        self.assertEqual(alpha.metrics()['commands']['raw_histogram']['errors'], 1)
+
+    def test_firmware_retries(self):
+        info = self.spi._info_string
+        responses = [self.spi._string('garbled'), info()]
+        self.spi._info_string = lambda: responses.pop(0) if responses else info()
+
+        alpha = opc.OPCN2(self.spi, metrics=True, retry_interval_ms=0)
+
+        self.assertEqual(alpha.firmware['version'], 18.2)
+        self.assertEqual(alpha.metrics()['firmware_retries'], 1)
+        self.assertEqual(alpha.metrics()['commands']['read_info_string']['count'], 2)
+
+    def test_quantile(self):
+        stats = CommandStats()
+        stats.count, stats.max_latency = 10, 0.015
+        stats.buckets[BUCKETS.index(0.01)] = 8
+        stats.buckets[BUCKETS.index(0.02)] = 2
+
+        # Interpolated within the bucket, and never more than the slowest command
+        self.assertAlmostEqual(stats.quantile(0.5), 0.005 + 0.005 * 5 / 8.)
+        self.assertEqual(stats.quantile(0.99), 0.015)
+
+    def test_sampling_period(self):
+        metrics = Metrics()
+
+        for period in (1., 1.2, 0.8):
+            metrics.sample(period)
+
+        stats = metrics.snapshot()
+
+        self.assertEqual(stats['samples'], 3)
+        self.assertAlmostEqual(stats['sampling_period'], 1.)
+        self.assertAlmostEqual(stats['sampling_period_jitter'], 0.2)
+
+    def test_threads(self):
+        # Histograms are decoded after the bus lock is released, so several threads update the counters at once
+        metrics = Metrics()
+
+        def decode():
+            for i in range(2000):
+                metrics.sample(1.)
+                metrics.checksum_failure()
+
+        threads = [threading.Thread(target=decode) for i in range(4)]
+
+        for t in threads:
+            t.start()
+
+        for t in threads:
+            t.join()
+
+        stats = metrics.snapshot()
+
+        self.assertEqual(stats['samples'], 8000)
+        self.assertEqual(stats['checksum_failures'], 8000)
+
+if __name__ == '__main__':
+    unittest.main()
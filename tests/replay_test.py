@@ -0,0 +1,82 @@
+import unittest
+import tempfile
+import shutil
+import time
+import os
+import opc
+from opc.replay import RecordingTransport, ReplayTransport, ReplayError, read_recording
+from opc.simulator import SimulatedSpiDev
+from opc.timing import monotonic
+
+class ReplayTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'session.opcr')
+
+        spi = SimulatedSpiDev(firmware=(18, 2), concentration=50., sampling_period=1., seed=7)
+
+        with RecordingTransport(spi, self.path) as recorder:
+            alpha = opc.OPCN2(recorder)
+            alpha.on()
+
+            self.expected = [alpha.histogram(), alpha.histogram(), alpha.config(), alpha.pm()]
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def replay(self):
+        return opc.OPCN2(ReplayTransport(self.path))
+
+    def test_read_recording(self):
+        started, transfers = read_recording(self.path)
+
+        self.assertAlmostEqual(started, time.time(), delta=60)
+        self.assertTrue(all(len(t.sent) == len(t.received) for t in transfers))
+        self.assertEqual(bytearray(transfers[0].sent), bytearray([0x3F]))
+
+    def test_replay(self):
+        alpha = self.replay()
+
+        self.assertEqual(alpha.timing.name, 'replay')
+        self.assertEqual(alpha.firmware['version'], 18.2)
+
+        alpha.on()
+        self.assertEqual([alpha.histogram(), alpha.histogram(), dict(alpha.config()), alpha.pm()],
+                         [self.expected[0], self.expected[1], dict(self.expected[2]), self.expected[3]])
+        self.assertEqual(alpha.cnxn.remaining, 0)
+
+        self.assertRaises(EOFError, alpha.histogram)
+
+    def test_byte_stream(self):
+        # The recording was made one byte at a time, and is replayed with bulk transfers
+        alpha = opc.OPCN2(ReplayTransport(self.path), frame_reads=True)
+        alpha.on()
+
+        self.assertEqual(alpha.histogram(), self.expected[0])
+
+    def test_strict(self):
+        alpha = self.replay()
+        alpha.on()
+
+        self.assertRaises(ReplayError, alpha.pm)
+
+    def test_realtime(self):
+        spi = SimulatedSpiDev(firmware=(18, 2))
+        path = os.path.join(self.dir, 'slow.opcr')
+
+        with RecordingTransport(spi, path) as recorder:
+            alpha = opc.OPCN2(recorder)
+            alpha.on()
+            time.sleep(0.1)
+            alpha.histogram()
+
+        alpha = opc.OPCN2(ReplayTransport(path, realtime=True))
+        alpha.on()
+
+        start = monotonic()
+        alpha.histogram()
+        self.assertGreater(monotonic() - start, 0.08)
+
+if __name__ == '__main__':
+    unittest.main()
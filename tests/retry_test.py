@@ -0,0 +1,104 @@
+import unittest
+import threading
+import time
+import opc
+from opc.retry import RetryPolicy
+from opc.simulator import SimulatedSpiDev
+
+class RetryPolicyTestCase(unittest.TestCase):
+
+    def test_delays(self):
+        policy = RetryPolicy(max_attempts=5, backoff=0.1, multiplier=2., max_backoff=0.3, jitter=0.)
+
+        self.assertEqual(list(policy.delays()), [0.1, 0.2, 0.3, 0.3])
+        self.assertEqual(list(RetryPolicy(max_attempts=1).delays()), [])
+
+    def test_jitter(self):
+        policy = RetryPolicy(max_attempts=50, backoff=1., multiplier=1., jitter=0.25, seed=1)
+        delays = list(policy.delays())
+
+        self.assertTrue(all(0.75 <= d <= 1.25 for d in delays))
+        self.assertGreater(len(set(delays)), 1)
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, RetryPolicy, max_attempts=0)
+        self.assertRaises(ValueError, RetryPolicy, jitter=2.)
+
+class HistogramRetryTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.spi = SimulatedSpiDev(firmware=(18, 2), concentration=100., seed=5)
+
+    def test_no_policy(self):
+        alpha = opc.OPCN2(self.spi)
+        alpha.histogram()
+
+        self.spi.error_rate = 1.
+        time.sleep(0.01)
+
+        self.assertIsNone(alpha.histogram())
+        self.assertEqual(alpha.lost_frames, 1)
+        self.assertGreaterEqual(alpha.lost_sampling_time, 0.01)
+
+    def test_after_pm(self):
+        # pm() also resets the histogram, so only the time since it is lost
+        alpha = opc.OPCN2(self.spi)
+        alpha.histogram()
+        time.sleep(0.2)
+        alpha.pm()
+
+        self.spi.error_rate = 1.
+
+        self.assertIsNone(alpha.histogram())
+        self.assertEqual(alpha.lost_frames, 1)
+        self.assertLess(alpha.lost_sampling_time, 0.1)
+
+    def test_threads(self):
+        alpha = opc.OPCN2(self.spi)
+        alpha.histogram()
+
+        self.spi.error_rate = 1.
+        start = time.time()
+
+        def poll():
+            for i in range(50):
+                alpha.histogram()
+
+        threads = [threading.Thread(target=poll) for i in range(4)]
+
+        for t in threads:
+            t.start()
+
+        for t in threads:
+            t.join()
+
+        # Each read is charged the time since the one before it, so the total is the elapsed time
+        self.assertEqual(alpha.lost_frames, 200)
+        self.assertLessEqual(alpha.lost_sampling_time, time.time() - start + 0.01)
+
+    def test_recovers(self):
+        spi = self.spi
+
+        class Recover(RetryPolicy):
+            def delays(self):
+                for delay in RetryPolicy.delays(self):
+                    spi.error_rate = 0.
+                    yield delay
+
+        alpha = opc.OPCN2(spi, retry=Recover(max_attempts=3, backoff=0.))
+
+        spi.error_rate = 1.
+
+        self.assertIsNotNone(alpha.histogram())
+        self.assertEqual(alpha.lost_frames, 1)
+
+    def test_exhausted(self):
+        alpha = opc.OPCN2(self.spi, retry=RetryPolicy(max_attempts=3, backoff=0.))
+
+        self.spi.error_rate = 1.
+
+        self.assertIsNone(alpha.histogram())
+        self.assertEqual(alpha.lost_frames, 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,254 @@
+import unittest
+import opc
+from opc.simulator import SimulatedSpiDev
+from opc.lookup_table import adc_value
+from opc.timing import SIMULATOR, monotonic
+from tests import CountingSpiDev
+
+class NoDelaySpiDev(SimulatedSpiDev):
+    """A transport whose xfer only takes the bytes to send."""
+    def xfer(self, values):
+        return super(NoDelaySpiDev, self).xfer(values)
+
+class SimulatedOPCN2TestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.spi = SimulatedSpiDev(firmware=(18, 2), concentration=50., sampling_period=2., seed=42)
+        self.alpha = opc.OPCN2(self.spi)
+
+    def test_firmware(self):
+        self.assertEqual(self.alpha.firmware, {'major': 18, 'minor': 2, 'version': 18.2})
+
+    def test_firmware_detection(self):
+        for major in (14, 15, 16, 17):
+            alpha = opc.OPCN2(SimulatedSpiDev(firmware=(major, 0)))
+
+            self.assertEqual(alpha.firmware['major'], major)
+
+    def test_on_off(self):
+        self.assertTrue(self.alpha.on())
+        self.assertTrue(self.spi.fan_on and self.spi.laser_on)
+
+        self.assertTrue(self.alpha.off())
+        self.assertFalse(self.spi.fan_on or self.spi.laser_on)
+
+    def test_toggle(self):
+        self.assertTrue(self.alpha.toggle_laser(True))
+        self.assertTrue(self.alpha.toggle_fan(True))
+        self.assertEqual(self.alpha.read_pot_status()['LaserON'], 1)
+
+    def test_power(self):
+        self.assertTrue(self.alpha.set_fan_power(200))
+        self.assertTrue(self.alpha.set_laser_power(150))
+        self.assertEqual(self.alpha.read_pot_status()['FanDACVal'], 200)
+        self.assertEqual(self.spi.laser_dac, 150)
+
+    def test_save_config(self):
+        self.assertTrue(self.alpha.save_config_variables())
+
+    def test_info_string(self):
+        self.assertTrue('OPC-N2' in self.alpha.read_info_string())
+        self.assertTrue('123456789' in self.alpha.sn())
+
+    def test_config(self):
+        config = self.alpha.config()
+
+        self.assertAlmostEqual(config['SFR'], 3.7, places=5)
+        self.assertAlmostEqual(config['BPD 0'], 1.65, places=5)
+        self.assertEqual(config['TOF_SFR'], 0)
+
+        # All 16 bin boundaries are included, up to the lower boundary of bin 15
+        bounds = [config['Bin Boundary {}'.format(i)] for i in range(16)]
+        self.assertEqual(len([key for key in config if key.startswith('Bin Boundary')]), 16)
+        self.assertEqual(bounds, [adc_value(d) for d in self.spi.bin_boundaries[:16]])
+
+        self.assertEqual(self.alpha.config2()['AMMaxDataArraysInFile'], 61798)
+
+    def test_config_record(self):
+        config = self.alpha.config()
+        record = self.alpha.config_record()
+
+        self.assertIsInstance(config, dict)
+        self.assertEqual(dict(record), config)
+        self.assertEqual(len(record.bin_boundaries), 16)
+        self.assertAlmostEqual(record.bin_diameters[0], 0.38, places=2)
+
+        # Changing the results does not change the cached copy
+        config['SFR'] = 0.
+        record.bpd[0] = 0.
+        self.assertAlmostEqual(self.alpha.config()['SFR'], 3.7, places=5)
+        self.assertAlmostEqual(self.alpha.config_record().bpd[0], 1.65, places=5)
+
+    def test_config_cached(self):
+        self.alpha.config()
+
+        # Changing the fan power invalidates the cached config
+        self.spi.fan_dac = 100
+        self.assertEqual(self.alpha.config()['FanDAC'], 255)
+        self.assertEqual(self.alpha.config(refresh=True)['FanDAC'], 100)
+
+        self.alpha.set_fan_power(200)
+        self.assertEqual(self.alpha.config()['FanDAC'], 200)
+
+    def test_histogram(self):
+        self.alpha.on()
+        hist = self.alpha.histogram(number_concentration=False)
+
+        self.assertEqual(sum(hist['Bin {}'.format(i)] for i in range(16)) & 0xFFFF, hist['Checksum'])
+        self.assertAlmostEqual(hist['Sampling Period'], 2.)
+        self.assertGreater(hist['Bin 0'], 0)
+        self.assertGreater(hist['PM10'], hist['PM1'])
+
+        # Temperature and pressure are sent on alternate reads
+        hist2 = self.alpha.histogram()
+        self.assertEqual(hist['Temperature'], 23.5)
+        self.assertEqual(hist2['Pressure'], 101325)
+
+    def test_histogram_legacy_firmware(self):
+        alpha = opc.OPCN2(SimulatedSpiDev(firmware=(15, 0), sampling_period=1.5))
+        hist = alpha.histogram(number_concentration=False)
+
+        self.assertEqual(hist['Temperature'], 23.5)
+        self.assertEqual(hist['Pressure'], 101325)
+        self.assertAlmostEqual(hist['Sampling Period'], 1.5)
+
+    def test_histogram_legacy_sfr(self):
+        # Firmware < 16 does not send the SFR, so both paths need it given
+        alpha = opc.OPCN2(SimulatedSpiDev(firmware=(15, 0), sampling_period=1.5))
+
+        self.assertRaises(ValueError, alpha.histogram)
+        self.assertRaises(ValueError, alpha.histogram, compact=True)
+
+        resp = alpha.raw_histogram()
+        hist = alpha._decode_histogram(resp, sfr=3.7)
+        compact = alpha._decode_histogram(resp, compact=True, sfr=3.7)
+        counts = alpha._decode_histogram(resp, number_concentration=False)
+
+        for i in range(16):
+            key = 'Bin {}'.format(i)
+            self.assertAlmostEqual(hist[key], counts[key] / (3.7 * counts['Sampling Period']), places=4)
+            self.assertAlmostEqual(compact[key], hist[key], places=4)
+
+    def test_legacy_long_idle(self):
+        # The 32-bit tick counter of the sampling period wraps after about 358 s
+        spi = SimulatedSpiDev(firmware=(15, 0))
+        alpha = opc.OPCN2(spi)
+
+        spi._last_reset -= 400.
+        hist = alpha.histogram(number_concentration=False)
+
+        self.assertAlmostEqual(hist['Sampling Period'], 400. - 2 ** 32 / 12e6, delta=1.)
+
+    def test_checksum_failure(self):
+        self.spi.error_rate = 1.
+        self.alpha.on()
+
+        self.assertIsNone(self.alpha.histogram())
+
+    def test_pm(self):
+        self.alpha.on()
+        pm = self.alpha.pm()
+
+        self.assertGreater(pm['PM10'], 0.)
+
+    def test_byte_reads(self):
+        spi = CountingSpiDev(firmware=(18, 2), seed=1, sampling_period=1.)
+        alpha = opc.OPCN2(spi, timing=SIMULATOR.copy(byte_delay_us=5))
+        alpha.on()
+
+        self.assertFalse(alpha.frame_reads)
+        self.assertTrue('OPC-N2' in alpha.read_info_string())
+
+        # The command byte, then one transfer per byte, each followed by the byte delay
+        spi.transfers = []
+        self.assertIsNotNone(alpha.histogram())
+        self.assertEqual([len(values) for values, delay in spi.transfers], [1] * 63)
+        self.assertEqual([delay for values, delay in spi.transfers[1:]], [5] * 62)
+
+    def test_frame_reads(self):
+        spi = CountingSpiDev(firmware=(18, 2), seed=1, sampling_period=1.)
+        alpha = opc.OPCN2(spi, timing=SIMULATOR.copy(byte_delay_us=5), frame_reads=True)
+        alpha.on()
+
+        self.assertTrue('OPC-N2' in alpha.read_info_string())
+
+        # The command byte, then the whole frame in one transfer
+        spi.transfers = []
+        self.assertIsNotNone(alpha.histogram())
+        self.assertEqual([len(values) for values, delay in spi.transfers], [1, 62])
+        self.assertEqual(spi.transfers[1][1], 5)
+
+    def test_transport_without_delay(self):
+        # A transport whose xfer does not accept a delay (like usbiss) is detected from its signature
+        spi = NoDelaySpiDev(firmware=(18, 2), seed=1, sampling_period=1.)
+
+        for frame_reads in (False, True):
+            alpha = opc.OPCN2(spi, frame_reads=frame_reads)
+            alpha.on()
+
+            self.assertIs(alpha._xfer_delay_supported, False)
+            self.assertIsNotNone(alpha.histogram())
+
+    def test_transport_argument_error(self):
+        # An argument error raised by a transport that accepts a delay is not taken to mean it does not
+        class StrictSpiDev(SimulatedSpiDev):
+            def xfer(self, values, speed_hz=0, delay_usecs=0, bits_per_word=0):
+                if not isinstance(delay_usecs, int):
+                    raise TypeError("an integer is required")
+
+                return super(StrictSpiDev, self).xfer(values, speed_hz, delay_usecs, bits_per_word)
+
+        alpha = opc.OPCN2(StrictSpiDev(firmware=(18, 2)))
+
+        alpha.timing = SIMULATOR.copy(byte_delay_us=1.5)
+        with self.assertRaises(TypeError):
+            alpha.read_info_string()
+
+        self.assertIs(alpha._xfer_delay_supported, True)
+
+    def test_delay_usecs(self):
+        # Like spidev, the delay is applied once after the transfer, not after every byte
+        start = monotonic()
+        self.spi.xfer([0x00] * 100, 0, 20000)
+
+        self.assertLess(monotonic() - start, 0.5)
+        self.assertGreaterEqual(monotonic() - start, 0.02)
+
+    def test_command_delay(self):
+        # Reading before the OPC is ready corrupts the response
+        self.spi.command_delay = 5e-3
+
+        self.assertFalse(self.alpha.read_info_string().startswith('OPC-N2'))
+
+        alpha = opc.OPCN2(self.spi, timing=SIMULATOR.copy(command_delay=6e-3))
+        self.assertTrue(alpha.read_info_string().startswith('OPC-N2'))
+
+class SimulatedOPCN1TestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.spi = SimulatedSpiDev(model='N1', firmware=(14, 0), sampling_period=1., seed=42)
+        self.alpha = opc.OPCN1(self.spi)
+
+    def test_on_off(self):
+        self.assertTrue(self.alpha.on())
+        self.assertTrue(self.alpha.off())
+
+    def test_read_histogram(self):
+        self.alpha.on()
+        hist = self.alpha.read_histogram()
+
+        self.assertEqual(hist['Temperature'], 23.5)
+        self.assertAlmostEqual(hist['Sampling Period'], 1.)
+
+    def test_long_idle(self):
+        self.spi.sampling_period = None
+        self.spi._last_reset -= 400.
+        self.alpha.on()
+
+        self.assertIsNotNone(self.alpha.read_histogram())
+
+    def test_read_gsc_sfr(self):
+        self.assertAlmostEqual(self.alpha.read_gsc_sfr()['SFR'], 3.7, places=5)
+
+if __name__ == '__main__':
+    unittest.main()
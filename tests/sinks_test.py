@@ -0,0 +1,148 @@
+import unittest
+import tempfile
+import sqlite3
+import shutil
+import os
+import opc
+from opc.acquisition import FleetSample
+from opc.sinks import ArrowSink, SQLiteSink
+from opc.simulator import SimulatedSpiDev
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+@unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+class ArrowSinkTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+        self.alpha = opc.OPCN2(SimulatedSpiDev(firmware=(18, 2), concentration=50., sampling_period=1., seed=9))
+        self.alpha.on()
+
+        self.samples = [self.alpha.histogram(number_concentration=False) for i in range(10)]
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_parquet(self):
+        path = os.path.join(self.dir, 'histograms.parquet')
+
+        with ArrowSink(path, self.alpha, batch_size=4, number_concentration=False) as sink:
+            for i, sample in enumerate(self.samples):
+                sink.write(sample, timestamp=1000. + i)
+
+            self.assertEqual(sink.written, 8)
+
+        f = pyarrow.parquet.ParquetFile(path)
+        self.assertEqual(f.metadata.num_row_groups, 3)
+
+        table = f.read()
+        self.assertEqual(table.schema.field('Bin 0').type, pyarrow.uint16())
+        self.assertEqual(table.column('Bin 3').to_pylist(), [s['Bin 3'] for s in self.samples])
+        self.assertEqual(table.column('Temperature').to_pylist()[:2], [23.5, None])
+        self.assertEqual(table.column('Pressure').to_pylist()[:2], [None, 101325])
+        self.assertEqual(table.column('Timestamp').cast(pyarrow.int64()).to_pylist()[1], 1001000000)
+
+    def test_arrow(self):
+        path = os.path.join(self.dir, 'histograms.arrow')
+
+        with ArrowSink(path, self.alpha, format='arrow', batch_size=100) as sink:
+            for sample in self.alpha.stream(interval=0.01, count=3, compact=True):
+                sink.write(sample)
+
+        reader = pyarrow.ipc.open_file(path)
+        self.assertEqual(reader.num_record_batches, 1)
+        self.assertEqual(reader.get_batch(0).num_rows, 3)
+        self.assertEqual(reader.schema.field('Bin 0').type, pyarrow.float32())
+
+    def test_max_delay(self):
+        path = os.path.join(self.dir, 'histograms.parquet')
+
+        with ArrowSink(path, self.alpha, max_delay=0., number_concentration=False) as sink:
+            sink.write(self.samples[0])
+
+            self.assertEqual(sink.written, 1)
+
+    def test_legacy_layout(self):
+        columns = [key for key, code, nullable in opc.decoders.N2_LEGACY.columns()]
+
+        self.assertFalse('SFR' in columns)
+        self.assertEqual(len(columns), 27)
+
+class SQLiteSinkTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'buffer.db')
+
+        self.alpha = opc.OPCN2(SimulatedSpiDev(firmware=(18, 2), concentration=50., sampling_period=1., seed=9))
+        self.alpha.on()
+
+        self.samples = [self.alpha.histogram() for i in range(10)]
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def count(self):
+        return sqlite3.connect(self.path).execute("SELECT COUNT(*) FROM histograms").fetchone()[0]
+
+    def test_batches(self):
+        sink = SQLiteSink(self.path, self.alpha, batch_size=4)
+
+        for i, sample in enumerate(self.samples):
+            sink.write(sample, timestamp=1000. + i)
+
+        self.assertEqual(self.count(), 8)
+        self.assertEqual(sqlite3.connect(self.path).execute("PRAGMA journal_mode").fetchone()[0], 'wal')
+
+        sink.close()
+        self.assertEqual(self.count(), 10)
+
+    def test_drain(self):
+        uploads = []
+
+        def fail(rows):
+            raise IOError("offline")
+
+        with SQLiteSink(self.path, self.alpha, batch_size=1) as sink:
+            for i, sample in enumerate(self.samples):
+                sink.write(FleetSample(1000. + i, 0., 'roof', sample))
+
+            self.assertRaises(IOError, sink.drain, fail)
+            self.assertEqual(sink.pending(), 10)
+
+            self.assertEqual(sink.drain(uploads.append, batch_size=4), 10)
+            self.assertEqual([len(rows) for rows in uploads], [4, 4, 2])
+            self.assertEqual(sink.pending(), 0)
+            self.assertEqual(sink.watermark(), 10)
+
+            row = uploads[0][1]
+            self.assertEqual((row['Timestamp'], row['Device']), (1001., 'roof'))
+            self.assertAlmostEqual(row['Bin 0'], self.samples[1]['Bin 0'], places=4)
+
+            # Each uploader has its own watermark
+            self.assertEqual(sink.pending('backup'), 10)
+            self.assertEqual(sink.drain(uploads.append), 0)
+
+    def test_eviction(self):
+        with SQLiteSink(self.path, self.alpha, batch_size=2, max_rows=5) as sink:
+            for sample in self.samples[:4]:
+                sink.write(sample)
+
+            sink.drain(lambda rows: None)
+
+            for sample in self.samples[4:]:
+                sink.write(sample)
+
+            # The oldest samples are evicted first, one of which had not been uploaded
+            self.assertEqual(sink.evicted, 1)
+            self.assertEqual(sink.pending(), 5)
+
+        self.assertEqual(self.count(), 5)
+
+if __name__ == '__main__':
+    unittest.main()
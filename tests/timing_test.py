@@ -0,0 +1,117 @@
+import unittest
+import subprocess
+import time
+import sys
+import os
+import io
+import opc
+from opc import timing
+from opc.simulator import SimulatedSpiDev
+from opc.timing import TimingProfile, REPLAY, SIMULATOR, accepts_delay, monotonic, register_profile, select_profile
+from opc.replay import RecordingTransport
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class Transport(object):
+    def __init__(self, name):
+        self.transport_name = name
+
+class SelectProfileTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.profiles = dict(timing._PROFILES)
+
+    def tearDown(self):
+        timing._PROFILES.clear()
+        timing._PROFILES.update(self.profiles)
+
+    def test_builtin(self):
+        self.assertIs(select_profile(Transport('spidev')), timing.DEFAULT)
+        self.assertIs(select_profile(Transport('usbiss'), 18), timing.USBISS)
+        self.assertIs(select_profile(Transport('replay')), REPLAY)
+        self.assertIs(select_profile(SimulatedSpiDev()), SIMULATOR)
+
+    def test_precedence(self):
+        spidev_18 = TimingProfile('spidev-18')
+        spidev = TimingProfile('spidev')
+        any_18 = TimingProfile('any-18')
+
+        register_profile(any_18, firmware=18)
+        self.assertIs(select_profile(Transport('spidev'), 18), any_18)
+
+        # A profile for the transport wins over one for the firmware
+        register_profile(spidev, transport='spidev')
+        self.assertIs(select_profile(Transport('spidev'), 18), spidev)
+
+        # and a profile for both wins over either
+        register_profile(spidev_18, transport='spidev', firmware=18.)
+        self.assertIs(select_profile(Transport('spidev'), 18), spidev_18)
+        self.assertIs(select_profile(Transport('spidev'), 17), spidev)
+        self.assertIs(select_profile(Transport('usbiss'), 18), timing.USBISS)
+        self.assertIs(select_profile(Transport('other'), 18), any_18)
+        self.assertIs(select_profile(Transport('other'), 17), timing.DEFAULT)
+
+    def test_reselected_with_firmware(self):
+        fast = SIMULATOR.copy(name='simulated-18')
+        register_profile(fast, transport='simulator', firmware=18)
+
+        # The firmware is only known once it is detected
+        alpha = opc.OPCN2(SimulatedSpiDev(firmware=(18, 2)), timing=None)
+        self.assertIs(alpha.timing, fast)
+
+class AcceptsDelayTestCase(unittest.TestCase):
+
+    def test_signature(self):
+        class BytesOnly(object):
+            def xfer(self, values):
+                return values
+
+        class Passthrough(object):
+            def xfer(self, values, *args):
+                return values
+
+        self.assertTrue(accepts_delay(SimulatedSpiDev()))
+        self.assertTrue(accepts_delay(Passthrough()))
+        self.assertFalse(accepts_delay(BytesOnly()))
+
+        # spidev's xfer can not be inspected, so it is known by its transport
+        spidev = Transport('spidev')
+        spidev.xfer = len
+        self.assertTrue(accepts_delay(spidev))
+
+        # A recording accepts a delay if the connection it wraps does
+        self.assertFalse(accepts_delay(RecordingTransport(BytesOnly(), io.BytesIO())))
+
+    def test_import(self):
+        # inspect is slow to import, so it is only imported once an OPC needs it
+        code = "import sys, opc; sys.exit('inspect' in sys.modules)"
+
+        self.assertEqual(subprocess.call([sys.executable, '-c', code], cwd=ROOT), 0)
+
+class GuardTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.alpha = opc.OPCN2(SimulatedSpiDev(firmware=(18, 2)), timing=SIMULATOR.copy(guard=0.1))
+
+    def test_guard(self):
+        # Right after initialization only the startup delay (0 here) applies
+        start = monotonic()
+        self.alpha.ping()
+        self.assertLess(monotonic() - start, 0.05)
+
+        # A command sent right after another waits out the guard time
+        start = monotonic()
+        self.alpha.ping()
+        self.assertGreaterEqual(monotonic() - start, 0.09)
+
+    def test_no_wait_once_elapsed(self):
+        self.alpha.ping()
+        time.sleep(0.12)
+
+        # The guard time has already passed, so the command is sent straight away
+        start = monotonic()
+        self.alpha.ping()
+        self.assertLess(monotonic() - start, 0.05)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+import opc
+from opc.simulator import SimulatedSpiDev
+from opc.trace import RECORD, TraceRing
+
+class TraceRingTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.spi = SimulatedSpiDev(firmware=(18, 2), sampling_period=1.)
+
+    def test_sequences(self):
+        trace = TraceRing(1024)
+        alpha = opc.OPCN2(self.spi, trace=trace, frame_reads=True)
+
+        trace.clear()
+        alpha.on()
+        frame = alpha.raw_histogram()
+        alpha.ping()
+
+        # A transfer outside a command sequence
+        alpha._xfer([0xCF])
+
+        sequences = trace.sequences()
+
+        self.assertEqual([s.command for s in sequences], ['on', 'raw_histogram', 'ping', None])
+        self.assertTrue(all(s.complete for s in sequences))
+
+        # The command byte, then the frame in a single transfer
+        histogram = sequences[1]
+        self.assertEqual(len(histogram.transfers), 2)
+        self.assertEqual(list(histogram.transfers[0].sent), [0x30])
+        self.assertEqual(list(histogram.transfers[0].received), [0xF3])
+        self.assertEqual(histogram.transfers[1].received, frame)
+        self.assertEqual(sequences[0].sequence + 1, histogram.sequence)
+
+        self.assertEqual(len(trace), 3 + 63 + 1 + 1)
+        self.assertIn('raw_histogram', trace.dump(last=3))
+        self.assertIn('tx CF  rx F3', trace.dump(last=1))
+
+    def test_bootloader(self):
+        trace = TraceRing(64)
+        alpha = opc.OPCN2(self.spi, trace=trace)
+
+        trace.clear()
+        self.assertTrue(alpha._enter_bootloader_mode())
+
+        sequences = trace.sequences()
+        self.assertEqual([s.command for s in sequences], ['enter_bootloader_mode'])
+        self.assertEqual(list(sequences[0].transfers[0].sent), [0x41])
+
+    def test_wrap(self):
+        trace = TraceRing(100)
+        self.assertEqual(len(trace._buffer), 100 * RECORD.size)
+
+        alpha = opc.OPCN2(self.spi, trace=trace)
+        alpha.raw_histogram()
+        alpha.raw_histogram()
+
+        records = trace.records()
+        sequences = trace.sequences()
+
+        self.assertEqual(len(records), 100)
+        self.assertEqual(len(trace._buffer), 100 * RECORD.size)
+
+        # The oldest sequence was partly overwritten
+        self.assertFalse(sequences[0].complete)
+        self.assertTrue(sequences[-1].complete)
+        self.assertIn('(truncated)', trace.dump())
+        self.assertTrue(all(a.time <= b.time for a, b in zip(records, records[1:])))
+
+    def test_disabled(self):
+        alpha = opc.OPCN2(self.spi)
+
+        self.assertIsNone(alpha.trace)
+        self.assertIsNotNone(alpha.histogram())
+
+if __name__ == '__main__':
+    unittest.main()